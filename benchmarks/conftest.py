@@ -0,0 +1,126 @@
+"""Pytest configuration of the conversion benchmarks.
+
+Timings are measured with pytest-benchmark, in a sourced ROS 2 environment store
+a baseline and compare later runs against it with:
+
+    python3 -m pytest benchmarks --benchmark-autosave
+    python3 -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Memory allocated by each benchmarked call is measured with tracemalloc and compared
+to the baselines stored in ``allocation_baselines.json``, which are written by
+running the suite with ``--update-allocation-baselines``. Benchmarks without a
+baseline warn that their allocations are not checked.
+"""
+
+import json
+import pathlib
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, Tuple
+
+import pytest
+
+ALLOCATION_BASELINES_PATH = pathlib.Path(__file__).with_name(
+    "allocation_baselines.json"
+)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("allocations")
+    group.addoption(
+        "--update-allocation-baselines",
+        action="store_true",
+        default=False,
+        help="Store measured allocations as the new baselines.",
+    )
+    group.addoption(
+        "--allocation-regression-threshold",
+        type=float,
+        default=0.1,
+        help="Relative increase of allocations over the baseline failing the test.",
+    )
+
+
+def count_allocations(function: Callable[[], Any]) -> Tuple[int, int, int]:
+    """Measures memory allocated by a single call of the function.
+
+    Args:
+        function (Callable[[], Any]): Function to measure, called once
+        to warm up caches before measuring.
+
+    Returns:
+        Tuple[int, int, int]: Number of memory blocks and bytes still allocated
+        after the call, including the returned object, and peak of traced bytes
+        during the call.
+    """
+    function()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    ignore_tracemalloc = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    stats = after.filter_traces(ignore_tracemalloc).compare_to(
+        before.filter_traces(ignore_tracemalloc), "filename"
+    )
+    return (
+        sum(stat.count_diff for stat in stats),
+        sum(stat.size_diff for stat in stats),
+        peak,
+    )
+
+
+@pytest.fixture(scope="session")
+def allocation_baselines(request: pytest.FixtureRequest) -> Dict[str, Dict[str, int]]:
+    baselines = {}
+    if ALLOCATION_BASELINES_PATH.exists():
+        baselines = json.loads(ALLOCATION_BASELINES_PATH.read_text())
+    yield baselines
+    if request.config.getoption("--update-allocation-baselines"):
+        ALLOCATION_BASELINES_PATH.write_text(
+            json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+        )
+
+
+@pytest.fixture
+def check_allocations(
+    request: pytest.FixtureRequest, allocation_baselines: Dict[str, Dict[str, int]]
+) -> Callable[[Any, Callable[[], Any]], None]:
+    """Returns a function recording the cost per message of a benchmarked call
+    and failing when its allocations regressed over the stored baseline.
+    """
+    update = request.config.getoption("--update-allocation-baselines")
+    threshold = request.config.getoption("--allocation-regression-threshold")
+
+    def check(benchmark: Any, function: Callable[[], Any]) -> None:
+        blocks, size, peak = count_allocations(function)
+        if benchmark.stats is not None:
+            benchmark.extra_info["ns_per_message"] = benchmark.stats.stats.mean * 1e9
+        benchmark.extra_info["allocated_blocks"] = blocks
+        benchmark.extra_info["allocated_bytes"] = size
+        benchmark.extra_info["peak_bytes"] = peak
+
+        key = request.node.nodeid.split("::", 1)[-1]
+        if update:
+            allocation_baselines[key] = {"blocks": blocks, "bytes": size}
+            return
+        baseline = allocation_baselines.get(key)
+        if baseline is None:
+            warnings.warn(
+                f"No allocation baseline for '{key}', allocations are not checked, "
+                "run with --update-allocation-baselines to store it!"
+            )
+            return
+        assert blocks <= baseline["blocks"] * (1.0 + threshold), (
+            f"Call allocates '{blocks}' blocks, baseline is '{baseline['blocks']}'!"
+        )
+        assert size <= baseline["bytes"] * (1.0 + threshold), (
+            f"Call allocates '{size}' bytes, baseline is '{baseline['bytes']}'!"
+        )
+
+    return check
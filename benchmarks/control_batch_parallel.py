@@ -0,0 +1,24 @@
+"""Throughput scaling of controls_msgs_to_numpy_batch_parallel from 1 to N cores.
+
+Run it in a sourced ROS 2 environment with:
+
+    python3 benchmarks/control_batch_parallel.py
+"""
+
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from linear_feedback_controller_msgs_py import parallel
+from robot_data import make_control
+
+
+def main() -> None:
+    for n_joints, n_contacts in ((12, 2), (30, 4)):
+        msgs = [npc.control_numpy_to_msg(make_control(n_joints, n_contacts))] * 20_000
+        scaling = parallel.measure_throughput_scaling(msgs)
+        print(f"joints: {n_joints} contacts: {n_contacts}")
+        print(f"{'workers':>7} {'msgs/s':>10} {'speedup':>7}")
+        for workers, throughput in scaling.items():
+            print(f"{workers:>7} {throughput:>10.0f} {throughput / scaling[1]:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Throughput scaling over threads of the conversions of serialized Sensor and
+Control messages, as called by the callbacks of a MultiThreadedExecutor, with the
+compiled and the pure Python backends.
+
+Run it in a sourced ROS 2 environment with:
+
+    python3 benchmarks/converter_thread_scaling.py
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from robot_data import make_control, make_sensor
+
+
+def measure(function, inputs, threads: int) -> float:
+    chunk = -(-len(inputs) // threads)
+    chunks = [inputs[start : start + chunk] for start in range(0, len(inputs), chunk)]
+    with ThreadPoolExecutor(threads) as pool:
+        # Starts the threads before measuring.
+        list(pool.map(function, inputs[:threads]))
+        start = time.perf_counter()
+        list(pool.map(lambda chunk: [function(x) for x in chunk], chunks))
+        return len(inputs) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    n_joints, n_contacts = 30, 4
+    control = make_control(n_joints, n_contacts)
+    sensor = make_sensor(n_joints, n_contacts)
+    backends = [False, True] if npc.has_compiled_backend() else [False]
+    if len(backends) == 1:
+        print("Compiled backend not available, only Python is measured.")
+    thread_counts = sorted({1, 2, 4, os.cpu_count()})
+    for compiled in backends:
+        npc.set_compiled_backend(compiled)
+        cases = {
+            "sensor_serialized_to_numpy": (
+                npc.sensor_serialized_to_numpy,
+                [npc.sensor_numpy_to_serialized(sensor)] * 20_000,
+            ),
+            "control_serialized_to_numpy": (
+                npc.control_serialized_to_numpy,
+                [npc.control_numpy_to_serialized(control)] * 5_000,
+            ),
+            "control_numpy_to_serialized": (
+                npc.control_numpy_to_serialized,
+                [control] * 5_000,
+            ),
+        }
+        for name, (function, inputs) in cases.items():
+            print(f"{name} backend: {'compiled' if compiled else 'python'}")
+            print(f"{'threads':>7} {'msgs/s':>10} {'speedup':>7}")
+            single = None
+            for threads in thread_counts:
+                throughput = measure(function, inputs, threads)
+                single = single or throughput
+                print(f"{threads:>7} {throughput:>10.0f} {throughput / single:>7.2f}")
+    npc.set_compiled_backend(True)
+
+
+if __name__ == "__main__":
+    main()
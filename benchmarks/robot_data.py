@@ -0,0 +1,18 @@
+"""Random LFC data of realistic robot sizes shared by the benchmarks.
+
+The data is created by the factories of ``tests/conftest.py``, loaded under another
+module name than the ``conftest`` of the benchmarks.
+"""
+
+import importlib.util
+import pathlib
+
+_spec = importlib.util.spec_from_file_location(
+    "lfc_msgs_tests_conftest",
+    pathlib.Path(__file__).resolve().parents[1] / "tests" / "conftest.py",
+)
+_factories = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_factories)
+
+make_sensor = _factories.make_sensor
+make_control = _factories.make_control
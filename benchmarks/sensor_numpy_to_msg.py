@@ -0,0 +1,31 @@
+"""Micro-benchmark of sensor_numpy_to_msg with validated and unchecked inputs.
+
+Run it in a sourced ROS 2 environment with:
+
+    python3 benchmarks/sensor_numpy_to_msg.py
+"""
+
+import timeit
+
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from robot_data import make_sensor
+
+
+def main() -> None:
+    print(
+        f"{'joints':>6} {'contacts':>8} {'validated [ns]':>14} {'unchecked [ns]':>14}"
+    )
+    for n_joints, n_contacts in ((12, 2), (30, 4), (60, 8)):
+        sensor = make_sensor(n_joints, n_contacts)
+        timings = []
+        for validation in (True, False):
+            npc.set_input_validation(validation)
+            timer = timeit.Timer(lambda: npc.sensor_numpy_to_msg(sensor))
+            number, _ = timer.autorange()
+            timings.append(min(timer.repeat(repeat=5, number=number)) / number * 1e9)
+        npc.set_input_validation(True)
+        print(f"{n_joints:>6} {n_contacts:>8} {timings[0]:>14.0f} {timings[1]:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
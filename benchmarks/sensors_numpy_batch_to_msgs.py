@@ -0,0 +1,70 @@
+"""Speedup of sensors_numpy_batch_to_msgs over sensor_numpy_to_msg per sample.
+
+Run it in a sourced ROS 2 environment with:
+
+    python3 benchmarks/sensors_numpy_batch_to_msgs.py
+"""
+
+import timeit
+
+import numpy as np
+from rclpy.time import Time
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from robot_data import make_sensor
+
+N_SAMPLES = 1000
+
+
+def per_sample(batch: lfc_py_types.SensorBatch) -> list:
+    return [
+        npc.sensor_numpy_to_msg(
+            lfc_py_types.Sensor(
+                base_pose=batch.base_pose[t],
+                base_twist=batch.base_twist[t],
+                joint_state=lfc_py_types.JointState(
+                    name=batch.joint_state.name,
+                    position=batch.joint_state.position[t],
+                    velocity=batch.joint_state.velocity[t],
+                    effort=batch.joint_state.effort[t],
+                ),
+                contacts=[
+                    lfc_py_types.Contact(
+                        active=bool(batch.contact_active[t, c]),
+                        name=name,
+                        wrench=batch.contact_wrench[t, c],
+                        pose=batch.contact_pose[t, c],
+                    )
+                    for c, name in enumerate(batch.contact_names)
+                ],
+                stamp=Time(nanoseconds=int(batch.stamp[t])),
+            )
+        )
+        for t in range(len(batch))
+    ]
+
+
+def main() -> None:
+    print(
+        f"{'joints':>6} {'contacts':>8} {'per sample [us]':>15} "
+        f"{'batch [us]':>10} {'speedup':>7}"
+    )
+    for n_joints, n_contacts in ((12, 2), (30, 4), (60, 8)):
+        msg = npc.sensor_numpy_to_msg(make_sensor(n_joints, n_contacts))
+        batch = npc.sensors_msgs_to_numpy_batch([msg] * N_SAMPLES)
+        batch.base_pose[:] = np.random.rand(*batch.base_pose.shape)
+        timings = []
+        for function in (per_sample, npc.sensors_numpy_batch_to_msgs):
+            timer = timeit.Timer(lambda: function(batch))
+            number, _ = timer.autorange()
+            seconds = min(timer.repeat(repeat=3, number=number)) / number
+            timings.append(seconds / N_SAMPLES * 1e6)
+        print(
+            f"{n_joints:>6} {n_contacts:>8} {timings[0]:>15.1f} "
+            f"{timings[1]:>10.1f} {timings[0] / timings[1]:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
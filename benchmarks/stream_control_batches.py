@@ -0,0 +1,41 @@
+"""Throughput and peak memory of stream_control_batches against the length of
+the recording, with and without worker processes. The peak RSS is expected to
+stay flat as the number of messages grows.
+
+Run it in a sourced ROS 2 environment with:
+
+    python3 benchmarks/stream_control_batches.py
+"""
+
+import itertools
+import resource
+import time
+
+from rclpy.serialization import serialize_message
+
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from linear_feedback_controller_msgs_py import streaming
+from robot_data import make_control
+
+
+def main() -> None:
+    data = serialize_message(npc.control_numpy_to_msg(make_control(30, 4)))
+    print(f"{'workers':>7} {'messages':>8} {'msgs/s':>10} {'peak RSS [MiB]':>14}")
+    for workers in (0, 4):
+        for n_messages in (10_000, 40_000, 160_000):
+            start = time.perf_counter()
+            for _ in streaming.stream_control_batches(
+                itertools.repeat(data, n_messages), chunk_size=1024, workers=workers
+            ):
+                pass
+            elapsed = time.perf_counter() - start
+            # ru_maxrss is the high-water mark of the process in KiB on Linux.
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(
+                f"{workers:>7} {n_messages:>8} {n_messages / elapsed:>10.0f}"
+                f" {peak_rss:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
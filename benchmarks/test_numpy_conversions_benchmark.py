@@ -0,0 +1,81 @@
+"""Benchmarks of the Numpy conversions at realistic robot sizes, see conftest.py."""
+
+import numpy as np
+import pytest
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from robot_data import make_control, make_sensor
+
+pytest.importorskip("pytest_benchmark")
+
+JOINTS = (12, 30, 60)
+CONTACTS = (0, 2, 4, 8)
+
+
+@pytest.mark.parametrize("n_contacts", CONTACTS)
+@pytest.mark.parametrize("n_joints", JOINTS)
+def test_sensor_msg_to_numpy(benchmark, check_allocations, n_joints, n_contacts):
+    msg = npc.sensor_numpy_to_msg(make_sensor(n_joints, n_contacts))
+    benchmark.group = "sensor_msg_to_numpy"
+    benchmark(npc.sensor_msg_to_numpy, msg)
+    check_allocations(benchmark, lambda: npc.sensor_msg_to_numpy(msg))
+
+
+@pytest.mark.parametrize("n_contacts", CONTACTS)
+@pytest.mark.parametrize("n_joints", JOINTS)
+def test_control_msg_to_numpy(benchmark, check_allocations, n_joints, n_contacts):
+    msg = npc.control_numpy_to_msg(make_control(n_joints, n_contacts))
+    benchmark.group = "control_msg_to_numpy"
+    benchmark(npc.control_msg_to_numpy, msg)
+    check_allocations(benchmark, lambda: npc.control_msg_to_numpy(msg))
+
+
+@pytest.mark.parametrize("n_contacts", CONTACTS)
+@pytest.mark.parametrize("n_joints", JOINTS)
+def test_control_numpy_to_msg(benchmark, check_allocations, n_joints, n_contacts):
+    control = make_control(n_joints, n_contacts)
+    benchmark.group = "control_numpy_to_msg"
+    benchmark(npc.control_numpy_to_msg, control)
+    check_allocations(benchmark, lambda: npc.control_numpy_to_msg(control))
+
+
+@pytest.mark.parametrize("n_joints", JOINTS)
+def test_matrix_numpy_to_msg(benchmark, check_allocations, n_joints):
+    feedback_gain = make_control(n_joints, 0).feedback_gain
+    benchmark.group = "matrix_numpy_to_msg"
+    benchmark(npc.matrix_numpy_to_msg, feedback_gain)
+    check_allocations(benchmark, lambda: npc.matrix_numpy_to_msg(feedback_gain))
+
+
+@pytest.mark.parametrize("encoding", ("float64", "float32", "int16"))
+@pytest.mark.parametrize("n_joints", JOINTS)
+def test_matrix_numpy_to_msg_compact(benchmark, check_allocations, n_joints, encoding):
+    feedback_gain = make_control(n_joints, 0).feedback_gain
+    benchmark.group = "matrix_numpy_to_msg_compact"
+    benchmark(npc.matrix_numpy_to_msg_compact, feedback_gain, encoding)
+    check_allocations(
+        benchmark, lambda: npc.matrix_numpy_to_msg_compact(feedback_gain, encoding)
+    )
+
+
+@pytest.mark.parametrize("encoding", ("float64", "float32", "int16"))
+@pytest.mark.parametrize("n_joints", JOINTS)
+def test_matrix_compact_msg_to_numpy(benchmark, check_allocations, n_joints, encoding):
+    msg = npc.matrix_numpy_to_msg_compact(
+        make_control(n_joints, 0).feedback_gain, encoding
+    )
+    benchmark.group = "matrix_compact_msg_to_numpy"
+    benchmark.extra_info["payload_bytes"] = 8 * len(msg.data)
+    benchmark(npc.matrix_compact_msg_to_numpy, msg)
+    check_allocations(benchmark, lambda: npc.matrix_compact_msg_to_numpy(msg))
+
+
+@pytest.mark.parametrize("n_joints", JOINTS)
+def test_state_layout_pack(benchmark, check_allocations, n_joints):
+    sensor = make_sensor(n_joints, 0)
+    layout = lfc_py_types.StateLayout.from_sensor(sensor)
+    state = np.empty(layout.size)
+    benchmark.group = "state_layout_pack"
+    benchmark(layout.pack, sensor, state)
+    check_allocations(benchmark, lambda: layout.pack(sensor, state))
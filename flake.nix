@@ -17,6 +17,7 @@
               ./linear_feedback_controller_msgs_py
               ./msg
               ./package.xml
+              ./src
               ./tests
             ];
           };
@@ -3,12 +3,23 @@
 
 #include <Eigen/Core>
 #include <Eigen/Geometry>
+#include <cmath>
+#include <cstdint>
+#include <cstring>
 #include <linear_feedback_controller_msgs/msg/control.hpp>
 #include <linear_feedback_controller_msgs/msg/sensor.hpp>
+#include <string>
 #include <tf2_eigen/tf2_eigen.hpp>
+#include <vector>
 
 namespace linear_feedback_controller_msgs {
 
+namespace internal {
+// Row-major dense matrix, the storage order of Float64MultiArray matrices.
+using RowMajorMatrixXd = ::Eigen::Matrix<double, ::Eigen::Dynamic,
+                                         ::Eigen::Dynamic, ::Eigen::RowMajor>;
+}  // namespace internal
+
 namespace Eigen {
 
 struct JointState {
@@ -39,6 +50,39 @@ struct Control {
   linear_feedback_controller_msgs::Eigen::Sensor initial_state;
   rclcpp::Time stamp;
 };
+
+// Read-only views over the data of a Float64MultiArray message.
+using ConstMatrixMap = ::Eigen::Map<const internal::RowMajorMatrixXd,
+                                    ::Eigen::Unaligned, ::Eigen::OuterStride<>>;
+using ConstVectorMap = ::Eigen::Map<const ::Eigen::VectorXd>;
+
+// View over the gains of a Control message, valid as long as the message is
+// alive and not modified.
+struct ControlView {
+  ConstMatrixMap feedback_gain;
+  ConstVectorMap feedforward;
+  rclcpp::Time stamp;
+};
+
+// Layout of the state vector x = (q, v), with the configuration
+// q = (base_pose, joint positions) and the velocity v = (base_twist, joint
+// velocities), the base being omitted for a fixed base robot. Same layout as
+// lfc_py_types.StateLayout.
+struct StateLayout {
+  std::vector<std::string> joint_names;
+  std::vector<std::string> contact_names;
+  bool free_flyer = true;
+
+  ::Eigen::Index nq() const {
+    return (free_flyer ? 7 : 0) +
+           static_cast<::Eigen::Index>(joint_names.size());
+  }
+  ::Eigen::Index nv() const {
+    return (free_flyer ? 6 : 0) +
+           static_cast<::Eigen::Index>(joint_names.size());
+  }
+  ::Eigen::Index size() const { return nq() + nv(); }
+};
 }  // namespace Eigen
 
 // Create an alias to use only one namespace here.
@@ -62,22 +106,26 @@ inline void wrenchMsgToEigen(const geometry_msgs::msg::Wrench& m,
 template <class Derived>
 inline void matrixEigenToMsg(const ::Eigen::MatrixBase<Derived>& e,
                              std_msgs::msg::Float64MultiArray& m) {
-  // verify the input object.
-  m.layout.data_offset = 0;
-  m.layout.dim.resize(2);
-  m.layout.dim[0].label = "rows";
-  m.layout.dim[0].size = e.rows();
-  m.layout.dim[0].stride = e.size();
-  m.layout.dim[1].label = "cols";
-  m.layout.dim[1].stride = e.cols();
-  m.layout.dim[1].size = e.cols();
-  m.data.resize(m.layout.dim[0].stride, 0.0);
-
-  for (int i = 0; i < e.rows(); ++i) {
-    for (int j = 0; j < e.cols(); ++j) {
-      m.data[m.layout.data_offset + m.layout.dim[1].stride * i + j] = e(i, j);
-    }
+  // The layout is only rewritten when the shape of the matrix changed.
+  if (m.layout.dim.size() != 2 || m.layout.data_offset != 0 ||
+      m.layout.dim[0].label != "rows" || m.layout.dim[0].size != e.rows() ||
+      m.layout.dim[0].stride != e.size() || m.layout.dim[1].size != e.cols() ||
+      m.layout.dim[1].stride != e.cols()) {
+    m.layout.data_offset = 0;
+    m.layout.dim.resize(2);
+    m.layout.dim[0].label = "rows";
+    m.layout.dim[0].size = e.rows();
+    m.layout.dim[0].stride = e.size();
+    m.layout.dim[1].label = "cols";
+    m.layout.dim[1].stride = e.cols();
+    m.layout.dim[1].size = e.cols();
   }
+  // Does not reallocate as long as the capacity of the data is large enough.
+  m.data.resize(e.size());
+
+  // Bulk copy, Eigen handles the conversion from column-major storage.
+  ::Eigen::Map<internal::RowMajorMatrixXd>(m.data.data(), e.rows(), e.cols()) =
+      e;
 }
 
 template <class Derived>
@@ -95,13 +143,194 @@ inline void matrixMsgToEigen(const std_msgs::msg::Float64MultiArray& m,
   assert(m.layout.dim[1].size == e.cols() &&
          "Input and output size do not match.");
 
-  for (int i = 0; i < e.rows(); ++i) {
-    for (int j = 0; j < e.cols(); ++j) {
-      e(i, j) = m.data[m.layout.data_offset + m.layout.dim[1].stride * i + j];
+  e = ::Eigen::Map<const internal::RowMajorMatrixXd, ::Eigen::Unaligned,
+                   ::Eigen::OuterStride<>>(
+      m.data.data() + m.layout.data_offset, e.rows(), e.cols(),
+      ::Eigen::OuterStride<>(m.layout.dim[1].stride));
+}
+
+// Encodings of the entries of compact matrices, packed in the data in
+// little-endian row-major order, see matrix_numpy_to_msg_compact of
+// numpy_conversions.py:
+// - kFloat32: entries rounded to float, two per element of the data,
+// - kInt16: scale of each row, i.e. its maximum absolute value divided by
+//   32767, followed by the entries divided by the scale of their row rounded to
+//   int16_t, four per element of the data.
+enum class MatrixEncoding { kFloat64, kFloat32, kInt16 };
+constexpr char kMatrixFloat32Label[] = "rows/float32";
+constexpr char kMatrixInt16Label[] = "rows/int16";
+
+// The packed entries are copied with memcpy, hence in the byte order of the
+// host, which must be little-endian to be decoded on other hosts.
+template <class Derived>
+inline void matrixEigenToCompactMsg(const ::Eigen::MatrixBase<Derived>& e,
+                                    std_msgs::msg::Float64MultiArray& m,
+                                    MatrixEncoding encoding) {
+  if (encoding == MatrixEncoding::kFloat64) {
+    matrixEigenToMsg(e, m);
+    return;
+  }
+  const ::Eigen::Index rows = e.rows();
+  const ::Eigen::Index cols = e.cols();
+  const bool is_float32 = encoding == MatrixEncoding::kFloat32;
+  const ::Eigen::Index per_element = is_float32 ? 2 : 4;
+  const ::Eigen::Index scales = is_float32 ? 0 : rows;
+  const ::Eigen::Index size =
+      scales + (e.size() + per_element - 1) / per_element;
+
+  m.layout.data_offset = 0;
+  m.layout.dim.resize(2);
+  m.layout.dim[0].label = is_float32 ? kMatrixFloat32Label : kMatrixInt16Label;
+  m.layout.dim[0].size = rows;
+  m.layout.dim[0].stride = size;
+  m.layout.dim[1].label = "cols";
+  m.layout.dim[1].size = cols;
+  m.layout.dim[1].stride = cols;
+  m.data.resize(size);
+  // Zeroes the padding of the last element.
+  if (size > scales) {
+    m.data.back() = 0.0;
+  }
+
+  unsigned char* packed =
+      reinterpret_cast<unsigned char*>(m.data.data() + scales);
+  for (::Eigen::Index i = 0; i < rows; ++i) {
+    double scale = 0.0;
+    if (!is_float32) {
+      scale = e.row(i).cwiseAbs().maxCoeff() / 32767.0;
+      m.data[i] = scale;
+    }
+    for (::Eigen::Index j = 0; j < cols; ++j) {
+      const ::Eigen::Index k = i * cols + j;
+      if (is_float32) {
+        const float value = static_cast<float>(e(i, j));
+        std::memcpy(packed + k * sizeof(float), &value, sizeof(float));
+      } else {
+        const std::int16_t value = static_cast<std::int16_t>(
+            scale > 0.0 ? std::nearbyint(e(i, j) / scale) : 0.0);
+        std::memcpy(packed + k * sizeof(value), &value, sizeof(value));
+      }
     }
   }
 }
 
+// Converts a matrix of any encoding of matrixEigenToCompactMsg, resizing e.
+inline void matrixCompactMsgToEigen(const std_msgs::msg::Float64MultiArray& m,
+                                    ::Eigen::MatrixXd& e) {
+  assert(m.layout.dim.size() == 2 && "The ROS message must be a 2D matrix.");
+  const std::string& label = m.layout.dim[0].label;
+  const ::Eigen::Index rows = m.layout.dim[0].size;
+  const ::Eigen::Index cols = m.layout.dim[1].size;
+  e.resize(rows, cols);
+  if (label != kMatrixFloat32Label && label != kMatrixInt16Label) {
+    matrixMsgToEigen(m, e);
+    return;
+  }
+
+  const bool is_float32 = label == kMatrixFloat32Label;
+  const ::Eigen::Index scales = is_float32 ? 0 : rows;
+  assert(m.data.size() * (is_float32 ? 2 : 4) >=
+             static_cast<std::size_t>(scales * 4 + e.size()) &&
+         "The ROS message data is smaller than its layout.");
+  const unsigned char* packed =
+      reinterpret_cast<const unsigned char*>(m.data.data() + scales);
+  for (::Eigen::Index i = 0; i < rows; ++i) {
+    for (::Eigen::Index j = 0; j < cols; ++j) {
+      const ::Eigen::Index k = i * cols + j;
+      if (is_float32) {
+        float value;
+        std::memcpy(&value, packed + k * sizeof(value), sizeof(value));
+        e(i, j) = value;
+      } else {
+        std::int16_t value;
+        std::memcpy(&value, packed + k * sizeof(value), sizeof(value));
+        e(i, j) = value * m.data[i];
+      }
+    }
+  }
+}
+
+// Labels of the first dimension of the matrices encoding an update of the
+// previously sent matrix, see MatrixDeltaEncoder of numpy_conversions.py.
+constexpr char kMatrixReuseLabel[] = "rows/reuse";
+constexpr char kMatrixLowRankLabel[] = "rows/lowrank";
+
+// Applies a full matrix, a reuse flag or a low-rank update A * B, with A of
+// shape (rows, rank) and B of shape (rank, cols) concatenated in row-major
+// order in the data, to the previously decoded matrix e. Returns false, leaving
+// e unchanged, if an update does not match the shape of e or if a low-rank
+// update has no rank or data of another size.
+inline bool matrixDeltaMsgToEigen(const std_msgs::msg::Float64MultiArray& m,
+                                  ::Eigen::MatrixXd& e) {
+  assert(m.layout.dim.size() >= 2 && "The ROS message must be a 2D matrix.");
+  const std::string& label = m.layout.dim[0].label;
+  const ::Eigen::Index rows = m.layout.dim[0].size;
+  const ::Eigen::Index cols = m.layout.dim[1].size;
+  if (label != kMatrixReuseLabel && label != kMatrixLowRankLabel) {
+    e.resize(rows, cols);
+    matrixMsgToEigen(m, e);
+    return true;
+  }
+  if (e.rows() != rows || e.cols() != cols) {
+    return false;
+  }
+  if (label == kMatrixLowRankLabel) {
+    if (m.layout.dim.size() != 3) {
+      return false;
+    }
+    const ::Eigen::Index rank = m.layout.dim[2].size;
+    if (m.data.size() != static_cast<std::size_t>(rank * (rows + cols))) {
+      return false;
+    }
+    ::Eigen::Map<const internal::RowMajorMatrixXd> a(m.data.data(), rows, rank);
+    ::Eigen::Map<const internal::RowMajorMatrixXd> b(
+        m.data.data() + rows * rank, rank, cols);
+    e.noalias() += a * b;
+  }
+  return true;
+}
+
+/**
+ * Msg To Eigen views.
+ *
+ * The views do not copy the data of the messages, they can be used on the
+ * messages received by a subscription or on loaned messages as long as the
+ * message outlives the view.
+ */
+
+inline linear_feedback_controller_msgs::Eigen::ConstMatrixMap
+matrixMsgToEigenMap(const std_msgs::msg::Float64MultiArray& m) {
+  assert(m.layout.dim.size() == 2 && "The ROS message must be a 2D matrix.");
+  assert(m.layout.dim[1].stride >= m.layout.dim[1].size &&
+         "The stride of the rows must not be lower than the number of cols.");
+  assert(m.data.size() >= m.layout.data_offset + m.layout.dim[0].stride &&
+         "The ROS message data is smaller than its layout.");
+  return linear_feedback_controller_msgs::Eigen::ConstMatrixMap(
+      m.data.data() + m.layout.data_offset, m.layout.dim[0].size,
+      m.layout.dim[1].size, ::Eigen::OuterStride<>(m.layout.dim[1].stride));
+}
+
+inline linear_feedback_controller_msgs::Eigen::ConstVectorMap
+vectorMsgToEigenMap(const std_msgs::msg::Float64MultiArray& m) {
+  assert(m.layout.dim.size() == 2 && "The ROS message must be a 2D matrix.");
+  assert(m.layout.dim[1].size == 1 && "The ROS message must be a vector.");
+  assert(m.layout.dim[1].stride == 1 &&
+         "The ROS message must be a contiguous vector.");
+  assert(m.data.size() >= m.layout.data_offset + m.layout.dim[0].size &&
+         "The ROS message data is smaller than its layout.");
+  return linear_feedback_controller_msgs::Eigen::ConstVectorMap(
+      m.data.data() + m.layout.data_offset, m.layout.dim[0].size);
+}
+
+inline linear_feedback_controller_msgs::Eigen::ControlView
+controlMsgToEigenView(const linear_feedback_controller_msgs::msg::Control& m) {
+  return {
+      matrixMsgToEigenMap(m.feedback_gain),
+      vectorMsgToEigenMap(m.feedforward),
+      m.header.stamp,
+  };
+}
+
 /**
  * Msg To Eigen.
  */
@@ -161,6 +390,30 @@ inline void controlMsgToEigen(
   e.stamp = m.header.stamp;
 }
 
+// Same as controlMsgToEigen with a feedback gain encoded as an update of the
+// previously decoded e.feedback_gain. Returns false if the update does not
+// match it, the rest of e is still converted.
+inline bool controlDeltaMsgToEigen(
+    const linear_feedback_controller_msgs::msg::Control& m,
+    linear_feedback_controller_msgs::Eigen::Control& e) {
+  const bool applied = matrixDeltaMsgToEigen(m.feedback_gain, e.feedback_gain);
+  matrixMsgToEigen(m.feedforward, e.feedforward);
+  sensorMsgToEigen(m.initial_state, e.initial_state);
+  e.stamp = m.header.stamp;
+  return applied;
+}
+
+// Same as controlMsgToEigen with a feedback gain of any encoding of
+// matrixEigenToCompactMsg.
+inline void controlCompactMsgToEigen(
+    const linear_feedback_controller_msgs::msg::Control& m,
+    linear_feedback_controller_msgs::Eigen::Control& e) {
+  matrixCompactMsgToEigen(m.feedback_gain, e.feedback_gain);
+  matrixMsgToEigen(m.feedforward, e.feedforward);
+  sensorMsgToEigen(m.initial_state, e.initial_state);
+  e.stamp = m.header.stamp;
+}
+
 /**
  * Eigen To Msg.
  */
@@ -168,13 +421,11 @@ inline void controlMsgToEigen(
 inline void jointStateEigenToMsg(
     const linear_feedback_controller_msgs::Eigen::JointState& e,
     sensor_msgs::msg::JointState& m) {
+  // Assignments reuse the capacity of the message.
   m.name = e.name;
-  m.position = std::vector<double>(e.position.data(),
-                                   e.position.data() + e.position.size());
-  m.velocity = std::vector<double>(e.velocity.data(),
-                                   e.velocity.data() + e.velocity.size());
-  m.effort =
-      std::vector<double>(e.effort.data(), e.effort.data() + e.effort.size());
+  m.position.assign(e.position.data(), e.position.data() + e.position.size());
+  m.velocity.assign(e.velocity.data(), e.velocity.data() + e.velocity.size());
+  m.effort.assign(e.effort.data(), e.effort.data() + e.effort.size());
 }
 
 inline void contactEigenToMsg(
@@ -193,7 +444,7 @@ inline void contactEigenToMsg(
 }
 
 inline void sensorEigenToMsg(
-    const linear_feedback_controller_msgs::Eigen::Sensor e,
+    const linear_feedback_controller_msgs::Eigen::Sensor& e,
     linear_feedback_controller_msgs::msg::Sensor& m) {
   m.base_pose.position.x = e.base_pose(0);
   m.base_pose.position.y = e.base_pose(1);
@@ -220,6 +471,99 @@ inline void controlEigenToMsg(
   m.header.stamp = e.stamp;
 }
 
+inline void controlEigenToCompactMsg(
+    const linear_feedback_controller_msgs::Eigen::Control& e,
+    linear_feedback_controller_msgs::msg::Control& m, MatrixEncoding encoding) {
+  matrixEigenToCompactMsg(e.feedback_gain, m.feedback_gain, encoding);
+  matrixEigenToMsg(e.feedforward, m.feedforward);
+  sensorEigenToMsg(e.initial_state, m.initial_state);
+  m.header.stamp = e.stamp;
+}
+
+/**
+ * State vectors.
+ */
+
+inline linear_feedback_controller_msgs::Eigen::StateLayout
+stateLayoutFromSensor(const linear_feedback_controller_msgs::Eigen::Sensor& e,
+                      bool free_flyer = true) {
+  linear_feedback_controller_msgs::Eigen::StateLayout layout;
+  layout.joint_names = e.joint_state.name;
+  layout.contact_names.reserve(e.contacts.size());
+  for (const auto& contact : e.contacts) {
+    layout.contact_names.push_back(contact.name);
+  }
+  layout.free_flyer = free_flyer;
+  return layout;
+}
+
+inline void sensorToStateVector(
+    const linear_feedback_controller_msgs::Eigen::StateLayout& layout,
+    const linear_feedback_controller_msgs::Eigen::Sensor& e,
+    ::Eigen::Ref<::Eigen::VectorXd> x) {
+  const ::Eigen::Index n_joints = layout.nq() - (layout.free_flyer ? 7 : 0);
+  const ::Eigen::Index base_q = layout.free_flyer ? 7 : 0;
+  const ::Eigen::Index base_v = layout.free_flyer ? 6 : 0;
+  assert(x.size() == layout.size() && "The state vector has a wrong size.");
+  assert(e.joint_state.position.size() == n_joints &&
+         e.joint_state.velocity.size() == n_joints &&
+         "The joints of the sensor do not match the layout.");
+  if (layout.free_flyer) {
+    x.head<7>() = e.base_pose;
+    x.segment<6>(layout.nq()) = e.base_twist;
+  }
+  x.segment(base_q, n_joints) = e.joint_state.position;
+  x.segment(layout.nq() + base_v, n_joints) = e.joint_state.velocity;
+}
+
+inline void sensorMsgToStateVector(
+    const linear_feedback_controller_msgs::Eigen::StateLayout& layout,
+    const linear_feedback_controller_msgs::msg::Sensor& m,
+    ::Eigen::Ref<::Eigen::VectorXd> x) {
+  const ::Eigen::Index n_joints = layout.nq() - (layout.free_flyer ? 7 : 0);
+  const ::Eigen::Index base_q = layout.free_flyer ? 7 : 0;
+  const ::Eigen::Index base_v = layout.free_flyer ? 6 : 0;
+  assert(x.size() == layout.size() && "The state vector has a wrong size.");
+  assert(m.joint_state.position.size() == static_cast<std::size_t>(n_joints) &&
+         m.joint_state.velocity.size() == static_cast<std::size_t>(n_joints) &&
+         "The joints of the sensor do not match the layout.");
+  if (layout.free_flyer) {
+    x(0) = m.base_pose.position.x;
+    x(1) = m.base_pose.position.y;
+    x(2) = m.base_pose.position.z;
+    x(3) = m.base_pose.orientation.x;
+    x(4) = m.base_pose.orientation.y;
+    x(5) = m.base_pose.orientation.z;
+    x(6) = m.base_pose.orientation.w;
+    ::Eigen::Matrix<double, 6, 1> twist;
+    tf2::fromMsg(m.base_twist, twist);
+    x.segment<6>(layout.nq()) = twist;
+  }
+  x.segment(base_q, n_joints) = ::Eigen::Map<const ::Eigen::VectorXd>(
+      m.joint_state.position.data(), n_joints);
+  x.segment(layout.nq() + base_v, n_joints) =
+      ::Eigen::Map<const ::Eigen::VectorXd>(m.joint_state.velocity.data(),
+                                            n_joints);
+}
+
+inline void stateVectorToSensor(
+    const linear_feedback_controller_msgs::Eigen::StateLayout& layout,
+    const ::Eigen::Ref<const ::Eigen::VectorXd>& x,
+    linear_feedback_controller_msgs::Eigen::Sensor& e) {
+  const ::Eigen::Index n_joints = layout.nq() - (layout.free_flyer ? 7 : 0);
+  const ::Eigen::Index base_q = layout.free_flyer ? 7 : 0;
+  const ::Eigen::Index base_v = layout.free_flyer ? 6 : 0;
+  assert(x.size() == layout.size() && "The state vector has a wrong size.");
+  if (layout.free_flyer) {
+    e.base_pose = x.head<7>();
+    e.base_twist = x.segment<6>(layout.nq());
+  }
+  // Memory is only allocated until the sensor has the joints of the layout.
+  e.joint_state.name = layout.joint_names;
+  e.joint_state.position = x.segment(base_q, n_joints);
+  e.joint_state.velocity = x.segment(layout.nq() + base_v, n_joints);
+}
+
 }  // namespace linear_feedback_controller_msgs
 
 #endif  // LINEAR_FEEDBACK_CONTROLLER_MSGS__EIGEN_CONVERSIONS_HPP_
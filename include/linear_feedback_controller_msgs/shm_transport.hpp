@@ -0,0 +1,519 @@
+#ifndef LINEAR_FEEDBACK_CONTROLLER_MSGS__SHM_TRANSPORT_HPP_
+#define LINEAR_FEEDBACK_CONTROLLER_MSGS__SHM_TRANSPORT_HPP_
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <algorithm>
+#include <atomic>
+#include <cassert>
+#include <cerrno>
+#include <cstdint>
+#include <cstring>
+#include <initializer_list>
+#include <limits>
+#include <string>
+#include <system_error>
+#include <utility>
+
+#include "linear_feedback_controller_msgs/eigen_conversions.hpp"
+
+namespace linear_feedback_controller_msgs {
+namespace shm {
+
+/**
+ * Fixed binary layout of the records, shared with the Python module
+ * linear_feedback_controller_msgs_py.shm_transport.
+ *
+ * A record starts with a RecordHeader followed by doubles:
+ *  - Sensor: base pose, base twist, joint positions, velocities and efforts,
+ *    wrench and pose of each contact, then the activity of each contact as
+ *    0.0 or 1.0. Empty joint state vectors are encoded as NaN.
+ *  - Control: feedback gain in row-major order, feedforward, then the Sensor
+ *    payload of the initial state.
+ * Names of the joints and contacts are not part of the records.
+ */
+
+enum RecordKind : std::int64_t { kSensorRecord = 1, kControlRecord = 2 };
+
+struct RecordHeader {
+  std::int64_t kind;
+  std::int64_t stamp_ns;
+  std::int64_t n_joints;
+  std::int64_t n_contacts;
+  std::int64_t feedback_gain_rows;
+  std::int64_t feedback_gain_cols;
+  std::int64_t feedforward_size;
+  // Stamp of the initial state of Control records, 0 for Sensor records.
+  std::int64_t initial_state_stamp_ns;
+};
+static_assert(sizeof(RecordHeader) == 64, "RecordHeader must be 64 bytes.");
+
+inline std::size_t sensorPayloadSize(std::size_t n_joints,
+                                     std::size_t n_contacts) {
+  return 13 + 3 * n_joints + 14 * n_contacts;
+}
+
+inline std::size_t sensorRecordSize(
+    const linear_feedback_controller_msgs::Eigen::Sensor& e) {
+  return sizeof(RecordHeader) +
+         sizeof(double) *
+             sensorPayloadSize(e.joint_state.name.size(), e.contacts.size());
+}
+
+inline std::size_t controlRecordSize(
+    const linear_feedback_controller_msgs::Eigen::Control& e) {
+  return sensorRecordSize(e.initial_state) +
+         sizeof(double) * (e.feedback_gain.size() + e.feedforward.size());
+}
+
+// Size of a record computed from its header.
+inline std::size_t recordSize(const RecordHeader& header) {
+  return sizeof(RecordHeader) +
+         sizeof(double) *
+             (sensorPayloadSize(header.n_joints, header.n_contacts) +
+              header.feedback_gain_rows * header.feedback_gain_cols +
+              header.feedforward_size);
+}
+
+namespace internal {
+
+// Joint state vectors must be empty or have one value per joint name.
+inline bool hasValidJointState(
+    const linear_feedback_controller_msgs::Eigen::Sensor& e) {
+  const ::Eigen::Index n_joints = e.joint_state.name.size();
+  for (const ::Eigen::VectorXd* values :
+       {&e.joint_state.position, &e.joint_state.velocity,
+        &e.joint_state.effort}) {
+    if (values->size() != n_joints && values->size() != 0) {
+      return false;
+    }
+  }
+  return true;
+}
+
+inline double* encodeSensorPayload(
+    const linear_feedback_controller_msgs::Eigen::Sensor& e, double* out) {
+  const ::Eigen::Index n_joints = e.joint_state.name.size();
+  ::Eigen::Map<::Eigen::Matrix<double, 7, 1>>{out} = e.base_pose;
+  ::Eigen::Map<::Eigen::Matrix<double, 6, 1>>{out + 7} = e.base_twist;
+  out += 13;
+  // Empty joint state vectors are filled with NaN.
+  for (const ::Eigen::VectorXd* values :
+       {&e.joint_state.position, &e.joint_state.velocity,
+        &e.joint_state.effort}) {
+    ::Eigen::Map<::Eigen::VectorXd> block{out, n_joints};
+    if (values->size() == 0) {
+      block.setConstant(std::numeric_limits<double>::quiet_NaN());
+    } else {
+      block = *values;
+    }
+    out += n_joints;
+  }
+  for (const auto& contact : e.contacts) {
+    ::Eigen::Map<::Eigen::Matrix<double, 6, 1>>{out} = contact.wrench;
+    ::Eigen::Map<::Eigen::Matrix<double, 7, 1>>{out + 6} = contact.pose;
+    out += 13;
+  }
+  for (const auto& contact : e.contacts) {
+    *out++ = contact.active ? 1.0 : 0.0;
+  }
+  return out;
+}
+
+// Joint and contact names of the output are kept, only their number changes.
+inline const double* decodeSensorPayload(
+    const double* in, ::Eigen::Index n_joints, ::Eigen::Index n_contacts,
+    linear_feedback_controller_msgs::Eigen::Sensor& e) {
+  e.base_pose = ::Eigen::Map<const ::Eigen::Matrix<double, 7, 1>>(in);
+  e.base_twist = ::Eigen::Map<const ::Eigen::Matrix<double, 6, 1>>(in + 7);
+  in += 13;
+  e.joint_state.name.resize(n_joints);
+  e.joint_state.position = ::Eigen::Map<const ::Eigen::VectorXd>(in, n_joints);
+  e.joint_state.velocity =
+      ::Eigen::Map<const ::Eigen::VectorXd>(in + n_joints, n_joints);
+  e.joint_state.effort =
+      ::Eigen::Map<const ::Eigen::VectorXd>(in + 2 * n_joints, n_joints);
+  in += 3 * n_joints;
+  e.contacts.resize(n_contacts);
+  for (auto& contact : e.contacts) {
+    contact.wrench = ::Eigen::Map<const ::Eigen::Matrix<double, 6, 1>>(in);
+    contact.pose = ::Eigen::Map<const ::Eigen::Matrix<double, 7, 1>>(in + 6);
+    in += 13;
+  }
+  for (auto& contact : e.contacts) {
+    contact.active = *in++ != 0.0;
+  }
+  return in;
+}
+
+}  // namespace internal
+
+/**
+ * Encoding, the output must be aligned on 8 bytes. The functions return the
+ * size of the record in bytes, or 0 if it does not fit in the capacity or if
+ * the joint state vectors are neither empty nor of the size of the joint names.
+ */
+
+inline std::size_t encodeSensor(
+    const linear_feedback_controller_msgs::Eigen::Sensor& e, void* out,
+    std::size_t capacity) {
+  const std::size_t size = sensorRecordSize(e);
+  if (size > capacity || !internal::hasValidJointState(e)) {
+    return 0;
+  }
+  auto* header = static_cast<RecordHeader*>(out);
+  *header = {
+      kSensorRecord,
+      e.stamp.nanoseconds(),
+      static_cast<std::int64_t>(e.joint_state.name.size()),
+      static_cast<std::int64_t>(e.contacts.size()),
+      0,
+      0,
+      0,
+      0,
+  };
+  internal::encodeSensorPayload(e, reinterpret_cast<double*>(header + 1));
+  return size;
+}
+
+inline std::size_t encodeControl(
+    const linear_feedback_controller_msgs::Eigen::Control& e, void* out,
+    std::size_t capacity) {
+  const std::size_t size = controlRecordSize(e);
+  if (size > capacity || !internal::hasValidJointState(e.initial_state)) {
+    return 0;
+  }
+  auto* header = static_cast<RecordHeader*>(out);
+  *header = {
+      kControlRecord,
+      e.stamp.nanoseconds(),
+      static_cast<std::int64_t>(e.initial_state.joint_state.name.size()),
+      static_cast<std::int64_t>(e.initial_state.contacts.size()),
+      e.feedback_gain.rows(),
+      e.feedback_gain.cols(),
+      e.feedforward.size(),
+      e.initial_state.stamp.nanoseconds(),
+  };
+  auto* payload = reinterpret_cast<double*>(header + 1);
+  ::Eigen::Map<::linear_feedback_controller_msgs::internal::RowMajorMatrixXd>{
+      payload, e.feedback_gain.rows(), e.feedback_gain.cols()} =
+      e.feedback_gain;
+  payload += e.feedback_gain.size();
+  ::Eigen::Map<::Eigen::VectorXd>{payload, e.feedforward.size()} =
+      e.feedforward;
+  internal::encodeSensorPayload(e.initial_state,
+                                payload + e.feedforward.size());
+  return size;
+}
+
+/**
+ * Decoding, the input must be aligned on 8 bytes. The functions return false
+ * if the record is not of the expected kind.
+ */
+
+inline bool decodeSensor(const void* in,
+                         linear_feedback_controller_msgs::Eigen::Sensor& e) {
+  const auto* header = static_cast<const RecordHeader*>(in);
+  if (header->kind != kSensorRecord) {
+    return false;
+  }
+  internal::decodeSensorPayload(reinterpret_cast<const double*>(header + 1),
+                                header->n_joints, header->n_contacts, e);
+  e.stamp = rclcpp::Time(header->stamp_ns, RCL_ROS_TIME);
+  return true;
+}
+
+inline bool decodeControl(const void* in,
+                          linear_feedback_controller_msgs::Eigen::Control& e) {
+  const auto* header = static_cast<const RecordHeader*>(in);
+  if (header->kind != kControlRecord) {
+    return false;
+  }
+  const auto* payload = reinterpret_cast<const double*>(header + 1);
+  e.feedback_gain = ::Eigen::Map<
+      const ::linear_feedback_controller_msgs::internal::RowMajorMatrixXd>(
+      payload, header->feedback_gain_rows, header->feedback_gain_cols);
+  payload += header->feedback_gain_rows * header->feedback_gain_cols;
+  e.feedforward =
+      ::Eigen::Map<const ::Eigen::VectorXd>(payload, header->feedforward_size);
+  internal::decodeSensorPayload(payload + header->feedforward_size,
+                                header->n_joints, header->n_contacts,
+                                e.initial_state);
+  e.stamp = rclcpp::Time(header->stamp_ns, RCL_ROS_TIME);
+  e.initial_state.stamp =
+      rclcpp::Time(header->initial_state_stamp_ns, RCL_ROS_TIME);
+  return true;
+}
+
+/**
+ * Single producer single consumer ring buffer of records in a memory mapped
+ * file, e.g. in /dev/shm. One process pushes records, the other one pops them,
+ * the records are copied once on each side.
+ *
+ * The file starts with 4 uint64 (magic, version, number of slots, size of the
+ * slots), the write index at offset 64 and the read index at offset 128.
+ * Slots start at offset 192, each holding the uint64 size of the record
+ * followed by the record.
+ */
+class RingBuffer {
+ public:
+  static constexpr std::uint64_t kMagic = 0x4c46435f53484d31;  // "LFC_SHM1"
+  static constexpr std::uint64_t kVersion = 1;
+  static constexpr std::size_t kWriteIndexOffset = 64;
+  static constexpr std::size_t kReadIndexOffset = 128;
+  static constexpr std::size_t kSlotsOffset = 192;
+
+  // Creates the file, or resets it if it exists.
+  RingBuffer(const std::string& path, std::size_t slot_count,
+             std::size_t record_capacity) {
+    const std::size_t slot_size = 8 + (record_capacity + 7) / 8 * 8;
+    map(path, O_RDWR | O_CREAT, kSlotsOffset + slot_count * slot_size);
+    auto* control = static_cast<std::uint64_t*>(data_);
+    control[1] = kVersion;
+    control[2] = slot_count;
+    control[3] = slot_size;
+    writeIndex().store(0, std::memory_order_relaxed);
+    readIndex().store(0, std::memory_order_relaxed);
+    // The magic is written last to mark the buffer as initialized.
+    std::atomic_thread_fence(std::memory_order_release);
+    control[0] = kMagic;
+    init();
+  }
+
+  // Opens a ring buffer created by another process.
+  explicit RingBuffer(const std::string& path) {
+    map(path, O_RDWR, 0);
+    init();
+  }
+
+  RingBuffer(const RingBuffer&) = delete;
+  RingBuffer& operator=(const RingBuffer&) = delete;
+  RingBuffer(RingBuffer&& other) noexcept { *this = std::move(other); }
+  RingBuffer& operator=(RingBuffer&& other) noexcept {
+    std::swap(data_, other.data_);
+    std::swap(size_, other.size_);
+    std::swap(slot_count_, other.slot_count_);
+    std::swap(slot_size_, other.slot_size_);
+    return *this;
+  }
+  ~RingBuffer() {
+    if (data_ != nullptr) {
+      munmap(data_, size_);
+    }
+  }
+
+  std::size_t recordCapacity() const { return slot_size_ - 8; }
+
+  /**
+   * Producer side.
+   */
+
+  // Returns the record of the next free slot, nullptr if the buffer is full.
+  void* reserve() {
+    const std::uint64_t write_index =
+        writeIndex().load(std::memory_order_relaxed);
+    if (write_index - readIndex().load(std::memory_order_acquire) >=
+        slot_count_) {
+      return nullptr;
+    }
+    return slot(write_index) + 8;
+  }
+
+  // Publishes the record of the reserved slot.
+  void commit(std::size_t size) {
+    const std::uint64_t write_index =
+        writeIndex().load(std::memory_order_relaxed);
+    assert(size <= recordCapacity() && "The record exceeds the slot size.");
+    *reinterpret_cast<std::uint64_t*>(slot(write_index)) = size;
+    writeIndex().store(write_index + 1, std::memory_order_release);
+  }
+
+  // Returns false if the buffer is full or the record exceeds the slot size.
+  bool push(const void* record, std::size_t size) {
+    if (size > recordCapacity()) {
+      return false;
+    }
+    void* out = reserve();
+    if (out == nullptr) {
+      return false;
+    }
+    std::memcpy(out, record, size);
+    commit(size);
+    return true;
+  }
+
+  bool pushSensor(const linear_feedback_controller_msgs::Eigen::Sensor& e) {
+    void* out = reserve();
+    if (out == nullptr) {
+      return false;
+    }
+    const std::size_t size = encodeSensor(e, out, recordCapacity());
+    if (size == 0) {
+      return false;
+    }
+    commit(size);
+    return true;
+  }
+
+  bool pushControl(const linear_feedback_controller_msgs::Eigen::Control& e) {
+    void* out = reserve();
+    if (out == nullptr) {
+      return false;
+    }
+    const std::size_t size = encodeControl(e, out, recordCapacity());
+    if (size == 0) {
+      return false;
+    }
+    commit(size);
+    return true;
+  }
+
+  /**
+   * Consumer side.
+   */
+
+  // Returns the oldest record, nullptr if the buffer is empty.
+  const void* peek(std::size_t& size) const {
+    const std::uint64_t read_index =
+        readIndex().load(std::memory_order_relaxed);
+    if (read_index == writeIndex().load(std::memory_order_acquire)) {
+      return nullptr;
+    }
+    const std::uint8_t* s = slot(read_index);
+    size = *reinterpret_cast<const std::uint64_t*>(s);
+    return s + 8;
+  }
+
+  // Frees the slot of the oldest record.
+  void release() {
+    readIndex().store(readIndex().load(std::memory_order_relaxed) + 1,
+                      std::memory_order_release);
+  }
+
+  // Returns the size of the record, 0 if the buffer is empty.
+  std::size_t pop(void* record, std::size_t capacity) {
+    std::size_t size = 0;
+    const void* in = peek(size);
+    if (in == nullptr) {
+      return 0;
+    }
+    assert(size <= capacity && "The output is smaller than the record.");
+    std::memcpy(record, in, std::min(size, capacity));
+    release();
+    return size;
+  }
+
+  bool popSensor(linear_feedback_controller_msgs::Eigen::Sensor& e) {
+    std::size_t size = 0;
+    const void* in = peek(size);
+    if (in == nullptr) {
+      return false;
+    }
+    const bool decoded = isComplete(in, size) && decodeSensor(in, e);
+    release();
+    return decoded;
+  }
+
+  bool popControl(linear_feedback_controller_msgs::Eigen::Control& e) {
+    std::size_t size = 0;
+    const void* in = peek(size);
+    if (in == nullptr) {
+      return false;
+    }
+    const bool decoded = isComplete(in, size) && decodeControl(in, e);
+    release();
+    return decoded;
+  }
+
+ private:
+  // Whether the record holds the whole payload described by its header.
+  static bool isComplete(const void* record, std::size_t size) {
+    if (size < sizeof(RecordHeader)) {
+      return false;
+    }
+    const auto* header = static_cast<const RecordHeader*>(record);
+    // Bounding the dimensions by the size first avoids overflows.
+    for (const std::int64_t dimension :
+         {header->n_joints, header->n_contacts, header->feedback_gain_rows,
+          header->feedback_gain_cols, header->feedforward_size}) {
+      if (dimension < 0 || static_cast<std::size_t>(dimension) > size) {
+        return false;
+      }
+    }
+    return size >= recordSize(*header);
+  }
+
+  static_assert(std::atomic<std::uint64_t>::is_always_lock_free,
+                "The indices must be lock free to be shared between "
+                "processes.");
+  static_assert(sizeof(std::atomic<std::uint64_t>) == sizeof(std::uint64_t),
+                "The indices must have the layout of uint64.");
+
+  void map(const std::string& path, int flags, std::size_t size) {
+    const int fd = ::open(path.c_str(), flags, 0600);
+    if (fd < 0) {
+      throw std::system_error(errno, std::generic_category(), path);
+    }
+    if (size == 0) {
+      struct stat st;
+      if (::fstat(fd, &st) == 0) {
+        size = st.st_size;
+      }
+    } else if (::ftruncate(fd, size) != 0) {
+      size = 0;
+    }
+    if (size < kSlotsOffset) {
+      ::close(fd);
+      throw std::system_error(EINVAL, std::generic_category(), path);
+    }
+    void* data =
+        ::mmap(nullptr, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    ::close(fd);
+    if (data == MAP_FAILED) {
+      throw std::system_error(errno, std::generic_category(), path);
+    }
+    data_ = data;
+    size_ = size;
+  }
+
+  void init() {
+    const auto* control = static_cast<const std::uint64_t*>(data_);
+    if (control[0] != kMagic || control[1] != kVersion) {
+      throw std::system_error(EINVAL, std::generic_category(),
+                              "Not a ring buffer or unsupported version.");
+    }
+    std::atomic_thread_fence(std::memory_order_acquire);
+    slot_count_ = control[2];
+    slot_size_ = control[3];
+    assert(kSlotsOffset + slot_count_ * slot_size_ <= size_ &&
+           "The file is smaller than the ring buffer.");
+  }
+
+  std::atomic<std::uint64_t>& writeIndex() const {
+    return *reinterpret_cast<std::atomic<std::uint64_t>*>(
+        static_cast<std::uint8_t*>(data_) + kWriteIndexOffset);
+  }
+
+  std::atomic<std::uint64_t>& readIndex() const {
+    return *reinterpret_cast<std::atomic<std::uint64_t>*>(
+        static_cast<std::uint8_t*>(data_) + kReadIndexOffset);
+  }
+
+  std::uint8_t* slot(std::uint64_t index) const {
+    return static_cast<std::uint8_t*>(data_) + kSlotsOffset +
+           (index % slot_count_) * slot_size_;
+  }
+
+  void* data_ = nullptr;
+  std::size_t size_ = 0;
+  std::size_t slot_count_ = 0;
+  std::size_t slot_size_ = 0;
+};
+
+}  // namespace shm
+}  // namespace linear_feedback_controller_msgs
+
+#endif  // LINEAR_FEEDBACK_CONTROLLER_MSGS__SHM_TRANSPORT_HPP_
@@ -0,0 +1,378 @@
+"""Columnar on-disk log of Sensor and Control streams.
+
+A log is a directory with one raw file per field of each stream, named
+``<stream>/<field>.bin``, and an ``index.json`` holding the names of the joints
+and contacts and the dtype and sample shape of every field. Samples are appended
+to the end of the files. The loader maps the files with ``np.memmap`` and derives
+the number of samples from their sizes, reading a time window of a field only
+touches the pages of that window.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+
+if TYPE_CHECKING:
+    from linear_feedback_controller_msgs.msg import Control, Sensor
+
+LOG_VERSION = 1
+INDEX_FILE = "index.json"
+SENSOR_STREAM = "sensor"
+CONTROL_STREAM = "control"
+
+# Field name to (dtype, sample shape).
+FieldSpecs = Dict[str, Tuple[str, Tuple[int, ...]]]
+
+
+def _sensor_fields(n_joints: int, n_contacts: int, prefix: str = "") -> FieldSpecs:
+    return {
+        f"{prefix}stamp": ("<i8", ()),
+        f"{prefix}base_pose": ("<f8", (7,)),
+        f"{prefix}base_twist": ("<f8", (6,)),
+        f"{prefix}joint_position": ("<f8", (n_joints,)),
+        f"{prefix}joint_velocity": ("<f8", (n_joints,)),
+        f"{prefix}joint_effort": ("<f8", (n_joints,)),
+        f"{prefix}contact_active": ("|b1", (n_contacts,)),
+        f"{prefix}contact_wrench": ("<f8", (n_contacts, 6)),
+        f"{prefix}contact_pose": ("<f8", (n_contacts, 7)),
+    }
+
+
+def _control_fields(
+    n_joints: int, n_contacts: int, gain_shape: Tuple[int, int], feedforward_size: int
+) -> FieldSpecs:
+    fields = {
+        "stamp": ("<i8", ()),
+        "feedback_gain": ("<f8", gain_shape),
+        "feedforward": ("<f8", (feedforward_size,)),
+    }
+    fields.update(_sensor_fields(n_joints, n_contacts, "initial_state."))
+    return fields
+
+
+def _sensor_columns(
+    sensor: lfc_py_types.Sensor, n_joints: int, prefix: str = ""
+) -> Dict[str, npt.ArrayLike]:
+    joint_state = sensor.joint_state
+    columns = {
+        f"{prefix}stamp": [lfc_py_types.stamp_nanoseconds(sensor.stamp)],
+        f"{prefix}base_pose": [sensor.base_pose],
+        f"{prefix}base_twist": [sensor.base_twist],
+        f"{prefix}contact_active": np.array(
+            [contact.active for contact in sensor.contacts], dtype=np.bool_
+        ).reshape(1, -1),
+        f"{prefix}contact_wrench": np.array(
+            [contact.wrench for contact in sensor.contacts], dtype=np.float64
+        ).reshape(1, -1, 6),
+        f"{prefix}contact_pose": np.array(
+            [contact.pose for contact in sensor.contacts], dtype=np.float64
+        ).reshape(1, -1, 7),
+    }
+    for field_name in ("position", "velocity", "effort"):
+        values = getattr(joint_state, field_name)
+        # Joint state fields left empty are logged as NaN, as in SensorBatch.
+        columns[f"{prefix}joint_{field_name}"] = (
+            [values] if len(values) else np.full((1, n_joints), np.nan)
+        )
+    return columns
+
+
+def _sensor_batch_columns(batch: lfc_py_types.SensorBatch) -> Dict[str, npt.ArrayLike]:
+    return {
+        "stamp": batch.stamp,
+        "base_pose": batch.base_pose,
+        "base_twist": batch.base_twist,
+        "joint_position": batch.joint_state.position,
+        "joint_velocity": batch.joint_state.velocity,
+        "joint_effort": batch.joint_state.effort,
+        "contact_active": batch.contact_active,
+        "contact_wrench": batch.contact_wrench,
+        "contact_pose": batch.contact_pose,
+    }
+
+
+class ColumnarLogWriter:
+    """Appends Sensor and Control samples to a columnar log. All samples of a
+    stream must have the joints and contacts given at construction, the gains
+    of the Control stream keep the shape of the first sample.
+    """
+
+    def __init__(
+        self, path: str, joint_names: List[str], contact_names: List[str]
+    ) -> None:
+        """Creates the log directory, existing streams of the log are overwritten.
+
+        Args:
+            path (str): Directory of the log.
+            joint_names (List[str]): Names of the joints.
+            contact_names (List[str]): Names of the contacts.
+        """
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._joint_names = list(joint_names)
+        self._contact_names = list(contact_names)
+        self._files: Dict[str, Dict[str, BinaryIO]] = {}
+        self._index = {
+            "version": LOG_VERSION,
+            "joint_names": self._joint_names,
+            "contact_names": self._contact_names,
+            "streams": {},
+        }
+
+    def _open_stream(self, stream: str, fields: FieldSpecs) -> None:
+        os.makedirs(os.path.join(self._path, stream), exist_ok=True)
+        self._files[stream] = {
+            name: open(os.path.join(self._path, stream, f"{name}.bin"), "wb")
+            for name in fields
+        }
+        self._index["streams"][stream] = {
+            name: {"dtype": dtype, "shape": list(shape)}
+            for name, (dtype, shape) in fields.items()
+        }
+        self._write_index()
+
+    def _write(
+        self, stream: str, columns: Dict[str, npt.ArrayLike], n_samples: int
+    ) -> None:
+        fields = self._index["streams"][stream]
+        for name, file in self._files[stream].items():
+            spec = fields[name]
+            value = np.ascontiguousarray(columns[name], dtype=spec["dtype"])
+            assert value.shape == (n_samples, *spec["shape"]), (
+                f"Field '{stream}/{name}' has shape '{value.shape}', "
+                f"expected '{(n_samples, *spec['shape'])}'!"
+            )
+            file.write(value.data)
+
+    def _check_names(self, sensor: lfc_py_types.Sensor) -> None:
+        assert sensor.joint_state.name == self._joint_names, (
+            "Sensor joint names do not match the joint names of the log!"
+        )
+        assert [contact.name for contact in sensor.contacts] == self._contact_names, (
+            "Sensor contact names do not match the contact names of the log!"
+        )
+
+    def append_sensor(self, sensor: lfc_py_types.Sensor) -> None:
+        """Appends a sample to the Sensor stream.
+
+        Args:
+            sensor (lfc_py_types.Sensor): Sensor sample.
+        """
+        self._check_names(sensor)
+        if SENSOR_STREAM not in self._files:
+            self._open_stream(
+                SENSOR_STREAM,
+                _sensor_fields(len(self._joint_names), len(self._contact_names)),
+            )
+        self._write(SENSOR_STREAM, _sensor_columns(sensor, len(self._joint_names)), 1)
+
+    def append_sensor_batch(self, batch: lfc_py_types.SensorBatch) -> None:
+        """Appends all samples of a batch to the Sensor stream.
+
+        Args:
+            batch (lfc_py_types.SensorBatch): Sensor samples.
+        """
+        assert batch.joint_state.name == self._joint_names, (
+            "Batch joint names do not match the joint names of the log!"
+        )
+        assert batch.contact_names == self._contact_names, (
+            "Batch contact names do not match the contact names of the log!"
+        )
+        if SENSOR_STREAM not in self._files:
+            self._open_stream(
+                SENSOR_STREAM,
+                _sensor_fields(len(self._joint_names), len(self._contact_names)),
+            )
+        self._write(SENSOR_STREAM, _sensor_batch_columns(batch), len(batch))
+
+    def append_control(self, control: lfc_py_types.Control) -> None:
+        """Appends a sample to the Control stream.
+
+        Args:
+            control (lfc_py_types.Control): Control sample.
+        """
+        self._check_names(control.initial_state)
+        if CONTROL_STREAM not in self._files:
+            self._open_stream(
+                CONTROL_STREAM,
+                _control_fields(
+                    len(self._joint_names),
+                    len(self._contact_names),
+                    control.feedback_gain.shape,
+                    control.feedforward.size,
+                ),
+            )
+        columns = _sensor_columns(
+            control.initial_state, len(self._joint_names), "initial_state."
+        )
+        columns["stamp"] = [lfc_py_types.stamp_nanoseconds(control.stamp)]
+        columns["feedback_gain"] = [control.feedback_gain]
+        columns["feedforward"] = [control.feedforward.reshape(-1)]
+        self._write(CONTROL_STREAM, columns, 1)
+
+    def append_sensor_msg(self, msg: Sensor) -> None:
+        """Appends a ROS Sensor message to the Sensor stream.
+
+        Args:
+            msg (linear_feedback_controller_msgs.msg.Sensor): Sensor message.
+        """
+        self.append_sensor(npc.sensor_msg_to_numpy(msg))
+
+    def append_control_msg(self, msg: Control) -> None:
+        """Appends a ROS Control message to the Control stream.
+
+        Args:
+            msg (linear_feedback_controller_msgs.msg.Control): Control message.
+        """
+        self.append_control(npc.control_msg_to_numpy(msg))
+
+    def _write_index(self) -> None:
+        index_path = os.path.join(self._path, INDEX_FILE)
+        with open(index_path + ".tmp", "w") as file:
+            json.dump(self._index, file, indent=2)
+        os.replace(index_path + ".tmp", index_path)
+
+    def flush(self) -> None:
+        """Writes the buffered samples to the files."""
+        for files in self._files.values():
+            for file in files.values():
+                file.flush()
+
+    def close(self) -> None:
+        """Flushes and closes the files of the log."""
+        for files in self._files.values():
+            for file in files.values():
+                file.close()
+        self._files = {}
+
+    def __enter__(self) -> "ColumnarLogWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ColumnarLog:
+    """Read-only columnar log, fields of the streams are ``np.memmap`` of shape
+    (T, ...) and are only read from disk when accessed.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Maps the fields of all streams of the log.
+
+        Args:
+            path (str): Directory of the log.
+        """
+        with open(os.path.join(path, INDEX_FILE)) as file:
+            index = json.load(file)
+        assert index["version"] == LOG_VERSION, (
+            f"Columnar log version '{index['version']}' is not supported!"
+        )
+        self.joint_names: List[str] = index["joint_names"]
+        self.contact_names: List[str] = index["contact_names"]
+        self.columns: Dict[str, Dict[str, npt.NDArray]] = {}
+
+        for stream, fields in index["streams"].items():
+            paths = {name: os.path.join(path, stream, f"{name}.bin") for name in fields}
+            sample_sizes = {
+                name: np.dtype(spec["dtype"]).itemsize
+                * int(np.prod(spec["shape"], dtype=np.int64))
+                for name, spec in fields.items()
+            }
+            # Samples being appended field by field, the last one may be partial.
+            n_samples = min(
+                os.path.getsize(paths[name]) // size
+                for name, size in sample_sizes.items()
+                if size > 0
+            )
+            self.columns[stream] = {
+                name: (
+                    np.memmap(
+                        paths[name],
+                        dtype=spec["dtype"],
+                        mode="r",
+                        shape=(n_samples, *spec["shape"]),
+                    )
+                    if n_samples > 0 and sample_sizes[name] > 0
+                    else np.empty((n_samples, *spec["shape"]), dtype=spec["dtype"])
+                )
+                for name, spec in fields.items()
+            }
+
+    def _sensor_batch(
+        self, columns: Dict[str, npt.NDArray], window: slice, prefix: str = ""
+    ) -> lfc_py_types.SensorBatch:
+        return lfc_py_types.SensorBatch(
+            base_pose=columns[f"{prefix}base_pose"][window],
+            base_twist=columns[f"{prefix}base_twist"][window],
+            joint_state=lfc_py_types.JointState(
+                name=self.joint_names,
+                position=columns[f"{prefix}joint_position"][window],
+                velocity=columns[f"{prefix}joint_velocity"][window],
+                effort=columns[f"{prefix}joint_effort"][window],
+            ),
+            contact_names=self.contact_names,
+            contact_active=columns[f"{prefix}contact_active"][window],
+            contact_wrench=columns[f"{prefix}contact_wrench"][window],
+            contact_pose=columns[f"{prefix}contact_pose"][window],
+            stamp=columns[f"{prefix}stamp"][window],
+        )
+
+    def _window(self, stream: str, start: Optional[int], stop: Optional[int]) -> slice:
+        # Stamps are expected to be sorted, the search reads O(log T) pages.
+        stamp = self.columns[stream]["stamp"]
+        return slice(
+            None if start is None else int(np.searchsorted(stamp, start, "left")),
+            None if stop is None else int(np.searchsorted(stamp, stop, "left")),
+        )
+
+    def sensor(
+        self, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> lfc_py_types.SensorBatch:
+        """Returns the Sensor samples stamped in [start, stop).
+
+        Args:
+            start (Optional[int]): First stamp in nanoseconds, from the beginning
+                of the log if None.
+            stop (Optional[int]): End stamp in nanoseconds, until the end of the
+                log if None.
+
+        Returns:
+            lfc_py_types.SensorBatch: Sensor samples as views of the log files.
+        """
+        assert SENSOR_STREAM in self.columns, "The log has no Sensor stream!"
+        return self._sensor_batch(
+            self.columns[SENSOR_STREAM], self._window(SENSOR_STREAM, start, stop)
+        )
+
+    def control(
+        self, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> lfc_py_types.ControlBatch:
+        """Returns the Control samples stamped in [start, stop).
+
+        Args:
+            start (Optional[int]): First stamp in nanoseconds, from the beginning
+                of the log if None.
+            stop (Optional[int]): End stamp in nanoseconds, until the end of the
+                log if None.
+
+        Returns:
+            lfc_py_types.ControlBatch: Control samples as views of the log files.
+        """
+        assert CONTROL_STREAM in self.columns, "The log has no Control stream!"
+        columns = self.columns[CONTROL_STREAM]
+        window = self._window(CONTROL_STREAM, start, stop)
+        return lfc_py_types.ControlBatch(
+            feedback_gain=columns["feedback_gain"][window],
+            feedforward=columns["feedforward"][window],
+            initial_state=self._sensor_batch(columns, window, "initial_state."),
+            stamp=columns["stamp"][window],
+        )
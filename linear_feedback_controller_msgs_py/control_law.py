@@ -0,0 +1,202 @@
+"""Vectorized evaluation of the linear feedback law of a Control message.
+
+The torques are ``u = feedforward + feedback_gain @ dx`` where ``dx`` is the
+difference between the measured state and the initial state of the Control, in
+the tangent space of the robot configuration, like ``pinocchio::difference`` in
+the C++ controller. For a floating base robot the state is (base pose, joint
+positions, base twist, joint velocities) and the difference of the base poses is
+the ``log6`` of the base pose relative to the initial one, expressed in the base
+frame, ordered (linear, angular) as the base twist. For a fixed base robot the
+state is (joint positions, joint velocities).
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+from linear_feedback_controller_msgs_py.numpy_conversions import JointPermutation
+
+Sensors = Union[
+    lfc_py_types.Sensor, lfc_py_types.SensorBatch, Sequence[lfc_py_types.Sensor]
+]
+
+
+def _quaternion_to_rotation(q: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    x, y, z, w = q / np.linalg.norm(q)
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+
+
+def pose_log6(
+    pose: npt.NDArray[np.float64], reference: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Computes ``log6(reference^-1 * pose)`` of poses (x, y, z, qx, qy, qz, qw),
+    i.e. the twist in the reference frame moving the reference to the pose in
+    unit time, as ``pinocchio::log6``. Quaternions are normalized.
+
+    Args:
+        pose (npt.NDArray[np.float64]): Poses of shape (T, 7).
+        reference (npt.NDArray[np.float64]): Reference pose of shape (7,).
+
+    Returns:
+        npt.NDArray[np.float64]: Twists (linear, angular) of shape (T, 6).
+    """
+    # Relative rotation conj(q0) * q, with the shortest rotation (w >= 0).
+    q0 = reference[3:] / np.linalg.norm(reference[3:])
+    q = pose[:, 3:] / np.linalg.norm(pose[:, 3:], axis=1, keepdims=True)
+    v0, w0 = -q0[:3], q0[3]
+    v, w = q[:, :3], q[:, 3]
+    rel_v = w0 * v + w[:, np.newaxis] * v0 + np.cross(v0, v)
+    rel_w = w0 * w - v @ v0
+    sign = np.where(rel_w < 0.0, -1.0, 1.0)
+    rel_v *= sign[:, np.newaxis]
+    rel_w *= sign
+
+    # Rotation vector, theta / sin(theta / 2) tends to 2 / cos(theta / 2) at 0.
+    norm = np.linalg.norm(rel_v, axis=1)
+    theta = 2.0 * np.arctan2(norm, rel_w)
+    small = norm < 1e-8
+    scale = np.where(small, 2.0 / rel_w, theta / np.where(small, 1.0, norm))
+    angular = rel_v * scale[:, np.newaxis]
+
+    # Translation in the reference frame, mapped by the inverse of the left
+    # Jacobian V(w)^-1 = I - [w]/2 + alpha [w]^2.
+    p = (pose[:, :3] - reference[:3]) @ _quaternion_to_rotation(reference[3:])
+    theta = np.linalg.norm(angular, axis=1)
+    small = theta < 1e-4
+    t = np.where(small, 1.0, theta)
+    alpha = np.where(
+        small,
+        1.0 / 12.0 + theta**2 / 720.0,
+        (1.0 - t * np.sin(t) / (2.0 * (1.0 - np.cos(t)))) / t**2,
+    )
+    w_p = np.cross(angular, p)
+    linear = p - 0.5 * w_p + alpha[:, np.newaxis] * np.cross(angular, w_p)
+    return np.concatenate((linear, angular), axis=1)
+
+
+def _is_single(sensors: Sensors) -> bool:
+    return not isinstance(sensors, (lfc_py_types.SensorBatch, Sequence))
+
+
+def _stack_sensors(
+    sensors: Sensors,
+) -> Tuple[
+    List[str],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+]:
+    if isinstance(sensors, lfc_py_types.SensorBatch):
+        js = sensors.joint_state
+        return (
+            js.name,
+            sensors.base_pose,
+            sensors.base_twist,
+            js.position,
+            js.velocity,
+        )
+    if _is_single(sensors):
+        sensors = [sensors]
+    return (
+        sensors[0].joint_state.name,
+        np.stack([sensor.base_pose for sensor in sensors]),
+        np.stack([sensor.base_twist for sensor in sensors]),
+        np.stack([sensor.joint_state.position for sensor in sensors]),
+        np.stack([sensor.joint_state.velocity for sensor in sensors]),
+    )
+
+
+class LinearFeedbackLaw:
+    """Linear feedback law of a Control, evaluated on many Sensors at once. The
+    initial state of the Control is prepared once, the torques of T Sensors are
+    then computed with a single matrix product of the (T, nx) state differences
+    with the feedback gain. Measured joints are reordered to the joints of the
+    initial state when their names differ.
+    """
+
+    __slots__ = (
+        "feedback_gain",
+        "feedforward",
+        "free_flyer",
+        "_joint_names",
+        "_permutation",
+        "_base_pose",
+        "_base_twist",
+        "_position",
+        "_velocity",
+    )
+
+    def __init__(self, control: lfc_py_types.Control) -> None:
+        """Prepares the initial state of the Control.
+
+        Args:
+            control (lfc_py_types.Control): Control with a feedback gain of shape
+            (nu, 2 * (6 + N)) for a floating base robot or (nu, 2 * N) for a fixed
+            base robot with N joints.
+        """
+        state = control.initial_state
+        n_joints = len(state.joint_state.name)
+        cols = control.feedback_gain.shape[1]
+        assert cols in (2 * (6 + n_joints), 2 * n_joints), (
+            f"Feedback gain has '{cols}' columns, expected '{2 * (6 + n_joints)}' "
+            f"for a floating base or '{2 * n_joints}' for a fixed base!"
+        )
+        self.feedback_gain = np.asarray(control.feedback_gain, dtype=np.float64)
+        self.feedforward = np.asarray(control.feedforward, dtype=np.float64).reshape(-1)
+        self.free_flyer = cols == 2 * (6 + n_joints)
+        self._joint_names = list(state.joint_state.name)
+        self._permutation = JointPermutation(self._joint_names)
+        self._base_pose = np.array(state.base_pose, dtype=np.float64)
+        self._base_twist = np.array(state.base_twist, dtype=np.float64)
+        self._position = np.array(state.joint_state.position, dtype=np.float64)
+        self._velocity = np.array(state.joint_state.velocity, dtype=np.float64)
+
+    def state_difference(self, sensors: Sensors) -> npt.NDArray[np.float64]:
+        """Computes the differences between the states of the Sensors and the
+        initial state of the Control.
+
+        Args:
+            sensors (Sensors): Sensor, SensorBatch or sequence of T Sensors.
+
+        Returns:
+            npt.NDArray[np.float64]: State differences of shape (T, nx), T being 1
+            for a single Sensor.
+        """
+        names, base_pose, base_twist, position, velocity = _stack_sensors(sensors)
+        if list(names) != self._joint_names:
+            indices = self._permutation.indices(names)
+            position = position[:, indices]
+            velocity = velocity[:, indices]
+        parts = [position - self._position]
+        if self.free_flyer:
+            parts.insert(0, pose_log6(base_pose, self._base_pose))
+            parts.append(base_twist - self._base_twist)
+        parts.append(velocity - self._velocity)
+        return np.concatenate(parts, axis=1)
+
+    def __call__(self, sensors: Sensors) -> npt.NDArray[np.float64]:
+        """Computes the torques ``feedforward + feedback_gain @ dx``.
+
+        Args:
+            sensors (Sensors): Sensor, SensorBatch or sequence of T Sensors.
+
+        Returns:
+            npt.NDArray[np.float64]: Torques of shape (nu,) for a single Sensor,
+            (T, nu) otherwise.
+        """
+        torques = self.state_difference(sensors) @ self.feedback_gain.T
+        torques += self.feedforward
+        if _is_single(sensors):
+            return torques[0]
+        return torques
@@ -1,14 +1,64 @@
-from typing import Annotated, List, Literal
+"""Numpy representations of the LFC messages.
+
+The module does not import rclpy, so that it can be imported and its objects
+unpickled in processes without ROS. rclpy is only imported to create the default
+``Time()`` stamp of objects built without an explicit stamp.
+"""
+
+from __future__ import annotations
+
+import pickle
+import struct
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from dataclasses import dataclass, field
 import numpy as np
 import numpy.typing as npt
-from rclpy.time import Time
+
+if TYPE_CHECKING:
+    from rclpy.time import Time
 
 np_array6 = Annotated[npt.NDArray[np.float64], Literal[6]]
 np_array7 = Annotated[npt.NDArray[np.float64], Literal[7]]
+np_array_t6 = Annotated[npt.NDArray[np.float64], Literal["T", 6]]
+np_array_t7 = Annotated[npt.NDArray[np.float64], Literal["T", 7]]
+Stamp = Union["Time", int]
+"""Time stamp as rclpy Time or as integer nanoseconds, the latter avoids creating
+Time objects and allows time arithmetic on stamps."""
+
+
+def _default_stamp() -> Time:
+    from rclpy.time import Time
+
+    return Time()
+
 
+def stamp_nanoseconds(stamp: Stamp) -> int:
+    """Gets nanoseconds of a stamp of any representation.
 
-@dataclass
+    Args:
+        stamp (Stamp): Input stamp.
+
+    Returns:
+        int: Nanoseconds of the stamp.
+    """
+    if isinstance(stamp, (int, np.integer)):
+        return int(stamp)
+    return stamp.nanoseconds
+
+
+@dataclass(slots=True)
 class JointState:
     """Structure containing JointState information similarly to ROS message
     sensor_msgs.msg.JointState.
@@ -20,7 +70,7 @@ class JointState:
     effort: npt.NDArray[np.float64]
 
 
-@dataclass
+@dataclass(slots=True)
 class Contact:
     """Structure containing Contact information similarly to ROS message
     linear_feedback_controller_msgs.msg.Contact.
@@ -32,7 +82,76 @@ class Contact:
     pose: np_array7
 
 
-@dataclass
+class ContactTable:
+    """Structure containing contacts as a struct of arrays, with a fixed slot per
+    contact name. ``wrench`` has shape (C, 6), ``pose`` shape (C, 7) and ``active``
+    is a boolean mask of shape (C,), in the order of ``names``. Names are interned
+    and ``slots`` maps them to their slot, so that contacts can be looked up by
+    name in O(1) and processed at once over all slots.
+    """
+
+    __slots__ = ("names", "slots", "active", "wrench", "pose")
+
+    def __init__(self, names: Sequence[str]) -> None:
+        """Creates an inactive table with identity contact poses.
+
+        Args:
+            names (Sequence[str]): Names of the contacts, one slot per name.
+        """
+        self.names: List[str] = [sys.intern(name) for name in names]
+        self.slots: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        assert len(self.slots) == len(self.names), "Contact names must be unique!"
+        self.active = np.zeros(len(self.names), dtype=np.bool_)
+        self.wrench = np.zeros((len(self.names), 6))
+        self.pose = np.zeros((len(self.names), 7))
+        self.pose[:, 6] = 1.0
+
+    @classmethod
+    def from_contacts(cls, contacts: List[Contact]) -> "ContactTable":
+        """Creates a table from a list of contacts, one slot per contact.
+
+        Args:
+            contacts (List[Contact]): Input contacts.
+
+        Returns:
+            ContactTable: Table with a copy of the contacts.
+        """
+        table = cls([contact.name for contact in contacts])
+        for i, contact in enumerate(contacts):
+            table.active[i] = contact.active
+            table.wrench[i] = contact.wrench
+            table.pose[i] = contact.pose
+        return table
+
+    def to_contacts(self) -> List[Contact]:
+        """Creates the list of contacts of the table, in slot order.
+
+        Returns:
+            List[Contact]: Contacts with a copy of the arrays of the table.
+        """
+        return [
+            Contact(
+                active=bool(active),
+                name=name,
+                wrench=wrench,
+                pose=pose,
+            )
+            for name, active, wrench, pose in zip(
+                self.names, self.active, self.wrench.copy(), self.pose.copy()
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return (
+            f"ContactTable(names={self.names!r}, active={self.active!r}, "
+            f"wrench={self.wrench!r}, pose={self.pose!r})"
+        )
+
+
+@dataclass(slots=True)
 class Sensor:
     """Structure containing Sensor information similarly to ROS message
     linear_feedback_controller_msgs.msg.Sensor.
@@ -42,10 +161,251 @@ class Sensor:
     base_twist: np_array6
     joint_state: JointState
     contacts: List[Contact]
-    stamp: Time = field(default_factory=Time)
+    stamp: Stamp = field(default_factory=_default_stamp)
+
+    def __reduce__(self) -> tuple:
+        # Arrays are pickled by Numpy, out-of-band with pickle protocol 5.
+        return (
+            _unpickle_sensor,
+            (
+                self.base_pose,
+                self.base_twist,
+                self.joint_state,
+                self.contacts,
+                *_pickle_stamp(self.stamp),
+            ),
+        )
+
+
+def _unpickle_sensor(
+    base_pose: np_array7,
+    base_twist: np_array6,
+    joint_state: JointState,
+    contacts: List[Contact],
+    nanoseconds: int,
+    clock_type: Optional[int],
+) -> Sensor:
+    return Sensor(
+        base_pose,
+        base_twist,
+        joint_state,
+        contacts,
+        _unpickle_stamp(nanoseconds, clock_type),
+    )
+
+
+class PackedSensor:
+    """Structure containing Sensor information stored in a single contiguous
+    float64 buffer. It exposes the same attributes as :class:`Sensor`, arrays of
+    ``base_pose``, ``base_twist``, ``joint_state`` and ``contacts`` are views into
+    ``buffer`` laid out as (base_pose, base_twist, joint positions, joint velocities,
+    joint efforts, wrench and pose of each contact). The arrays have to be modified
+    in place to stay backed by the buffer. Copying and pickling copy the buffer
+    at once.
+    """
+
+    __slots__ = (
+        "buffer",
+        "_base_pose",
+        "_base_twist",
+        "joint_state",
+        "contacts",
+        "stamp",
+    )
+
+    def __init__(
+        self,
+        buffer: npt.NDArray[np.float64],
+        joint_names: List[str],
+        contact_names: List[str],
+        contact_active: List[bool],
+        stamp: Optional[Stamp] = None,
+    ) -> None:
+        n_joints = len(joint_names)
+        n_contacts = len(contact_names)
+        assert buffer.shape == (packed_sensor_size(n_joints, n_contacts),), (
+            f"Buffer has shape '{buffer.shape}', expected "
+            f"'({packed_sensor_size(n_joints, n_contacts)},)'!"
+        )
+        self.buffer = buffer
+        self._base_pose = buffer[0:7]
+        self._base_twist = buffer[7:13]
+        joints = buffer[13 : 13 + 3 * n_joints].reshape(3, n_joints)
+        self.joint_state = JointState(
+            name=list(joint_names),
+            position=joints[0],
+            velocity=joints[1],
+            effort=joints[2],
+        )
+        contacts = buffer[13 + 3 * n_joints :].reshape(n_contacts, 13)
+        self.contacts = [
+            Contact(active=bool(active), name=name, wrench=block[:6], pose=block[6:])
+            for name, active, block in zip(contact_names, contact_active, contacts)
+        ]
+        self.stamp = _default_stamp() if stamp is None else stamp
+
+    @property
+    def base_pose(self) -> np_array7:
+        return self._base_pose
+
+    @base_pose.setter
+    def base_pose(self, value: np_array7) -> None:
+        self._base_pose[:] = value
+
+    @property
+    def base_twist(self) -> np_array6:
+        return self._base_twist
+
+    @base_twist.setter
+    def base_twist(self, value: np_array6) -> None:
+        self._base_twist[:] = value
+
+    @classmethod
+    def from_sensor(cls, sensor: Sensor) -> "PackedSensor":
+        """Packs a Sensor into a new single buffer. Empty joint state arrays are
+        filled with NaN.
+
+        Args:
+            sensor (Sensor): Input Sensor.
+
+        Returns:
+            PackedSensor: Copy of the Sensor backed by a single buffer.
+        """
+        n_joints = len(sensor.joint_state.name)
+        packed = cls(
+            np.empty(packed_sensor_size(n_joints, len(sensor.contacts))),
+            sensor.joint_state.name,
+            [contact.name for contact in sensor.contacts],
+            [contact.active for contact in sensor.contacts],
+            sensor.stamp,
+        )
+        packed.base_pose[:] = sensor.base_pose
+        packed.base_twist[:] = sensor.base_twist
+        for field_name in ("position", "velocity", "effort"):
+            values = getattr(sensor.joint_state, field_name)
+            getattr(packed.joint_state, field_name)[:] = (
+                values if len(values) else np.nan
+            )
+        for contact, packed_contact in zip(sensor.contacts, packed.contacts):
+            packed_contact.wrench[:] = contact.wrench
+            packed_contact.pose[:] = contact.pose
+        return packed
+
+    def to_sensor(self) -> Sensor:
+        """Unpacks into a Sensor owning separate arrays.
+
+        Returns:
+            Sensor: Copy of the data as a Sensor.
+        """
+        return Sensor(
+            base_pose=self.base_pose.copy(),
+            base_twist=self.base_twist.copy(),
+            joint_state=JointState(
+                name=list(self.joint_state.name),
+                position=self.joint_state.position.copy(),
+                velocity=self.joint_state.velocity.copy(),
+                effort=self.joint_state.effort.copy(),
+            ),
+            contacts=[
+                Contact(
+                    active=contact.active,
+                    name=contact.name,
+                    wrench=contact.wrench.copy(),
+                    pose=contact.pose.copy(),
+                )
+                for contact in self.contacts
+            ],
+            stamp=self.stamp,
+        )
+
+    def copy(self) -> "PackedSensor":
+        """Copies the Sensor with a single copy of the buffer.
+
+        Returns:
+            PackedSensor: Copy of the Sensor.
+        """
+        return PackedSensor(
+            self.buffer.copy(),
+            self.joint_state.name,
+            [contact.name for contact in self.contacts],
+            [contact.active for contact in self.contacts],
+            self.stamp,
+        )
+
+    def __copy__(self) -> "PackedSensor":
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict) -> "PackedSensor":
+        return self.copy()
+
+    def __reduce__(self) -> tuple:
+        return (
+            _unpickle_packed_sensor,
+            (
+                self.buffer,
+                self.joint_state.name,
+                [contact.name for contact in self.contacts],
+                [contact.active for contact in self.contacts],
+                *_pickle_stamp(self.stamp),
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"PackedSensor(base_pose={self.base_pose!r}, "
+            f"base_twist={self.base_twist!r}, joint_state={self.joint_state!r}, "
+            f"contacts={self.contacts!r}, stamp={self.stamp!r})"
+        )
+
+
+def _unpickle_packed_sensor(
+    buffer: npt.NDArray[np.float64],
+    joint_names: List[str],
+    contact_names: List[str],
+    contact_active: List[bool],
+    nanoseconds: int,
+    clock_type: Optional[int],
+) -> PackedSensor:
+    return PackedSensor(
+        buffer,
+        joint_names,
+        contact_names,
+        contact_active,
+        _unpickle_stamp(nanoseconds, clock_type),
+    )
+
+
+def _pickle_stamp(stamp: Stamp) -> Tuple[int, Optional[int]]:
+    # Stamps are pickled as plain integers as rclpy Time is not picklable, the
+    # clock type is None for integer stamps.
+    if isinstance(stamp, (int, np.integer)):
+        return int(stamp), None
+    return stamp.nanoseconds, int(stamp.clock_type)
+
+
+def _unpickle_stamp(nanoseconds: int, clock_type: Optional[int]) -> Stamp:
+    if clock_type is None:
+        return nanoseconds
+    from rclpy.clock import ClockType
+    from rclpy.time import Time
+
+    return Time(nanoseconds=nanoseconds, clock_type=ClockType(clock_type))
+
+
+def packed_sensor_size(n_joints: int, n_contacts: int) -> int:
+    """Computes size of the PackedSensor buffer.
+
+    Args:
+        n_joints (int): Number of joints.
+        n_contacts (int): Number of contacts.
+
+    Returns:
+        int: Number of float64 values in the buffer.
+    """
+    return 7 + 6 + 3 * n_joints + (6 + 7) * n_contacts
 
 
-@dataclass
+@dataclass(slots=True)
 class Control:
     """Structure containing Control information similarly to ROS message
     linear_feedback_controller_msgs.msg.Control.
@@ -54,4 +414,387 @@ class Control:
     feedback_gain: npt.NDArray[np.float64]
     feedforward: npt.NDArray[np.float64]
     initial_state: Sensor
-    stamp: Time = field(default_factory=Time)
+    stamp: Stamp = field(default_factory=_default_stamp)
+
+    def __reduce__(self) -> tuple:
+        return (
+            _unpickle_control,
+            (
+                self.feedback_gain,
+                self.feedforward,
+                self.initial_state,
+                *_pickle_stamp(self.stamp),
+            ),
+        )
+
+
+def _unpickle_control(
+    feedback_gain: npt.NDArray[np.float64],
+    feedforward: npt.NDArray[np.float64],
+    initial_state: Sensor,
+    nanoseconds: int,
+    clock_type: Optional[int],
+) -> Control:
+    return Control(
+        feedback_gain,
+        feedforward,
+        initial_state,
+        _unpickle_stamp(nanoseconds, clock_type),
+    )
+
+
+@dataclass(slots=True)
+class SensorBatch:
+    """Structure containing a sequence of T Sensor samples stored as a struct of
+    arrays. All samples share the same joints and contacts, leading dimension of
+    every array is the sample index.
+    """
+
+    base_pose: np_array_t7
+    base_twist: np_array_t6
+    joint_state: JointState
+    """Joint state with names of the joints and arrays of shape (T, N)."""
+    contact_names: List[str]
+    contact_active: npt.NDArray[np.bool_]
+    """Contact activity flags of shape (T, C)."""
+    contact_wrench: npt.NDArray[np.float64]
+    """Contact wrenches of shape (T, C, 6)."""
+    contact_pose: npt.NDArray[np.float64]
+    """Contact poses of shape (T, C, 7)."""
+    stamp: npt.NDArray[np.int64]
+    """Time stamps in nanoseconds of shape (T,)."""
+
+    def __len__(self) -> int:
+        return self.stamp.shape[0]
+
+
+class StateLayout:
+    """Layout of the state vector of a robot, ``x = (q, v)`` as the initial state
+    of a Control, with the configuration ``q = (base_pose, joint positions)`` and
+    the velocity ``v = (base_twist, joint velocities)``. The base is omitted for
+    a fixed base robot. The layout is derived once, Sensors are then packed into
+    and unpacked from state vectors in place, as ``StateLayout`` of
+    eigen_conversions.hpp.
+    """
+
+    __slots__ = (
+        "joint_names",
+        "contact_names",
+        "free_flyer",
+        "nq",
+        "nv",
+        "size",
+        "base_pose",
+        "position",
+        "base_twist",
+        "velocity",
+    )
+
+    def __init__(
+        self,
+        joint_names: Sequence[str],
+        contact_names: Sequence[str] = (),
+        free_flyer: bool = True,
+    ) -> None:
+        n_joints = len(joint_names)
+        n_base = 1 if free_flyer else 0
+        self.joint_names = list(joint_names)
+        self.contact_names = list(contact_names)
+        self.free_flyer = free_flyer
+        self.nq = 7 * n_base + n_joints
+        self.nv = 6 * n_base + n_joints
+        self.size = self.nq + self.nv
+        # Slices of each part in the state vector.
+        self.base_pose = slice(0, 7 * n_base)
+        self.position = slice(7 * n_base, self.nq)
+        self.base_twist = slice(self.nq, self.nq + 6 * n_base)
+        self.velocity = slice(self.nq + 6 * n_base, self.size)
+
+    @classmethod
+    def from_sensor(
+        cls, sensor: Union[Sensor, SensorBatch], free_flyer: bool = True
+    ) -> "StateLayout":
+        """Derives the layout of the states of a Sensor or SensorBatch.
+
+        Args:
+            sensor (Union[Sensor, SensorBatch]): Input Sensor.
+            free_flyer (bool, optional): Whether the base pose and twist are part
+                of the state. Defaults to True.
+
+        Returns:
+            StateLayout: Layout of the joints and contacts of the Sensor.
+        """
+        if isinstance(sensor, SensorBatch):
+            contact_names = sensor.contact_names
+        else:
+            contact_names = [contact.name for contact in sensor.contacts]
+        return cls(sensor.joint_state.name, contact_names, free_flyer)
+
+    def _check_joint_names(self, names: List[str]) -> None:
+        assert names is self.joint_names or names == self.joint_names, (
+            f"Joints '{names}' do not match the layout joints '{self.joint_names}'!"
+        )
+
+    def pack(
+        self, sensor: Sensor, out: Optional[npt.NDArray[np.float64]] = None
+    ) -> npt.NDArray[np.float64]:
+        """Packs the state of a Sensor into a state vector.
+
+        Args:
+            sensor (Sensor): Input Sensor with the joints of the layout.
+            out (Optional[npt.NDArray[np.float64]], optional): State vector of
+                shape (size,) written in place. Defaults to a new array.
+
+        Returns:
+            npt.NDArray[np.float64]: State vector of shape (size,).
+        """
+        self._check_joint_names(sensor.joint_state.name)
+        if out is None:
+            out = np.empty(self.size)
+        if self.free_flyer:
+            out[self.base_pose] = sensor.base_pose
+            out[self.base_twist] = sensor.base_twist
+        out[self.position] = sensor.joint_state.position
+        out[self.velocity] = sensor.joint_state.velocity
+        return out
+
+    def unpack(
+        self, state: npt.NDArray[np.float64], out: Optional[Sensor] = None
+    ) -> Sensor:
+        """Unpacks a state vector into the arrays of a Sensor.
+
+        Args:
+            state (npt.NDArray[np.float64]): State vector of shape (size,).
+            out (Optional[Sensor], optional): Sensor whose arrays are written in
+                place, other fields are left untouched. Defaults to a new Sensor
+                with zero efforts and inactive contacts.
+
+        Returns:
+            Sensor: Sensor holding the state.
+        """
+        assert state.shape == (self.size,), (
+            f"State has shape '{state.shape}', expected '({self.size},)'!"
+        )
+        if out is None:
+            out = self.new_sensor()
+        else:
+            self._check_joint_names(out.joint_state.name)
+        if self.free_flyer:
+            out.base_pose[:] = state[self.base_pose]
+            out.base_twist[:] = state[self.base_twist]
+        out.joint_state.position[:] = state[self.position]
+        out.joint_state.velocity[:] = state[self.velocity]
+        return out
+
+    def pack_batch(
+        self, batch: SensorBatch, out: Optional[npt.NDArray[np.float64]] = None
+    ) -> npt.NDArray[np.float64]:
+        """Packs the states of a SensorBatch into state vectors.
+
+        Args:
+            batch (SensorBatch): Input batch of T Sensors with the joints of the
+                layout.
+            out (Optional[npt.NDArray[np.float64]], optional): States of shape
+                (T, size) written in place. Defaults to a new array.
+
+        Returns:
+            npt.NDArray[np.float64]: States of shape (T, size).
+        """
+        self._check_joint_names(batch.joint_state.name)
+        if out is None:
+            out = np.empty((len(batch), self.size))
+        if self.free_flyer:
+            out[:, self.base_pose] = batch.base_pose
+            out[:, self.base_twist] = batch.base_twist
+        out[:, self.position] = batch.joint_state.position
+        out[:, self.velocity] = batch.joint_state.velocity
+        return out
+
+    def unpack_batch(
+        self, states: npt.NDArray[np.float64], out: Optional[SensorBatch] = None
+    ) -> SensorBatch:
+        """Unpacks state vectors into the arrays of a SensorBatch.
+
+        Args:
+            states (npt.NDArray[np.float64]): States of shape (T, size).
+            out (Optional[SensorBatch], optional): Batch whose arrays are written
+                in place, other fields are left untouched. Defaults to a new batch
+                with zero efforts, inactive contacts and zero stamps.
+
+        Returns:
+            SensorBatch: Batch holding the states.
+        """
+        assert states.ndim == 2 and states.shape[1] == self.size, (
+            f"States have shape '{states.shape}', expected '(T, {self.size})'!"
+        )
+        if out is None:
+            out = self.new_sensor_batch(states.shape[0])
+        else:
+            self._check_joint_names(out.joint_state.name)
+        if self.free_flyer:
+            out.base_pose[:] = states[:, self.base_pose]
+            out.base_twist[:] = states[:, self.base_twist]
+        out.joint_state.position[:] = states[:, self.position]
+        out.joint_state.velocity[:] = states[:, self.velocity]
+        return out
+
+    def new_sensor(self) -> Sensor:
+        """Allocates a Sensor of the joints and contacts of the layout, at the
+        origin with zero velocities and efforts and inactive contacts.
+
+        Returns:
+            Sensor: New Sensor.
+        """
+        n_joints = len(self.joint_names)
+        return Sensor(
+            base_pose=np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0]),
+            base_twist=np.zeros(6),
+            joint_state=JointState(
+                name=list(self.joint_names),
+                position=np.zeros(n_joints),
+                velocity=np.zeros(n_joints),
+                effort=np.zeros(n_joints),
+            ),
+            contacts=[
+                Contact(
+                    active=False,
+                    name=name,
+                    wrench=np.zeros(6),
+                    pose=np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0]),
+                )
+                for name in self.contact_names
+            ],
+        )
+
+    def new_sensor_batch(self, n_samples: int) -> SensorBatch:
+        """Allocates a SensorBatch of T samples of the joints and contacts of the
+        layout, initialized as :meth:`new_sensor` with zero stamps.
+
+        Args:
+            n_samples (int): Number of samples T.
+
+        Returns:
+            SensorBatch: New batch.
+        """
+        n_joints = len(self.joint_names)
+        n_contacts = len(self.contact_names)
+        base_pose = np.zeros((n_samples, 7))
+        base_pose[:, 6] = 1.0
+        contact_pose = np.zeros((n_samples, n_contacts, 7))
+        contact_pose[..., 6] = 1.0
+        return SensorBatch(
+            base_pose=base_pose,
+            base_twist=np.zeros((n_samples, 6)),
+            joint_state=JointState(
+                name=list(self.joint_names),
+                position=np.zeros((n_samples, n_joints)),
+                velocity=np.zeros((n_samples, n_joints)),
+                effort=np.zeros((n_samples, n_joints)),
+            ),
+            contact_names=list(self.contact_names),
+            contact_active=np.zeros((n_samples, n_contacts), dtype=np.bool_),
+            contact_wrench=np.zeros((n_samples, n_contacts, 6)),
+            contact_pose=contact_pose,
+            stamp=np.zeros(n_samples, dtype=np.int64),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StateLayout):
+            return NotImplemented
+        return (
+            self.joint_names == other.joint_names
+            and self.contact_names == other.contact_names
+            and self.free_flyer == other.free_flyer
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"StateLayout(joint_names={self.joint_names!r}, "
+            f"contact_names={self.contact_names!r}, free_flyer={self.free_flyer!r})"
+        )
+
+
+@dataclass(slots=True)
+class ControlBatch:
+    """Structure containing a sequence of T Control samples stored as a struct of
+    arrays. All samples share the same gain shapes, leading dimension of every
+    array is the sample index.
+    """
+
+    feedback_gain: npt.NDArray[np.float64]
+    """Feedback gains of shape (T, R, C)."""
+    feedforward: npt.NDArray[np.float64]
+    """Feedforward terms of shape (T, R)."""
+    initial_state: SensorBatch
+    stamp: npt.NDArray[np.int64]
+    """Time stamps in nanoseconds of shape (T,)."""
+
+    def __len__(self) -> int:
+        return self.stamp.shape[0]
+
+
+# Magic, number of out-of-band buffers and size of the pickle.
+_BYTES_HEADER = struct.Struct("<4sIQ")
+_BYTES_MAGIC = b"LFC5"
+_BYTES_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _BYTES_ALIGNMENT - 1) // _BYTES_ALIGNMENT * _BYTES_ALIGNMENT
+
+
+def to_bytes(obj: Any) -> bytearray:
+    """Serializes LFC objects, e.g. a Control, into a single buffer. Objects are
+    pickled with protocol 5 and the Numpy arrays are copied once as out-of-band
+    buffers after the pickle, aligned on 64 bytes, stamps are stored as integers.
+
+    Args:
+        obj (Any): Picklable object, e.g. from this module.
+
+    Returns:
+        bytearray: Serialized object, loaded by :func:`from_bytes`.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    views = [buffer.raw() for buffer in buffers]
+    sizes = struct.pack(f"<{len(views)}Q", *(view.nbytes for view in views))
+    offset = _align(_BYTES_HEADER.size + len(sizes) + len(data))
+    offsets = []
+    for view in views:
+        offsets.append(offset)
+        offset = _align(offset + view.nbytes)
+
+    out = bytearray(offset)
+    _BYTES_HEADER.pack_into(out, 0, _BYTES_MAGIC, len(views), len(data))
+    start = _BYTES_HEADER.size
+    out[start : start + len(sizes)] = sizes
+    start += len(sizes)
+    out[start : start + len(data)] = data
+    for view, start in zip(views, offsets):
+        out[start : start + view.nbytes] = view
+    return out
+
+
+def from_bytes(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """Deserializes an object serialized by :func:`to_bytes`. Numpy arrays are not
+    copied, they are views over ``data`` and are only writable if ``data`` is.
+
+    Args:
+        data (Union[bytes, bytearray, memoryview]): Serialized object.
+
+    Returns:
+        Any: Deserialized object.
+    """
+    view = memoryview(data).cast("B")
+    magic, n_buffers, size = _BYTES_HEADER.unpack_from(view, 0)
+    assert magic == _BYTES_MAGIC, "Data was not serialized by to_bytes!"
+    start = _BYTES_HEADER.size
+    sizes = struct.unpack_from(f"<{n_buffers}Q", view, start)
+    start += 8 * n_buffers
+    pickled = view[start : start + size]
+    buffers = []
+    offset = _align(start + size)
+    for buffer_size in sizes:
+        buffers.append(view[offset : offset + buffer_size])
+        offset = _align(offset + buffer_size)
+    return pickle.loads(pickled, buffers=buffers)
@@ -1,23 +1,263 @@
+"""Conversions between ROS messages and the Numpy types of lfc_py_types.
+
+ROS message modules and rclpy are imported on the first call of a converter, so
+that importing this module, e.g. in short-lived worker processes, does not pay
+for them.
+"""
+
+from __future__ import annotations
+
+import array
+import functools
+import importlib
+
 import numpy as np
 import numpy.typing as npt
-from typing import Annotated, Literal
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from std_msgs.msg import Float64MultiArray, MultiArrayDimension
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
 
-from geometry_msgs.msg import Pose, Point, Quaternion, Twist, Vector3, Wrench
-from sensor_msgs.msg import JointState
-from std_msgs.msg import Header
-from rclpy.time import Time
+if TYPE_CHECKING:
+    from builtin_interfaces.msg import Time as TimeMsg
+    from std_msgs.msg import Float64MultiArray, MultiArrayDimension
+
+    from geometry_msgs.msg import Pose, Point, Quaternion, Twist, Vector3, Wrench
+    from sensor_msgs.msg import JointState
+    from std_msgs.msg import Header
+    from rclpy.time import Time
+
+    from linear_feedback_controller_msgs.msg import Contact, Control, Sensor
+
+# Global name to (module, name) of the objects imported on first use.
+_ROS_IMPORTS = {
+    "TimeMsg": ("builtin_interfaces.msg", "Time"),
+    "Float64MultiArray": ("std_msgs.msg", "Float64MultiArray"),
+    "MultiArrayDimension": ("std_msgs.msg", "MultiArrayDimension"),
+    "Header": ("std_msgs.msg", "Header"),
+    "Pose": ("geometry_msgs.msg", "Pose"),
+    "Point": ("geometry_msgs.msg", "Point"),
+    "Quaternion": ("geometry_msgs.msg", "Quaternion"),
+    "Twist": ("geometry_msgs.msg", "Twist"),
+    "Vector3": ("geometry_msgs.msg", "Vector3"),
+    "Wrench": ("geometry_msgs.msg", "Wrench"),
+    "JointState": ("sensor_msgs.msg", "JointState"),
+    "Time": ("rclpy.time", "Time"),
+    "Contact": ("linear_feedback_controller_msgs.msg", "Contact"),
+    "Control": ("linear_feedback_controller_msgs.msg", "Control"),
+    "Sensor": ("linear_feedback_controller_msgs.msg", "Sensor"),
+}
+
+
+def _import_ros_modules() -> None:
+    for global_name, (module, name) in _ROS_IMPORTS.items():
+        globals()[global_name] = getattr(importlib.import_module(module), name)
+
+
+class _LazyImport:
+    """Placeholder of a ROS object in the globals of this module. Its first use
+    imports the ROS modules and replaces all placeholders by the imported objects,
+    so the converters only go through a placeholder once.
+    """
 
-import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+    __slots__ = ("_global_name",)
+
+    def __init__(self, global_name: str) -> None:
+        self._global_name = global_name
+
+    def _resolve(self) -> Any:
+        _import_ros_modules()
+        return globals()[self._global_name]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __instancecheck__(self, instance: Any) -> bool:
+        return isinstance(instance, self._resolve())
+
+    def __repr__(self) -> str:
+        return f"_LazyImport({self._global_name!r})"
 
-from linear_feedback_controller_msgs.msg import Contact, Control, Sensor
+
+globals().update({name: _LazyImport(name) for name in _ROS_IMPORTS})
 
 np_array3 = Annotated[npt.NDArray[np.float64], Literal[3]]
 np_array6 = Annotated[npt.NDArray[np.float64], Literal[6]]
 np_array7 = Annotated[npt.NDArray[np.float64], Literal[7]]
 
 
+def _numpy_to_array_d(input: npt.NDArray[np.float64]) -> array.array:
+    """Copies Numpy array into the ``array.array('d')`` backing store used by rclpy
+    for ``float64[]`` fields. Data is copied in a single bulk copy of the underlying
+    buffer in a row-major order, without creating intermediate Python floats.
+
+    Args:
+        input (npt.NDArray[np.float64]): Input array of any shape.
+
+    Returns:
+        array.array: Flat array of doubles with typecode ``'d'``.
+    """
+    out = array.array("d")
+    out.frombytes(memoryview(np.ascontiguousarray(input, dtype=np.float64)).cast("B"))
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def _check_vector_shape(shape: Tuple[int, ...], size: int) -> None:
+    """Validates shape of an input vector. Successful checks are cached, so each
+    shape signature is only validated once.
+
+    Args:
+        shape (Tuple[int, ...]): Shape of the input vector.
+        size (int): Expected length of the vector.
+    """
+    assert len(shape) == 1, (
+        f"Input vector has '{len(shape)}' dimensions, expected dimension size of 1!"
+    )
+    assert shape[0] == size, (
+        f"Input vector has length of '{shape[0]}', expected length '{size}'!"
+    )
+
+
+def _skip_check_vector_shape(shape: Tuple[int, ...], size: int) -> None:
+    pass
+
+
+_check_shape = _check_vector_shape
+
+
+def set_input_validation(enabled: bool) -> None:
+    """Selects between validated and unchecked conversions of Numpy arrays to ROS
+    messages for the whole module. Validation is enabled by default. Unchecked
+    conversions skip shape validation of every input array, passing arrays
+    of wrong shapes results in undefined content of the messages.
+
+    Args:
+        enabled (bool): If ``True`` shapes of input arrays are validated.
+    """
+    global _check_shape
+    _check_shape = _check_vector_shape if enabled else _skip_check_vector_shape
+
+
+def _vector3_numpy_to_msg(input: np_array3) -> Vector3:
+    x, y, z = input.tolist()
+    return Vector3(x=x, y=y, z=z)
+
+
+def _pose_numpy_to_msg(input: np_array7) -> Pose:
+    px, py, pz, qx, qy, qz, qw = input.tolist()
+    return Pose(
+        position=Point(x=px, y=py, z=pz),
+        orientation=Quaternion(x=qx, y=qy, z=qz, w=qw),
+    )
+
+
+def _wrench_numpy_to_msg(input: np_array6) -> Wrench:
+    fx, fy, fz, tx, ty, tz = input.tolist()
+    return Wrench(
+        force=Vector3(x=fx, y=fy, z=fz),
+        torque=Vector3(x=tx, y=ty, z=tz),
+    )
+
+
+def _twist_numpy_to_msg(input: np_array6) -> Twist:
+    vx, vy, vz, wx, wy, wz = input.tolist()
+    return Twist(
+        linear=Vector3(x=vx, y=vy, z=vz),
+        angular=Vector3(x=wx, y=wy, z=wz),
+    )
+
+
+# Generated message constructors create a default value of every nested message,
+# even the ones passed as arguments. Filling the defaults in place halves the
+# number of messages created by the batch conversions.
+def _fill_pose_msg(msg: Pose, values: List[float]) -> None:
+    position, orientation = msg.position, msg.orientation
+    position.x, position.y, position.z = values[0], values[1], values[2]
+    orientation.x, orientation.y = values[3], values[4]
+    orientation.z, orientation.w = values[5], values[6]
+
+
+def _fill_vector6_msg(linear: Vector3, angular: Vector3, values: List[float]) -> None:
+    linear.x, linear.y, linear.z = values[0], values[1], values[2]
+    angular.x, angular.y, angular.z = values[3], values[4], values[5]
+
+
+def stamp_msg_to_nanoseconds(msg: TimeMsg) -> int:
+    """Converts ROS Time message into integer nanoseconds, without creating an
+    rclpy Time.
+
+    Args:
+        msg (builtin_interfaces.msg.Time): Input ROS message.
+
+    Returns:
+        int: Nanoseconds of the stamp.
+    """
+    return msg.sec * 1_000_000_000 + msg.nanosec
+
+
+def stamp_to_msg(stamp: lfc_py_types.Stamp) -> TimeMsg:
+    """Converts stamp of any representation into ROS Time message.
+
+    Args:
+        stamp (lfc_py_types.Stamp): Input rclpy Time or integer nanoseconds.
+
+    Returns:
+        builtin_interfaces.msg.Time: Output ROS message.
+    """
+    if isinstance(stamp, (int, np.integer)):
+        sec, nanosec = divmod(int(stamp), 1_000_000_000)
+        return TimeMsg(sec=sec, nanosec=nanosec)
+    return stamp.to_msg()
+
+
+def _stamp_msg_to_stamp(msg: TimeMsg, as_nanoseconds: bool) -> lfc_py_types.Stamp:
+    if as_nanoseconds:
+        return msg.sec * 1_000_000_000 + msg.nanosec
+    return Time.from_msg(msg)
+
+
+def stamps_msgs_to_numpy(msgs: Sequence[TimeMsg]) -> npt.NDArray[np.int64]:
+    """Converts sequence of ROS Time messages, e.g. the ``header.stamp`` of
+    recorded messages, into array of nanoseconds.
+
+    Args:
+        msgs (Sequence[builtin_interfaces.msg.Time]): Input ROS messages.
+
+    Returns:
+        npt.NDArray[np.int64]: Nanoseconds of shape (T,).
+    """
+    sec = np.fromiter((msg.sec for msg in msgs), dtype=np.int64, count=len(msgs))
+    nanosec = np.fromiter(
+        (msg.nanosec for msg in msgs), dtype=np.int64, count=len(msgs)
+    )
+    return sec * 1_000_000_000 + nanosec
+
+
+def stamps_numpy_to_msgs(input: npt.NDArray[np.int64]) -> List[TimeMsg]:
+    """Converts array of nanoseconds into list of ROS Time messages.
+
+    Args:
+        input (npt.NDArray[np.int64]): Nanoseconds of shape (T,).
+
+    Returns:
+        List[builtin_interfaces.msg.Time]: Output ROS messages.
+    """
+    sec, nanosec = np.divmod(np.asarray(input, dtype=np.int64), 1_000_000_000)
+    return [TimeMsg(sec=s, nanosec=n) for s, n in zip(sec.tolist(), nanosec.tolist())]
+
+
 def vector3_numpy_to_msg(input: np_array3) -> Vector3:
     """Converts Numpy array of shape (3,) to ROS Vector3 message.
     Expected order of axes is (x, y, z).
@@ -28,13 +268,8 @@ def vector3_numpy_to_msg(input: np_array3) -> Vector3:
     Returns:
         geometry_msgs.msg.Vector3: Vector represented as a ROS message.
     """
-    assert input.ndim == 1, (
-        f"Input vector has '{input.ndim}' dimensions, expected dimension size of 1!"
-    )
-    assert input.size == 3, (
-        f"Input vector has length of '{input.size}', expected length '3'!"
-    )
-    return Vector3(x=input[0], y=input[1], z=input[2])
+    _check_shape(input.shape, 3)
+    return _vector3_numpy_to_msg(input)
 
 
 def pose_numpy_to_msg(input: np_array7) -> Pose:
@@ -48,16 +283,8 @@ def pose_numpy_to_msg(input: np_array7) -> Pose:
     Returns:
         geometry_msgs.msg.Pose: Pose represented as a ROS message.
     """
-    assert input.ndim == 1, (
-        f"Input vector has '{input.ndim}' dimensions, expected dimension size of 1"
-    )
-    assert input.size == 7, (
-        f"Input vector has length of '{input.size}', expected length '7'!"
-    )
-    return Pose(
-        position=Point(x=input[0], y=input[1], z=input[2]),
-        orientation=Quaternion(x=input[3], y=input[4], z=input[5], w=input[6]),
-    )
+    _check_shape(input.shape, 7)
+    return _pose_numpy_to_msg(input)
 
 
 def wrench_numpy_to_msg(input: np_array6) -> Wrench:
@@ -71,16 +298,8 @@ def wrench_numpy_to_msg(input: np_array6) -> Wrench:
     Returns:
         geometry_msgs.msg.Wrench: Wrench represented as a ROS message.
     """
-    assert input.ndim == 1, (
-        f"Input vector has '{input.ndim}' dimensions, expected dimension size of 1"
-    )
-    assert input.size == 6, (
-        f"Input vector has length of '{input.size}', expected length '6'!"
-    )
-    return Wrench(
-        force=vector3_numpy_to_msg(input[:3]),
-        torque=vector3_numpy_to_msg(input[3:]),
-    )
+    _check_shape(input.shape, 6)
+    return _wrench_numpy_to_msg(input)
 
 
 def twist_numpy_to_msg(input: np_array6) -> Twist:
@@ -94,16 +313,8 @@ def twist_numpy_to_msg(input: np_array6) -> Twist:
     Returns:
         geometry_msgs.msg.Twist: Twist represented as a ROS message.
     """
-    assert input.ndim == 1, (
-        f"Input vector has '{input.ndim}' dimensions, expected dimension size of 1"
-    )
-    assert input.size == 6, (
-        f"Input vector has length of '{input.size}', expected length ''6!"
-    )
-    return Twist(
-        linear=vector3_numpy_to_msg(input[:3]),
-        angular=vector3_numpy_to_msg(input[3:]),
-    )
+    _check_shape(input.shape, 6)
+    return _twist_numpy_to_msg(input)
 
 
 def pose_msg_to_numpy(msg: Pose) -> np_array7:
@@ -178,6 +389,14 @@ def twist_msg_to_numpy(msg: Twist) -> np_array6:
     )
 
 
+def _matrix_shape(input: npt.NDArray[np.float64]) -> Tuple[int, int]:
+    assert input.ndim == 2 or input.ndim == 1, (
+        f"Input matrix is dimension '{input.ndim}'. Expected 2D matrix or 1D vector!"
+    )
+    # In case vector is passed consider is (N,1) array.
+    return input.shape if input.ndim != 1 else (input.shape[0], 1)
+
+
 def matrix_numpy_to_msg(input: npt.NDArray[np.float64]) -> Float64MultiArray:
     """Converts Numpy array into ROS array message.
 
@@ -187,11 +406,7 @@ def matrix_numpy_to_msg(input: npt.NDArray[np.float64]) -> Float64MultiArray:
     Returns:
         std_msgs.msg.Float64MultiArray: ROS message with the matrix.
     """
-    # In case vector is passed consider is (N,1) array.
-    rows, cols = input.shape if input.ndim != 1 else (input.shape[0], 1)
-    assert input.ndim == 2 or input.ndim == 1, (
-        f"Input matrix is dimension '{input.ndim}'. Expected 2D matrix or 1D vector!"
-    )
+    rows, cols = _matrix_shape(input)
 
     m = Float64MultiArray()
     m.layout.data_offset = 0
@@ -202,13 +417,13 @@ def matrix_numpy_to_msg(input: npt.NDArray[np.float64]) -> Float64MultiArray:
     m.layout.dim[1].label = "cols"
     m.layout.dim[1].stride = cols
     m.layout.dim[1].size = cols
-    # Flatten the matrix to a vector
-    m.data = input.reshape(-1).tolist()
+    # Flatten the matrix to a vector, copying the buffer in row-major order
+    m.data = _numpy_to_array_d(input)
     return m
 
 
 def matrix_msg_to_numpy(
-    msg: Float64MultiArray, return_vector: bool = True
+    msg: Float64MultiArray, return_vector: bool = True, copy: bool = True
 ) -> npt.NDArray[np.float64]:
     """Converts ROS array message into numpy array.
 
@@ -216,14 +431,126 @@ def matrix_msg_to_numpy(
         msg (std_msgs.msg.Float64MultiArray): Input ROS message with array.
         return_vector (bool, optional): If ``True`` vector is returned in a shape (N,)
         otherwise the shape is (N,1). Defaults to True.
+        copy (bool, optional): If ``False`` a read-only view over the message data
+        is returned instead of a copy. The view is valid as long as the message
+        data is not modified. Defaults to True.
 
     Returns:
         npt.NDArray[np.float64]: Output numpy matrix.
     """
+    data = np.frombuffer(msg.data, dtype=np.float64)
+    if copy:
+        data = data.copy()
+    else:
+        data.flags.writeable = False
+    return _matrix_data_to_numpy(
+        data, [dim.size for dim in msg.layout.dim], return_vector
+    )
+
+
+def _matrix_data_to_numpy(
+    data: npt.NDArray[np.float64], sizes: Sequence[int], return_vector: bool
+) -> npt.NDArray[np.float64]:
+    # Shared with the compiled backend, which returns the data and the sizes of
+    # the dimensions, so that both accept the same messages.
+    assert len(sizes) == 2, "The ROS message must be a 2D matrix!"
+    if return_vector and sizes[1] == 1:
+        return data
+    return data.reshape(sizes[0], sizes[1])
+
+
+# Labels of the first dimension of Float64MultiArray matrices with a compact
+# encoding of their entries, see matrix_numpy_to_msg_compact.
+MATRIX_FLOAT32_LABEL = "rows/float32"
+MATRIX_INT16_LABEL = "rows/int16"
+MatrixEncoding = Literal["float64", "float32", "int16"]
+
+
+def matrix_numpy_to_msg_compact(
+    input: npt.NDArray[np.float64], encoding: MatrixEncoding = "float32"
+) -> Float64MultiArray:
+    """Converts Numpy matrix into ROS array message with reduced precision entries,
+    packed in the ``float64[]`` data in little-endian row-major order:
+
+    * ``"float32"``: entries rounded to float32, two per element of the data, with
+      a relative error below 2**-24,
+    * ``"int16"``: scale of each row, i.e. its maximum absolute value divided by
+      32767, followed by the entries divided by the scale of their row rounded to
+      int16, four per element of the data, with an absolute error below half the
+      scale of the row,
+    * ``"float64"``: full precision, same as :func:`matrix_numpy_to_msg`.
+
+    Args:
+        input (npt.NDArray[np.float64]): Input matrix of shape (R, C).
+        encoding (MatrixEncoding, optional): Encoding of the entries.
+            Defaults to "float32".
+
+    Returns:
+        std_msgs.msg.Float64MultiArray: ROS message with the encoded matrix,
+        decoded by :func:`matrix_compact_msg_to_numpy`.
+    """
+    assert input.ndim == 2, (
+        f"Input matrix is dimension '{input.ndim}'. Expected 2D matrix!"
+    )
+    if encoding == "float64":
+        return matrix_numpy_to_msg(input)
+    rows, cols = input.shape
+    if encoding == "float32":
+        label = MATRIX_FLOAT32_LABEL
+        packed = np.zeros(-(-input.size // 2) * 2, dtype="<f4")
+        packed[: input.size] = input.ravel()
+        data = packed.view(np.float64)
+    elif encoding == "int16":
+        label = MATRIX_INT16_LABEL
+        scale = np.max(np.abs(input), axis=1, initial=0.0) / 32767.0
+        codes = np.zeros(-(-input.size // 4) * 4, dtype="<i2")
+        np.rint(
+            np.divide(
+                input,
+                scale[:, np.newaxis],
+                out=np.zeros(input.shape),
+                where=scale[:, np.newaxis] > 0.0,
+            ),
+            out=codes[: input.size].reshape(rows, cols),
+            casting="unsafe",
+        )
+        data = np.concatenate((scale, codes.view(np.float64)))
+    else:
+        raise ValueError(f"Unknown matrix encoding '{encoding}'!")
+
+    m = Float64MultiArray()
+    m.layout.data_offset = 0
+    m.layout.dim = [
+        MultiArrayDimension(label=label, size=rows, stride=data.size),
+        MultiArrayDimension(label="cols", size=cols, stride=cols),
+    ]
+    m.data = _numpy_to_array_d(data)
+    return m
+
+
+def matrix_compact_msg_to_numpy(msg: Float64MultiArray) -> npt.NDArray[np.float64]:
+    """Converts ROS array message encoded by :func:`matrix_numpy_to_msg_compact`
+    into Numpy matrix. Full precision matrices are converted as
+    :func:`matrix_msg_to_numpy` does.
+
+    Args:
+        msg (std_msgs.msg.Float64MultiArray): Input ROS message with matrix.
+
+    Returns:
+        npt.NDArray[np.float64]: Output numpy matrix of shape (R, C).
+    """
     assert len(msg.layout.dim) == 2, "The ROS message must be a 2D matrix!"
-    if return_vector and msg.layout.dim[1].size == 1:
-        return np.array(msg.data)
-    return np.array(msg.data).reshape(msg.layout.dim[0].size, msg.layout.dim[1].size)
+    label = msg.layout.dim[0].label
+    rows = msg.layout.dim[0].size
+    cols = msg.layout.dim[1].size
+    data = np.frombuffer(msg.data, dtype=np.float64)
+    if label == MATRIX_FLOAT32_LABEL:
+        entries = data.view("<f4")[: rows * cols]
+        return entries.astype(np.float64).reshape(rows, cols)
+    if label == MATRIX_INT16_LABEL:
+        codes = data[rows:].view("<i2")[: rows * cols].reshape(rows, cols)
+        return codes * data[:rows, np.newaxis]
+    return matrix_msg_to_numpy(msg, return_vector=False)
 
 
 def joint_state_msg_to_numpy(msg: JointState) -> lfc_py_types.JointState:
@@ -243,6 +570,77 @@ def joint_state_msg_to_numpy(msg: JointState) -> lfc_py_types.JointState:
     )
 
 
+class JointPermutation:
+    """Cached permutation from the joint order of incoming messages to a target
+    joint order, e.g. the joint order of a robot model. The name to index mapping
+    is only recomputed when the names of the messages change.
+    """
+
+    __slots__ = ("target_names", "_source_key", "_indices")
+
+    def __init__(self, target_names: Sequence[str]) -> None:
+        """Creates the permutation.
+
+        Args:
+            target_names (Sequence[str]): Names of the joints in the target order,
+            a subset of the joints of the messages.
+        """
+        self.target_names = list(target_names)
+        self._source_key = None
+        self._indices = np.empty(0, dtype=np.intp)
+
+    def indices(self, names: Sequence[str]) -> npt.NDArray[np.intp]:
+        """Returns, for each target joint, its index in ``names``. The names are
+        compared by value to the last names seen, so lists modified in place are
+        handled.
+
+        Args:
+            names (Sequence[str]): Names of the joints of a message.
+
+        Returns:
+            npt.NDArray[np.intp]: Indices of the target joints in ``names``.
+        """
+        key = tuple(names)
+        if key != self._source_key:
+            index = {name: i for i, name in enumerate(key)}
+            missing = [name for name in self.target_names if name not in index]
+            assert not missing, f"Joints '{missing}' are missing from the message!"
+            self._indices = np.array(
+                [index[name] for name in self.target_names], dtype=np.intp
+            )
+            self._source_key = key
+        return self._indices
+
+
+def joint_state_msg_to_numpy_reordered(
+    msg: JointState, permutation: JointPermutation
+) -> lfc_py_types.JointState:
+    """Converts ROS JointState message into internal LFC JointState class with the
+    joints in the target order of ``permutation``. Position, velocity and effort
+    are reordered at once with a single fancy-index, joint state fields left empty
+    in the message are filled with NaN.
+
+    Args:
+        msg (sensor_msgs.msg.JointState): Input ROS message.
+        permutation (JointPermutation): Permutation to the target joint order.
+
+    Returns:
+        lfc_py_types.JointState: Output LFC representation of JointState, ``name``
+        is the list of target names of ``permutation``.
+    """
+    indices = permutation.indices(msg.name)
+    values = np.empty((3, len(msg.name)))
+    for row, field in zip(values, (msg.position, msg.velocity, msg.effort)):
+        row[:] = field if len(field) else np.nan
+    reordered = values[:, indices]
+    return lfc_py_types.JointState(
+        name=permutation.target_names,
+        position=reordered[0],
+        velocity=reordered[1],
+        effort=reordered[2],
+    )
+
+
 def contact_msg_to_numpy(msg: Contact) -> lfc_py_types.Contact:
     """Converts ROS Contact message into internal LFC Contact class.
 
@@ -260,11 +658,15 @@ def contact_msg_to_numpy(msg: Contact) -> lfc_py_types.Contact:
     )
 
 
-def sensor_msg_to_numpy(msg: Sensor) -> lfc_py_types.Sensor:
+def sensor_msg_to_numpy(
+    msg: Sensor, stamp_as_nanoseconds: bool = False
+) -> lfc_py_types.Sensor:
     """Converts ROS Sensor message into internal LFC Sensor class.
 
     Args:
         msg (linear_feedback_controller_msgs.msg.Sensor): Input ROS message.
+        stamp_as_nanoseconds (bool, optional): If ``True`` the stamp is returned as
+        integer nanoseconds instead of rclpy Time. Defaults to False.
 
     Returns:
         lfc_py_types.Sensor: Output LFC representation of Sensor.
@@ -274,12 +676,12 @@ def sensor_msg_to_numpy(msg: Sensor) -> lfc_py_types.Sensor:
         base_twist=twist_msg_to_numpy(msg.base_twist),
         joint_state=joint_state_msg_to_numpy(msg.joint_state),
         contacts=[contact_msg_to_numpy(contact) for contact in msg.contacts],
-        stamp=Time.from_msg(msg.header.stamp),
+        stamp=_stamp_msg_to_stamp(msg.header.stamp, stamp_as_nanoseconds),
     )
 
 
 def control_msg_to_numpy(
-    msg: Control, feedforward_as_vector: bool = True
+    msg: Control, feedforward_as_vector: bool = True, stamp_as_nanoseconds: bool = False
 ) -> lfc_py_types.Control:
     """Converts ROS Control message into internal LFC Control class.
 
@@ -287,6 +689,8 @@ def control_msg_to_numpy(
         msg (linear_feedback_controller_msgs.msg.Control): Input ROS message.
         feedforward_as_vector (bool, optional): If ``True`` feedforward is returned
         as a vector in a shape (N,) otherwise the shape is (N,1). Defaults to True.
+        stamp_as_nanoseconds (bool, optional): If ``True`` the stamps are returned
+        as integer nanoseconds instead of rclpy Time. Defaults to False.
 
     Returns:
         lfc_py_types.Control: Output LFC representation of Control.
@@ -294,11 +698,756 @@ def control_msg_to_numpy(
     return lfc_py_types.Control(
         feedback_gain=matrix_msg_to_numpy(msg.feedback_gain),
         feedforward=matrix_msg_to_numpy(msg.feedforward, feedforward_as_vector),
+        initial_state=sensor_msg_to_numpy(msg.initial_state, stamp_as_nanoseconds),
+        stamp=_stamp_msg_to_stamp(msg.header.stamp, stamp_as_nanoseconds),
+    )
+
+
+class LazySensor:
+    """Sensor with the same attributes as :class:`lfc_py_types.Sensor`, each field
+    being converted from the wrapped ROS message on first access and cached.
+    Consumers reading only some fields do not pay for the conversion of the other
+    ones. Fields can be assigned as on ``lfc_py_types.Sensor``. The message must not
+    be modified while fields are still to be converted.
+    """
+
+    def __init__(self, msg: Sensor) -> None:
+        """Wraps the message, nothing is converted.
+
+        Args:
+            msg (linear_feedback_controller_msgs.msg.Sensor): Input ROS message.
+        """
+        self._msg = msg
+
+    @functools.cached_property
+    def base_pose(self) -> np_array7:
+        return pose_msg_to_numpy(self._msg.base_pose)
+
+    @functools.cached_property
+    def base_twist(self) -> np_array6:
+        return twist_msg_to_numpy(self._msg.base_twist)
+
+    @functools.cached_property
+    def joint_state(self) -> lfc_py_types.JointState:
+        return joint_state_msg_to_numpy(self._msg.joint_state)
+
+    @functools.cached_property
+    def contacts(self) -> List[lfc_py_types.Contact]:
+        return [contact_msg_to_numpy(contact) for contact in self._msg.contacts]
+
+    @functools.cached_property
+    def stamp(self) -> Time:
+        return Time.from_msg(self._msg.header.stamp)
+
+    def to_sensor(self) -> lfc_py_types.Sensor:
+        """Converts the remaining fields.
+
+        Returns:
+            lfc_py_types.Sensor: Sensor sharing the already converted fields.
+        """
+        return lfc_py_types.Sensor(
+            base_pose=self.base_pose,
+            base_twist=self.base_twist,
+            joint_state=self.joint_state,
+            contacts=self.contacts,
+            stamp=self.stamp,
+        )
+
+    def __repr__(self) -> str:
+        return f"LazySensor(converted={sorted(vars(self).keys() - {'_msg'})!r})"
+
+
+class LazyControl:
+    """Control with the same attributes as :class:`lfc_py_types.Control`, each
+    field being converted from the wrapped ROS message on first access and cached.
+    ``initial_state`` is a :class:`LazySensor`. The message must not be modified
+    while fields are still to be converted.
+    """
+
+    def __init__(self, msg: Control, feedforward_as_vector: bool = True) -> None:
+        """Wraps the message, nothing is converted.
+
+        Args:
+            msg (linear_feedback_controller_msgs.msg.Control): Input ROS message.
+            feedforward_as_vector (bool, optional): If ``True`` feedforward is
+            returned as a vector in a shape (N,) otherwise the shape is (N,1).
+            Defaults to True.
+        """
+        self._msg = msg
+        self._feedforward_as_vector = feedforward_as_vector
+
+    @functools.cached_property
+    def feedback_gain(self) -> npt.NDArray[np.float64]:
+        return matrix_msg_to_numpy(self._msg.feedback_gain)
+
+    @functools.cached_property
+    def feedforward(self) -> npt.NDArray[np.float64]:
+        return matrix_msg_to_numpy(self._msg.feedforward, self._feedforward_as_vector)
+
+    @functools.cached_property
+    def initial_state(self) -> LazySensor:
+        return LazySensor(self._msg.initial_state)
+
+    @functools.cached_property
+    def stamp(self) -> Time:
+        return Time.from_msg(self._msg.header.stamp)
+
+    def to_control(self) -> lfc_py_types.Control:
+        """Converts the remaining fields.
+
+        Returns:
+            lfc_py_types.Control: Control sharing the already converted fields.
+        """
+        initial_state = self.initial_state
+        return lfc_py_types.Control(
+            feedback_gain=self.feedback_gain,
+            feedforward=self.feedforward,
+            initial_state=(
+                initial_state.to_sensor()
+                if isinstance(initial_state, LazySensor)
+                else initial_state
+            ),
+            stamp=self.stamp,
+        )
+
+    def __repr__(self) -> str:
+        converted = vars(self).keys() - {"_msg", "_feedforward_as_vector"}
+        return f"LazyControl(converted={sorted(converted)!r})"
+
+
+def control_compact_msg_to_numpy(msg: Control) -> lfc_py_types.Control:
+    """Converts ROS Control message with a feedback gain encoded by
+    :func:`matrix_numpy_to_msg_compact` into internal LFC Control class.
+
+    Args:
+        msg (linear_feedback_controller_msgs.msg.Control): Input ROS message.
+
+    Returns:
+        lfc_py_types.Control: Output LFC representation of Control.
+    """
+    return lfc_py_types.Control(
+        feedback_gain=matrix_compact_msg_to_numpy(msg.feedback_gain),
+        feedforward=matrix_msg_to_numpy(msg.feedforward),
         initial_state=sensor_msg_to_numpy(msg.initial_state),
         stamp=Time.from_msg(msg.header.stamp),
     )
 
 
+def contact_table_msg_to_numpy(
+    msgs: Sequence[Contact], out: Optional[lfc_py_types.ContactTable] = None
+) -> lfc_py_types.ContactTable:
+    """Converts contacts of a ROS Sensor message into internal LFC ContactTable class.
+    Each contact is written in the slot of its name, slots of contacts missing from
+    the message are marked inactive.
+
+    Args:
+        msgs (Sequence[linear_feedback_controller_msgs.msg.Contact]): Input ROS
+        messages, e.g. ``sensor.contacts``.
+        out (Optional[lfc_py_types.ContactTable], optional): Output table, written
+            in place. Defaults to a new table with one slot per message.
+
+    Returns:
+        lfc_py_types.ContactTable: Output LFC representation of the contacts.
+    """
+    if out is None:
+        out = lfc_py_types.ContactTable([msg.name for msg in msgs])
+    out.active[:] = False
+    slots = out.slots
+    for msg in msgs:
+        slot = slots[msg.name]
+        out.active[slot] = msg.active
+        wrench = msg.wrench
+        out.wrench[slot] = (
+            wrench.force.x,
+            wrench.force.y,
+            wrench.force.z,
+            wrench.torque.x,
+            wrench.torque.y,
+            wrench.torque.z,
+        )
+        pose = msg.pose
+        out.pose[slot] = (
+            pose.position.x,
+            pose.position.y,
+            pose.position.z,
+            pose.orientation.x,
+            pose.orientation.y,
+            pose.orientation.z,
+            pose.orientation.w,
+        )
+    return out
+
+
+def _array_d_to_numpy_into(
+    input: array.array, out: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Copies ``array.array('d')`` field of a ROS message into a Numpy vector.
+
+    Args:
+        input (array.array): Input array of doubles.
+        out (npt.NDArray[np.float64]): Output vector, reused if its size matches.
+
+    Returns:
+        npt.NDArray[np.float64]: ``out`` or newly allocated vector if sizes differ.
+    """
+    if out.shape != (len(input),):
+        return np.array(input, dtype=np.float64)
+    out[:] = input
+    return out
+
+
+def pose_msg_to_numpy_into(msg: Pose, out: np_array7) -> np_array7:
+    """Converts ROS Pose message into preallocated Numpy array of shape (7,).
+    Output order is the same as in :func:`pose_msg_to_numpy`.
+
+    Args:
+        msg (geometry_msgs.msg.Pose): Input ROS Pose message.
+        out (npt.NDArray[np.float64], Literal[7]): Output array written in place.
+
+    Returns:
+        npt.NDArray[np.float64], Literal[7]: The ``out`` array.
+    """
+    out[:] = (
+        msg.position.x,
+        msg.position.y,
+        msg.position.z,
+        msg.orientation.x,
+        msg.orientation.y,
+        msg.orientation.z,
+        msg.orientation.w,
+    )
+    return out
+
+
+def wrench_msg_to_numpy_into(msg: Wrench, out: np_array6) -> np_array6:
+    """Converts ROS Wrench message into preallocated Numpy array of shape (6,).
+    Output order is the same as in :func:`wrench_msg_to_numpy`.
+
+    Args:
+        msg (geometry_msgs.msg.Wrench): Input ROS Wrench message.
+        out (npt.NDArray[np.float64], Literal[6]): Output array written in place.
+
+    Returns:
+        npt.NDArray[np.float64], Literal[6]: The ``out`` array.
+    """
+    out[:] = (
+        msg.force.x,
+        msg.force.y,
+        msg.force.z,
+        msg.torque.x,
+        msg.torque.y,
+        msg.torque.z,
+    )
+    return out
+
+
+def twist_msg_to_numpy_into(msg: Twist, out: np_array6) -> np_array6:
+    """Converts ROS Twist message into preallocated Numpy array of shape (6,).
+    Output order is the same as in :func:`twist_msg_to_numpy`.
+
+    Args:
+        msg (geometry_msgs.msg.Twist): Input ROS Twist message.
+        out (npt.NDArray[np.float64], Literal[6]): Output array written in place.
+
+    Returns:
+        npt.NDArray[np.float64], Literal[6]: The ``out`` array.
+    """
+    out[:] = (
+        msg.linear.x,
+        msg.linear.y,
+        msg.linear.z,
+        msg.angular.x,
+        msg.angular.y,
+        msg.angular.z,
+    )
+    return out
+
+
+def matrix_msg_to_numpy_into(
+    msg: Float64MultiArray, out: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Converts ROS array message into preallocated numpy array. The shape of
+    ``out`` selects between (N,) and (N,1) representation of vectors.
+
+    Args:
+        msg (std_msgs.msg.Float64MultiArray): Input ROS message with array.
+        out (npt.NDArray[np.float64]): Output matrix, reused if its size matches.
+
+    Returns:
+        npt.NDArray[np.float64]: ``out`` or newly allocated matrix if sizes differ.
+    """
+    assert len(msg.layout.dim) == 2, "The ROS message must be a 2D matrix!"
+    rows = msg.layout.dim[0].size
+    cols = msg.layout.dim[1].size
+    if out.shape != (rows, cols) and not (out.shape == (rows,) and cols == 1):
+        return matrix_msg_to_numpy(msg, return_vector=out.ndim == 1)
+    out[...] = np.frombuffer(msg.data, dtype=np.float64).reshape(out.shape)
+    return out
+
+
+# Labels of the first dimension of Float64MultiArray matrices encoding an update
+# of the previously sent matrix, see MatrixDeltaEncoder.
+MATRIX_REUSE_LABEL = "rows/reuse"
+MATRIX_LOW_RANK_LABEL = "rows/lowrank"
+
+
+class MatrixDeltaEncoder:
+    """Encodes a stream of matrices, e.g. feedback gains of successive Control
+    messages, as updates of the previously decoded matrix. A matrix is sent as:
+
+    * a reuse flag, with empty data, if it is within ``atol`` of the previous one,
+    * a low-rank update ``A @ B`` of the previous one, with ``A`` of shape (R, k)
+      and ``B`` of shape (k, C) concatenated in the data, if the difference is of
+      rank at most ``max_rank`` up to ``atol`` and the update is smaller than the
+      matrix,
+    * the full matrix otherwise, on shape changes and every ``keyframe_interval``
+      matrices so that late subscribers and lost messages are recovered.
+
+    Updates are decoded by :func:`matrix_delta_msg_to_numpy_into` or C++
+    ``matrixDeltaMsgToEigen``. One encoder must be used per stream of matrices.
+    """
+
+    __slots__ = (
+        "atol",
+        "max_rank",
+        "keyframe_interval",
+        "_reference",
+        "_since_keyframe",
+    )
+
+    def __init__(
+        self, atol: float = 1e-12, max_rank: int = 2, keyframe_interval: int = 100
+    ) -> None:
+        """Creates the encoder, the first matrix is sent in full.
+
+        Args:
+            atol (float, optional): Maximum absolute error of the decoded matrix.
+                Defaults to 1e-12.
+            max_rank (int, optional): Maximum rank of the updates, 0 disables
+                low-rank updates. Defaults to 2.
+            keyframe_interval (int, optional): Number of updates between two full
+                matrices. Defaults to 100.
+        """
+        self.atol = atol
+        self.max_rank = max_rank
+        self.keyframe_interval = keyframe_interval
+        self.reset()
+
+    def reset(self) -> None:
+        """Sends the next matrix in full."""
+        self._reference = None
+        self._since_keyframe = 0
+
+    def encode(self, input: npt.NDArray[np.float64]) -> Float64MultiArray:
+        """Converts Numpy matrix into ROS array message holding the full matrix or
+        an update of the previously encoded one.
+
+        Args:
+            input (npt.NDArray[np.float64]): Input matrix of shape (R, C).
+
+        Returns:
+            std_msgs.msg.Float64MultiArray: ROS message with the matrix or update.
+        """
+        assert input.ndim == 2, (
+            f"Input matrix is dimension '{input.ndim}'. Expected 2D matrix!"
+        )
+        if (
+            self._reference is None
+            or self._reference.shape != input.shape
+            or self._since_keyframe >= self.keyframe_interval
+        ):
+            return self._encode_full(input)
+        self._since_keyframe += 1
+        rows, cols = input.shape
+
+        delta = input - self._reference
+        if delta.size == 0 or np.max(np.abs(delta)) <= self.atol:
+            return self._update_msg(MATRIX_REUSE_LABEL, rows, cols)
+
+        if self.max_rank > 0:
+            u, s, vt = np.linalg.svd(delta, full_matrices=False)
+            # Frobenius norm of the discarded part bounds the error of every entry.
+            tail = np.sqrt(np.cumsum((s**2)[::-1])[::-1])
+            for rank in range(1, min(self.max_rank, s.size) + 1):
+                if rank * (rows + cols) >= rows * cols:
+                    break
+                if rank == s.size or tail[rank] <= self.atol:
+                    a = u[:, :rank] * s[:rank]
+                    b = vt[:rank]
+                    # Tracks the matrix as computed by the decoder.
+                    self._reference += a @ b
+                    m = self._update_msg(MATRIX_LOW_RANK_LABEL, rows, cols, rank)
+                    m.data = _numpy_to_array_d(np.concatenate((a.ravel(), b.ravel())))
+                    return m
+        return self._encode_full(input)
+
+    def _encode_full(self, input: npt.NDArray[np.float64]) -> Float64MultiArray:
+        self._reference = np.array(input, dtype=np.float64)
+        self._since_keyframe = 0
+        return matrix_numpy_to_msg(input)
+
+    @staticmethod
+    def _update_msg(
+        label: str, rows: int, cols: int, rank: int = 0
+    ) -> Float64MultiArray:
+        m = Float64MultiArray()
+        m.layout.data_offset = 0
+        m.layout.dim = [
+            MultiArrayDimension(label=label, size=rows, stride=rank * (rows + cols)),
+            MultiArrayDimension(label="cols", size=cols, stride=cols),
+        ]
+        if label == MATRIX_LOW_RANK_LABEL:
+            m.layout.dim.append(
+                MultiArrayDimension(label="rank", size=rank, stride=rank)
+            )
+        return m
+
+
+def matrix_delta_msg_to_numpy_into(
+    msg: Float64MultiArray, out: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Applies ROS array message encoded by :class:`MatrixDeltaEncoder` to the
+    previously decoded matrix ``out``. Full matrices are converted as
+    :func:`matrix_msg_to_numpy_into` does.
+
+    Args:
+        msg (std_msgs.msg.Float64MultiArray): Input ROS message with the matrix
+        or its update.
+        out (npt.NDArray[np.float64]): Previously decoded matrix, updated in place.
+
+    Returns:
+        npt.NDArray[np.float64]: ``out`` or newly allocated matrix if a full matrix
+        of another shape is received.
+    """
+    label = msg.layout.dim[0].label
+    if label != MATRIX_REUSE_LABEL and label != MATRIX_LOW_RANK_LABEL:
+        return matrix_msg_to_numpy_into(msg, out)
+    rows = msg.layout.dim[0].size
+    cols = msg.layout.dim[1].size
+    assert out.shape == (rows, cols), (
+        f"Update of a ({rows}, {cols}) matrix received for a matrix of shape "
+        f"'{out.shape}'!"
+    )
+    if label == MATRIX_LOW_RANK_LABEL:
+        rank = msg.layout.dim[2].size
+        data = np.frombuffer(msg.data, dtype=np.float64)
+        out += data[: rows * rank].reshape(rows, rank) @ data[rows * rank :].reshape(
+            rank, cols
+        )
+    return out
+
+
+def joint_state_msg_to_numpy_into(
+    msg: JointState, out: lfc_py_types.JointState
+) -> lfc_py_types.JointState:
+    """Converts ROS JointState message into existing internal LFC JointState class.
+    Arrays of ``out`` are written in place, they are only reallocated when the
+    number of joints changes.
+
+    Args:
+        msg (sensor_msgs.msg.JointState): Input ROS message.
+        out (lfc_py_types.JointState): Output LFC representation of JointState.
+
+    Returns:
+        lfc_py_types.JointState: The ``out`` object.
+    """
+    out.name = msg.name
+    out.position = _array_d_to_numpy_into(msg.position, out.position)
+    out.velocity = _array_d_to_numpy_into(msg.velocity, out.velocity)
+    out.effort = _array_d_to_numpy_into(msg.effort, out.effort)
+    return out
+
+
+def contact_msg_to_numpy_into(
+    msg: Contact, out: lfc_py_types.Contact
+) -> lfc_py_types.Contact:
+    """Converts ROS Contact message into existing internal LFC Contact class.
+
+    Args:
+        msg (linear_feedback_controller_msgs.msg.Contact): Input ROS message.
+        out (lfc_py_types.Contact): Output LFC representation of Contact.
+
+    Returns:
+        lfc_py_types.Contact: The ``out`` object.
+    """
+    out.active = msg.active
+    out.name = msg.name
+    wrench_msg_to_numpy_into(msg.wrench, out.wrench)
+    pose_msg_to_numpy_into(msg.pose, out.pose)
+    return out
+
+
+def sensor_msg_to_numpy_into(
+    msg: Sensor, out: lfc_py_types.Sensor
+) -> lfc_py_types.Sensor:
+    """Converts ROS Sensor message into existing internal LFC Sensor class,
+    similarly to C++ ``sensorMsgToEigen``. A Sensor created once with
+    :func:`sensor_msg_to_numpy` can be reused for every following message,
+    new arrays are only allocated when the number of joints or contacts changes.
+    The type of ``out.stamp`` selects between rclpy Time and integer nanoseconds.
+
+    Args:
+        msg (linear_feedback_controller_msgs.msg.Sensor): Input ROS message.
+        out (lfc_py_types.Sensor): Output LFC representation of Sensor.
+
+    Returns:
+        lfc_py_types.Sensor: The ``out`` object.
+    """
+    pose_msg_to_numpy_into(msg.base_pose, out.base_pose)
+    twist_msg_to_numpy_into(msg.base_twist, out.base_twist)
+    joint_state_msg_to_numpy_into(msg.joint_state, out.joint_state)
+    if len(out.contacts) != len(msg.contacts):
+        del out.contacts[len(msg.contacts) :]
+        out.contacts.extend(
+            contact_msg_to_numpy(contact)
+            for contact in msg.contacts[len(out.contacts) :]
+        )
+    for contact, contact_out in zip(msg.contacts, out.contacts):
+        contact_msg_to_numpy_into(contact, contact_out)
+    out.stamp = _stamp_msg_to_stamp(
+        msg.header.stamp, isinstance(out.stamp, (int, np.integer))
+    )
+    return out
+
+
+def control_msg_to_numpy_into(
+    msg: Control, out: lfc_py_types.Control
+) -> lfc_py_types.Control:
+    """Converts ROS Control message into existing internal LFC Control class,
+    similarly to C++ ``controlMsgToEigen``. The shape of ``out.feedforward``
+    selects between (N,) and (N,1) representation and the type of ``out.stamp``
+    between rclpy Time and integer nanoseconds.
+
+    Args:
+        msg (linear_feedback_controller_msgs.msg.Control): Input ROS message.
+        out (lfc_py_types.Control): Output LFC representation of Control.
+
+    Returns:
+        lfc_py_types.Control: The ``out`` object.
+    """
+    out.feedback_gain = matrix_msg_to_numpy_into(msg.feedback_gain, out.feedback_gain)
+    out.feedforward = matrix_msg_to_numpy_into(msg.feedforward, out.feedforward)
+    sensor_msg_to_numpy_into(msg.initial_state, out.initial_state)
+    out.stamp = _stamp_msg_to_stamp(
+        msg.header.stamp, isinstance(out.stamp, (int, np.integer))
+    )
+    return out
+
+
+def control_delta_msg_to_numpy_into(
+    msg: Control, out: lfc_py_types.Control
+) -> lfc_py_types.Control:
+    """Converts ROS Control message with a feedback gain encoded by
+    :class:`MatrixDeltaEncoder` into existing internal LFC Control class, applying
+    the update to ``out.feedback_gain``.
+
+    Args:
+        msg (linear_feedback_controller_msgs.msg.Control): Input ROS message.
+        out (lfc_py_types.Control): Previously decoded Control, updated in place.
+
+    Returns:
+        lfc_py_types.Control: The ``out`` object.
+    """
+    out.feedback_gain = matrix_delta_msg_to_numpy_into(
+        msg.feedback_gain, out.feedback_gain
+    )
+    out.feedforward = matrix_msg_to_numpy_into(msg.feedforward, out.feedforward)
+    sensor_msg_to_numpy_into(msg.initial_state, out.initial_state)
+    out.stamp = _stamp_msg_to_stamp(
+        msg.header.stamp, isinstance(out.stamp, (int, np.integer))
+    )
+    return out
+
+
+def sensors_msgs_to_numpy_batch(msgs: Sequence[Sensor]) -> lfc_py_types.SensorBatch:
+    """Converts sequence of ROS Sensor messages into internal LFC SensorBatch class.
+    Output arrays are allocated once and filled in a single pass over the messages.
+    Names of joints and contacts are taken from the first message, all messages
+    are expected to have the same number of joints and contacts. Joint state fields
+    left empty in a message are filled with NaN.
+
+    Args:
+        msgs (Sequence[linear_feedback_controller_msgs.msg.Sensor]): Input ROS messages.
+
+    Returns:
+        lfc_py_types.SensorBatch: Output LFC representation of the Sensor sequence.
+    """
+    n_samples = len(msgs)
+    joint_names = list(msgs[0].joint_state.name) if n_samples > 0 else []
+    contact_names = (
+        [contact.name for contact in msgs[0].contacts] if n_samples > 0 else []
+    )
+    n_joints = len(joint_names)
+    n_contacts = len(contact_names)
+
+    batch = lfc_py_types.SensorBatch(
+        base_pose=np.empty((n_samples, 7)),
+        base_twist=np.empty((n_samples, 6)),
+        joint_state=lfc_py_types.JointState(
+            name=joint_names,
+            position=np.empty((n_samples, n_joints)),
+            velocity=np.empty((n_samples, n_joints)),
+            effort=np.empty((n_samples, n_joints)),
+        ),
+        contact_names=contact_names,
+        contact_active=np.empty((n_samples, n_contacts), dtype=np.bool_),
+        contact_wrench=np.empty((n_samples, n_contacts, 6)),
+        contact_pose=np.empty((n_samples, n_contacts, 7)),
+        stamp=np.empty(n_samples, dtype=np.int64),
+    )
+    return sensors_msgs_to_numpy_batch_into(msgs, batch)
+
+
+def sensors_msgs_to_numpy_batch_into(
+    msgs: Sequence[Sensor], out: lfc_py_types.SensorBatch
+) -> lfc_py_types.SensorBatch:
+    """Converts sequence of ROS Sensor messages into existing internal LFC SensorBatch
+    class, e.g. with arrays in shared memory. Arrays of ``out`` must have a leading
+    dimension of ``len(msgs)``, names of ``out`` are left untouched.
+
+    Args:
+        msgs (Sequence[linear_feedback_controller_msgs.msg.Sensor]): Input ROS messages.
+        out (lfc_py_types.SensorBatch): Output LFC representation of the Sensor
+        sequence.
+
+    Returns:
+        lfc_py_types.SensorBatch: The ``out`` object.
+    """
+    assert len(out) == len(msgs), (
+        f"Output batch has '{len(out)}' samples, expected '{len(msgs)}'!"
+    )
+    n_joints = out.joint_state.position.shape[1]
+    n_contacts = out.contact_active.shape[1]
+    joint_fields = (
+        ("position", out.joint_state.position),
+        ("velocity", out.joint_state.velocity),
+        ("effort", out.joint_state.effort),
+    )
+
+    for t, msg in enumerate(msgs):
+        assert len(msg.joint_state.name) == n_joints, (
+            f"Message '{t}' has '{len(msg.joint_state.name)}' joints, expected '{n_joints}'!"
+        )
+        assert len(msg.contacts) == n_contacts, (
+            f"Message '{t}' has '{len(msg.contacts)}' contacts, expected '{n_contacts}'!"
+        )
+        pose = msg.base_pose
+        out.base_pose[t] = (
+            pose.position.x,
+            pose.position.y,
+            pose.position.z,
+            pose.orientation.x,
+            pose.orientation.y,
+            pose.orientation.z,
+            pose.orientation.w,
+        )
+        twist = msg.base_twist
+        out.base_twist[t] = (
+            twist.linear.x,
+            twist.linear.y,
+            twist.linear.z,
+            twist.angular.x,
+            twist.angular.y,
+            twist.angular.z,
+        )
+        for field_name, column in joint_fields:
+            values = getattr(msg.joint_state, field_name)
+            column[t] = values if len(values) else np.nan
+        for c, contact in enumerate(msg.contacts):
+            out.contact_active[t, c] = contact.active
+            out.contact_wrench[t, c] = (
+                contact.wrench.force.x,
+                contact.wrench.force.y,
+                contact.wrench.force.z,
+                contact.wrench.torque.x,
+                contact.wrench.torque.y,
+                contact.wrench.torque.z,
+            )
+            out.contact_pose[t, c] = (
+                contact.pose.position.x,
+                contact.pose.position.y,
+                contact.pose.position.z,
+                contact.pose.orientation.x,
+                contact.pose.orientation.y,
+                contact.pose.orientation.z,
+                contact.pose.orientation.w,
+            )
+        out.stamp[t] = msg.header.stamp.sec * 1_000_000_000 + msg.header.stamp.nanosec
+    return out
+
+
+def controls_msgs_to_numpy_batch(
+    msgs: Sequence[Control],
+) -> lfc_py_types.ControlBatch:
+    """Converts sequence of ROS Control messages into internal LFC ControlBatch class.
+    Shapes of the gains are taken from the first message, all messages are expected
+    to have the same gain shapes, joints and contacts.
+
+    Args:
+        msgs (Sequence[linear_feedback_controller_msgs.msg.Control]): Input ROS
+        messages.
+
+    Returns:
+        lfc_py_types.ControlBatch: Output LFC representation of the Control sequence.
+    """
+    n_samples = len(msgs)
+    gain_shape = (
+        (
+            msgs[0].feedback_gain.layout.dim[0].size,
+            msgs[0].feedback_gain.layout.dim[1].size,
+        )
+        if n_samples > 0
+        else (0, 0)
+    )
+    feedforward_size = msgs[0].feedforward.layout.dim[0].size if n_samples > 0 else 0
+
+    batch = lfc_py_types.ControlBatch(
+        feedback_gain=np.empty((n_samples, *gain_shape)),
+        feedforward=np.empty((n_samples, feedforward_size)),
+        initial_state=sensors_msgs_to_numpy_batch([msg.initial_state for msg in msgs]),
+        stamp=np.empty(n_samples, dtype=np.int64),
+    )
+    _controls_gains_to_numpy_batch_into(msgs, batch)
+    return batch
+
+
+def controls_msgs_to_numpy_batch_into(
+    msgs: Sequence[Control], out: lfc_py_types.ControlBatch
+) -> lfc_py_types.ControlBatch:
+    """Converts sequence of ROS Control messages into existing internal LFC
+    ControlBatch class, e.g. with arrays in shared memory. Arrays of ``out`` must
+    have a leading dimension of ``len(msgs)``.
+
+    Args:
+        msgs (Sequence[linear_feedback_controller_msgs.msg.Control]): Input ROS
+        messages.
+        out (lfc_py_types.ControlBatch): Output LFC representation of the Control
+        sequence.
+
+    Returns:
+        lfc_py_types.ControlBatch: The ``out`` object.
+    """
+    assert len(out) == len(msgs), (
+        f"Output batch has '{len(out)}' samples, expected '{len(msgs)}'!"
+    )
+    sensors_msgs_to_numpy_batch_into(
+        [msg.initial_state for msg in msgs], out.initial_state
+    )
+    _controls_gains_to_numpy_batch_into(msgs, out)
+    return out
+
+
+def _controls_gains_to_numpy_batch_into(
+    msgs: Sequence[Control], batch: lfc_py_types.ControlBatch
+) -> None:
+    for t, msg in enumerate(msgs):
+        batch.feedback_gain[t] = matrix_msg_to_numpy(
+            msg.feedback_gain, return_vector=False, copy=False
+        )
+        batch.feedforward[t] = matrix_msg_to_numpy(msg.feedforward, copy=False)
+        batch.stamp[t] = msg.header.stamp.sec * 1_000_000_000 + msg.header.stamp.nanosec
+
+
 def joint_state_numpy_to_msg(input: lfc_py_types.JointState) -> JointState:
     """Converts internal LFC JointState class into ROS JointState message.
 
@@ -310,9 +1459,9 @@ def joint_state_numpy_to_msg(input: lfc_py_types.JointState) -> JointState:
     """
     return JointState(
         name=input.name,
-        position=input.position,
-        velocity=input.velocity,
-        effort=input.effort,
+        position=_numpy_to_array_d(input.position),
+        velocity=_numpy_to_array_d(input.velocity),
+        effort=_numpy_to_array_d(input.effort),
     )
 
 
@@ -325,14 +1474,39 @@ def contact_numpy_to_msg(input: lfc_py_types.Contact) -> Contact:
     Returns:
         linear_feedback_controller_msgs.msg.Contact: Output ROS message.
     """
+    _check_shape(input.wrench.shape, 6)
+    _check_shape(input.pose.shape, 7)
     return Contact(
         active=input.active,
         name=input.name,
-        wrench=wrench_numpy_to_msg(input.wrench),
-        pose=pose_numpy_to_msg(input.pose),
+        wrench=_wrench_numpy_to_msg(input.wrench),
+        pose=_pose_numpy_to_msg(input.pose),
     )
 
 
+def contact_table_numpy_to_msg(input: lfc_py_types.ContactTable) -> List[Contact]:
+    """Converts internal LFC ContactTable class into ROS Contact messages, one per
+    slot in slot order.
+
+    Args:
+        input (lfc_py_types.ContactTable): Input LFC representation of the contacts.
+
+    Returns:
+        List[linear_feedback_controller_msgs.msg.Contact]: Output ROS messages.
+    """
+    return [
+        Contact(
+            active=active,
+            name=name,
+            wrench=_wrench_numpy_to_msg(wrench),
+            pose=_pose_numpy_to_msg(pose),
+        )
+        for name, active, wrench, pose in zip(
+            input.names, input.active.tolist(), input.wrench, input.pose
+        )
+    ]
+
+
 def sensor_numpy_to_msg(input: lfc_py_types.Sensor) -> Sensor:
     """Converts internal LFC Sensor class into ROS Sensor message.
 
@@ -342,12 +1516,14 @@ def sensor_numpy_to_msg(input: lfc_py_types.Sensor) -> Sensor:
     Returns:
         linear_feedback_controller_msgs.msg.Sensor: Output ROS message.
     """
+    _check_shape(input.base_pose.shape, 7)
+    _check_shape(input.base_twist.shape, 6)
     return Sensor(
-        base_pose=pose_numpy_to_msg(input.base_pose),
-        base_twist=twist_numpy_to_msg(input.base_twist),
+        base_pose=_pose_numpy_to_msg(input.base_pose),
+        base_twist=_twist_numpy_to_msg(input.base_twist),
         joint_state=joint_state_numpy_to_msg(input.joint_state),
         contacts=[contact_numpy_to_msg(contact) for contact in input.contacts],
-        header=Header(stamp=input.stamp.to_msg()),
+        header=Header(stamp=stamp_to_msg(input.stamp)),
     )
 
 
@@ -364,5 +1540,322 @@ def control_numpy_to_msg(input: lfc_py_types.Control) -> Control:
         feedback_gain=matrix_numpy_to_msg(input.feedback_gain),
         feedforward=matrix_numpy_to_msg(input.feedforward),
         initial_state=sensor_numpy_to_msg(input.initial_state),
-        header=Header(stamp=input.stamp.to_msg()),
+        header=Header(stamp=stamp_to_msg(input.stamp)),
+    )
+
+
+def control_numpy_to_msg_incremental(
+    input: lfc_py_types.Control, encoder: MatrixDeltaEncoder
+) -> Control:
+    """Converts internal LFC Control class into ROS Control message with the
+    feedback gain encoded as an update of the previous one by ``encoder``.
+
+    Args:
+        input (lfc_py_types.Control): Input LFC representation of Control.
+        encoder (MatrixDeltaEncoder): Encoder of the stream of feedback gains.
+
+    Returns:
+        linear_feedback_controller_msgs.msg.Control: Output ROS message.
+    """
+    return Control(
+        feedback_gain=encoder.encode(input.feedback_gain),
+        feedforward=matrix_numpy_to_msg(input.feedforward),
+        initial_state=sensor_numpy_to_msg(input.initial_state),
+        header=Header(stamp=stamp_to_msg(input.stamp)),
+    )
+
+
+def control_numpy_to_msg_compact(
+    input: lfc_py_types.Control, encoding: MatrixEncoding = "float32"
+) -> Control:
+    """Converts internal LFC Control class into ROS Control message with the
+    feedback gain encoded by :func:`matrix_numpy_to_msg_compact`.
+
+    Args:
+        input (lfc_py_types.Control): Input LFC representation of Control.
+        encoding (MatrixEncoding, optional): Encoding of the feedback gain.
+            Defaults to "float32".
+
+    Returns:
+        linear_feedback_controller_msgs.msg.Control: Output ROS message.
+    """
+    return Control(
+        feedback_gain=matrix_numpy_to_msg_compact(input.feedback_gain, encoding),
+        feedforward=matrix_numpy_to_msg(input.feedforward),
+        initial_state=sensor_numpy_to_msg(input.initial_state),
+        header=Header(stamp=stamp_to_msg(input.stamp)),
     )
+
+
+def sensors_numpy_batch_to_msgs(input: lfc_py_types.SensorBatch) -> List[Sensor]:
+    """Converts internal LFC SensorBatch class into list of ROS Sensor messages,
+    e.g. to replay recorded data.
+
+    Each (T, ...) array is converted once for the whole batch, to Python floats for
+    the pose, twist and wrench fields and to a single ``array.array('d')`` sliced per
+    message for the joint states. The fields are then written in place into default
+    constructed messages, which is faster than calling :func:`sensor_numpy_to_msg`
+    per sample, see ``benchmarks/sensors_numpy_batch_to_msgs.py``. Samples whose
+    efforts are all NaN, i.e. left empty in the recorded messages, get an empty
+    effort.
+
+    Args:
+        input (lfc_py_types.SensorBatch): Input LFC representation of Sensor sequence.
+
+    Returns:
+        List[linear_feedback_controller_msgs.msg.Sensor]: Output ROS messages.
+    """
+    n_joints = len(input.joint_state.name)
+    joint_names = list(input.joint_state.name)
+    contact_names = list(input.contact_names)
+    positions = _numpy_to_array_d(input.joint_state.position)
+    velocities = _numpy_to_array_d(input.joint_state.velocity)
+    efforts = _numpy_to_array_d(input.joint_state.effort)
+    has_effort = (~np.isnan(input.joint_state.effort).all(axis=1)).tolist()
+    secs, nanosecs = np.divmod(np.asarray(input.stamp, dtype=np.int64), 1_000_000_000)
+
+    msgs = []
+    for t, (
+        base_pose,
+        base_twist,
+        with_effort,
+        active,
+        wrenches,
+        poses,
+        sec,
+        nanosec,
+    ) in enumerate(
+        zip(
+            input.base_pose.tolist(),
+            input.base_twist.tolist(),
+            has_effort,
+            input.contact_active.tolist(),
+            input.contact_wrench.tolist(),
+            input.contact_pose.tolist(),
+            secs.tolist(),
+            nanosecs.tolist(),
+        )
+    ):
+        msg = Sensor()
+        _fill_pose_msg(msg.base_pose, base_pose)
+        _fill_vector6_msg(msg.base_twist.linear, msg.base_twist.angular, base_twist)
+        joint_state = msg.joint_state
+        joints = slice(t * n_joints, (t + 1) * n_joints)
+        joint_state.name = list(joint_names)
+        joint_state.position = positions[joints]
+        joint_state.velocity = velocities[joints]
+        if with_effort:
+            joint_state.effort = efforts[joints]
+        contacts = []
+        for name, contact_active, wrench, pose in zip(
+            contact_names, active, wrenches, poses
+        ):
+            contact = Contact(active=contact_active, name=name)
+            _fill_vector6_msg(contact.wrench.force, contact.wrench.torque, wrench)
+            _fill_pose_msg(contact.pose, pose)
+            contacts.append(contact)
+        msg.contacts = contacts
+        stamp = msg.header.stamp
+        stamp.sec, stamp.nanosec = sec, nanosec
+        msgs.append(msg)
+    return msgs
+
+
+# Whether the compiled backend is used when it is available, see
+# set_compiled_backend.
+_use_compiled_backend = True
+
+
+@functools.lru_cache(maxsize=None)
+def _import_compiled_backend() -> Any:
+    try:
+        from linear_feedback_controller_msgs_py import _eigen_conversions
+    except ImportError:
+        return None
+    return _eigen_conversions
+
+
+def _compiled_backend() -> Any:
+    return _import_compiled_backend() if _use_compiled_backend else None
+
+
+def has_compiled_backend() -> bool:
+    """Checks whether the compiled conversions of serialized messages, built from
+    eigen_conversions.hpp when pybind11 is found, are available.
+
+    Returns:
+        bool: ``True`` if the extension can be imported.
+    """
+    return _import_compiled_backend() is not None
+
+
+def set_compiled_backend(enabled: bool) -> None:
+    """Selects between the compiled and the pure Python conversions of serialized
+    messages for the whole module. The compiled backend is used by default when
+    available, both give the same results.
+
+    Args:
+        enabled (bool): If ``True`` the compiled backend is used when available.
+    """
+    global _use_compiled_backend
+    _use_compiled_backend = enabled
+
+
+def _sensor_from_compiled(
+    values: tuple, stamp_as_nanoseconds: bool
+) -> lfc_py_types.Sensor:
+    base_pose, base_twist, name, position, velocity, effort, contacts, sec, nsec = (
+        values
+    )
+    return lfc_py_types.Sensor(
+        base_pose=base_pose,
+        base_twist=base_twist,
+        joint_state=lfc_py_types.JointState(
+            name=name, position=position, velocity=velocity, effort=effort
+        ),
+        contacts=[
+            lfc_py_types.Contact(active=active, name=name, wrench=wrench, pose=pose)
+            for active, name, wrench, pose in contacts
+        ],
+        stamp=_stamp_msg_to_stamp(TimeMsg(sec=sec, nanosec=nsec), stamp_as_nanoseconds),
+    )
+
+
+def _sensor_to_compiled(input: lfc_py_types.Sensor) -> tuple:
+    _check_shape(input.base_pose.shape, 7)
+    _check_shape(input.base_twist.shape, 6)
+    joint_state = input.joint_state
+    return (
+        input.base_pose,
+        input.base_twist,
+        joint_state.name,
+        joint_state.position,
+        joint_state.velocity,
+        joint_state.effort,
+        [
+            (contact.active, contact.name, contact.wrench, contact.pose)
+            for contact in input.contacts
+        ],
+        *_stamp_to_compiled(input.stamp),
+    )
+
+
+def _stamp_to_compiled(stamp: lfc_py_types.Stamp) -> Tuple[int, int]:
+    msg = stamp_to_msg(stamp)
+    return msg.sec, msg.nanosec
+
+
+def sensor_serialized_to_numpy(
+    data: bytes, stamp_as_nanoseconds: bool = False
+) -> lfc_py_types.Sensor:
+    """Converts serialized ROS Sensor message, e.g. received by a subscription
+    created with ``raw=True``, into internal LFC Sensor class. The compiled backend
+    deserializes and converts the message without holding the GIL, so that the
+    callbacks of a MultiThreadedExecutor convert messages in parallel.
+
+    Args:
+        data (bytes): Serialized linear_feedback_controller_msgs.msg.Sensor.
+        stamp_as_nanoseconds (bool, optional): If ``True`` the stamp is returned as
+        integer nanoseconds instead of rclpy Time. Defaults to False.
+
+    Returns:
+        lfc_py_types.Sensor: Output LFC representation of Sensor, equal to the
+        output of :func:`sensor_msg_to_numpy`.
+    """
+    backend = _compiled_backend()
+    if backend is not None:
+        return _sensor_from_compiled(
+            backend.sensor_serialized_to_numpy(data), stamp_as_nanoseconds
+        )
+    from rclpy.serialization import deserialize_message
+    from linear_feedback_controller_msgs.msg import Sensor as SensorMsg
+
+    return sensor_msg_to_numpy(
+        deserialize_message(data, SensorMsg), stamp_as_nanoseconds
+    )
+
+
+def control_serialized_to_numpy(
+    data: bytes, feedforward_as_vector: bool = True, stamp_as_nanoseconds: bool = False
+) -> lfc_py_types.Control:
+    """Converts serialized ROS Control message into internal LFC Control class,
+    without holding the GIL with the compiled backend, see
+    :func:`sensor_serialized_to_numpy`.
+
+    Args:
+        data (bytes): Serialized linear_feedback_controller_msgs.msg.Control.
+        feedforward_as_vector (bool, optional): If ``True`` feedforward is returned
+        as a vector in a shape (N,) otherwise the shape is (N,1). Defaults to True.
+        stamp_as_nanoseconds (bool, optional): If ``True`` the stamps are returned
+        as integer nanoseconds instead of rclpy Time. Defaults to False.
+
+    Returns:
+        lfc_py_types.Control: Output LFC representation of Control, equal to the
+        output of :func:`control_msg_to_numpy`.
+    """
+    backend = _compiled_backend()
+    if backend is not None:
+        feedback_gain, feedforward, initial_state, sec, nanosec = (
+            backend.control_serialized_to_numpy(data)
+        )
+        return lfc_py_types.Control(
+            feedback_gain=_matrix_data_to_numpy(*feedback_gain, True),
+            feedforward=_matrix_data_to_numpy(*feedforward, feedforward_as_vector),
+            initial_state=_sensor_from_compiled(initial_state, stamp_as_nanoseconds),
+            stamp=_stamp_msg_to_stamp(
+                TimeMsg(sec=sec, nanosec=nanosec), stamp_as_nanoseconds
+            ),
+        )
+    from rclpy.serialization import deserialize_message
+    from linear_feedback_controller_msgs.msg import Control as ControlMsg
+
+    return control_msg_to_numpy(
+        deserialize_message(data, ControlMsg),
+        feedforward_as_vector,
+        stamp_as_nanoseconds,
+    )
+
+
+def sensor_numpy_to_serialized(input: lfc_py_types.Sensor) -> bytes:
+    """Converts internal LFC Sensor class into serialized ROS Sensor message, which
+    publishers accept as is. The compiled backend converts and serializes without
+    holding the GIL.
+
+    Args:
+        input (lfc_py_types.Sensor): Input LFC representation of Sensor.
+
+    Returns:
+        bytes: Serialized message, equal to the serialized output of
+        :func:`sensor_numpy_to_msg`.
+    """
+    backend = _compiled_backend()
+    if backend is not None:
+        return backend.sensor_numpy_to_serialized(*_sensor_to_compiled(input))
+    from rclpy.serialization import serialize_message
+
+    return serialize_message(sensor_numpy_to_msg(input))
+
+
+def control_numpy_to_serialized(input: lfc_py_types.Control) -> bytes:
+    """Converts internal LFC Control class into serialized ROS Control message,
+    without holding the GIL with the compiled backend, see
+    :func:`sensor_numpy_to_serialized`.
+
+    Args:
+        input (lfc_py_types.Control): Input LFC representation of Control.
+
+    Returns:
+        bytes: Serialized message, equal to the serialized output of
+        :func:`control_numpy_to_msg`.
+    """
+    backend = _compiled_backend()
+    if backend is not None:
+        return backend.control_numpy_to_serialized(
+            input.feedback_gain.reshape(_matrix_shape(input.feedback_gain)),
+            input.feedforward.reshape(_matrix_shape(input.feedforward)),
+            *_sensor_to_compiled(input.initial_state),
+            *_stamp_to_compiled(input.stamp),
+        )
+    from rclpy.serialization import serialize_message
+
+    return serialize_message(control_numpy_to_msg(input))
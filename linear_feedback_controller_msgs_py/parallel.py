@@ -0,0 +1,226 @@
+"""Parallel conversion of large sequences of Control messages.
+
+Messages are split in contiguous chunks converted by a pool of worker processes.
+The parent allocates the arrays of the ControlBatch in one shared memory block and
+the workers write their chunk directly into it. The messages are sent serialized to
+the workers, which is much cheaper than pickling the message objects, and nothing
+but the number of converted messages is sent back.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+
+if TYPE_CHECKING:
+    from linear_feedback_controller_msgs.msg import Control
+
+# Field name to (offset in bytes, dtype, shape).
+BatchLayout = Dict[str, Tuple[int, str, Tuple[int, ...]]]
+
+
+def _control_batch_layout(
+    n_samples: int,
+    gain_shape: Tuple[int, int],
+    feedforward_size: int,
+    n_joints: int,
+    n_contacts: int,
+) -> Tuple[BatchLayout, int]:
+    fields = (
+        ("feedback_gain", "<f8", (n_samples, *gain_shape)),
+        ("feedforward", "<f8", (n_samples, feedforward_size)),
+        ("stamp", "<i8", (n_samples,)),
+        ("base_pose", "<f8", (n_samples, 7)),
+        ("base_twist", "<f8", (n_samples, 6)),
+        ("position", "<f8", (n_samples, n_joints)),
+        ("velocity", "<f8", (n_samples, n_joints)),
+        ("effort", "<f8", (n_samples, n_joints)),
+        ("contact_active", "|b1", (n_samples, n_contacts)),
+        ("contact_wrench", "<f8", (n_samples, n_contacts, 6)),
+        ("contact_pose", "<f8", (n_samples, n_contacts, 7)),
+        ("sensor_stamp", "<i8", (n_samples,)),
+    )
+    layout = {}
+    offset = 0
+    for name, dtype, shape in fields:
+        layout[name] = (offset, dtype, shape)
+        # Fields start on a cache line, so workers never write the same line.
+        size = np.dtype(dtype).itemsize * math.prod(shape)
+        offset += (size + 63) // 64 * 64
+    return layout, offset
+
+
+def _control_batch_views(
+    buffer,
+    layout: BatchLayout,
+    joint_names: List[str],
+    contact_names: List[str],
+    window: slice = slice(None),
+) -> lfc_py_types.ControlBatch:
+    arrays = {
+        name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)[window]
+        for name, (offset, dtype, shape) in layout.items()
+    }
+    return lfc_py_types.ControlBatch(
+        feedback_gain=arrays["feedback_gain"],
+        feedforward=arrays["feedforward"],
+        initial_state=lfc_py_types.SensorBatch(
+            base_pose=arrays["base_pose"],
+            base_twist=arrays["base_twist"],
+            joint_state=lfc_py_types.JointState(
+                name=joint_names,
+                position=arrays["position"],
+                velocity=arrays["velocity"],
+                effort=arrays["effort"],
+            ),
+            contact_names=contact_names,
+            contact_active=arrays["contact_active"],
+            contact_wrench=arrays["contact_wrench"],
+            contact_pose=arrays["contact_pose"],
+            stamp=arrays["sensor_stamp"],
+        ),
+        stamp=arrays["stamp"],
+    )
+
+
+def _convert_chunk(
+    shm_name: str, layout: BatchLayout, start: int, data: List[bytes]
+) -> int:
+    from rclpy.serialization import deserialize_message
+    from linear_feedback_controller_msgs.msg import Control
+
+    msgs = [deserialize_message(msg_data, Control) for msg_data in data]
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = _control_batch_views(
+            shm.buf, layout, [], [], slice(start, start + len(msgs))
+        )
+        npc.controls_msgs_to_numpy_batch_into(msgs, out)
+        del out
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # Views on the buffer are still held by the traceback of a conversion
+            # error, which is propagated instead.
+            pass
+    return len(msgs)
+
+
+def controls_msgs_to_numpy_batch_parallel(
+    msgs: Sequence[Control],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> lfc_py_types.ControlBatch:
+    """Converts sequence of ROS Control messages into internal LFC ControlBatch class
+    using a pool of worker processes, with the same output as
+    :func:`numpy_conversions.controls_msgs_to_numpy_batch`. The messages are
+    serialized to be sent to the workers, the result is copied once out of the
+    shared memory block written by the workers.
+
+    Args:
+        msgs (Sequence[linear_feedback_controller_msgs.msg.Control]): Input ROS
+        messages.
+        workers (Optional[int], optional): Number of worker processes, converted in
+            the calling process if 1. Defaults to the number of CPUs.
+        chunk_size (Optional[int], optional): Number of messages per task.
+            Defaults to 4 tasks per worker.
+        executor (Optional[Executor], optional): Process pool converting the chunks
+            instead of a new pool of ``workers`` processes. Defaults to None.
+
+    Returns:
+        lfc_py_types.ControlBatch: Output LFC representation of the Control sequence.
+    """
+    n_samples = len(msgs)
+    workers = workers if workers is not None else os.cpu_count()
+    if n_samples == 0 or (workers == 1 and executor is None):
+        return npc.controls_msgs_to_numpy_batch(msgs)
+
+    first = msgs[0]
+    joint_names = list(first.initial_state.joint_state.name)
+    contact_names = [contact.name for contact in first.initial_state.contacts]
+    layout, size = _control_batch_layout(
+        n_samples,
+        (
+            first.feedback_gain.layout.dim[0].size,
+            first.feedback_gain.layout.dim[1].size,
+        ),
+        first.feedforward.layout.dim[0].size,
+        len(joint_names),
+        len(contact_names),
+    )
+    chunk_size = chunk_size or math.ceil(n_samples / (4 * workers))
+    from rclpy.serialization import serialize_message
+
+    serialized = [serialize_message(msg) for msg in msgs]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        pool = executor if executor is not None else ProcessPoolExecutor(workers)
+        try:
+            futures = [
+                pool.submit(
+                    _convert_chunk,
+                    shm.name,
+                    layout,
+                    start,
+                    serialized[start : start + chunk_size],
+                )
+                for start in range(0, n_samples, chunk_size)
+            ]
+            converted = sum(future.result() for future in futures)
+        finally:
+            if executor is None:
+                pool.shutdown()
+        assert converted == n_samples, "Some messages were not converted!"
+        buffer = bytearray(shm.buf)
+    finally:
+        shm.close()
+        shm.unlink()
+    return _control_batch_views(buffer, layout, joint_names, contact_names)
+
+
+def measure_throughput_scaling(
+    msgs: Sequence[Control], worker_counts: Optional[Iterable[int]] = None
+) -> Dict[int, float]:
+    """Measures the number of Control messages converted per second by
+    :func:`controls_msgs_to_numpy_batch_parallel` for each number of workers.
+    A single worker is measured on the calling process, the start-up of the worker
+    processes is not measured.
+
+    Args:
+        msgs (Sequence[linear_feedback_controller_msgs.msg.Control]): Input ROS
+        messages.
+        worker_counts (Optional[Iterable[int]], optional): Numbers of workers to
+            measure. Defaults to 1 up to the number of CPUs.
+
+    Returns:
+        Dict[int, float]: Messages per second for each number of workers.
+    """
+    worker_counts = worker_counts or range(1, os.cpu_count() + 1)
+    throughput = {}
+    for workers in worker_counts:
+        if workers == 1:
+            start = time.perf_counter()
+            controls_msgs_to_numpy_batch_parallel(msgs, workers=1)
+            throughput[workers] = len(msgs) / (time.perf_counter() - start)
+            continue
+        with ProcessPoolExecutor(workers) as pool:
+            # Starts the worker processes before measuring.
+            controls_msgs_to_numpy_batch_parallel(
+                msgs[: 4 * workers], workers=workers, executor=pool
+            )
+            start = time.perf_counter()
+            controls_msgs_to_numpy_batch_parallel(msgs, workers=workers, executor=pool)
+            throughput[workers] = len(msgs) / (time.perf_counter() - start)
+    return throughput
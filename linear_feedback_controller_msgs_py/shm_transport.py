@@ -0,0 +1,466 @@
+"""Shared memory transport of Sensor and Control between processes of one host.
+
+Records have a fixed binary layout shared with the C++ header
+``linear_feedback_controller_msgs/shm_transport.hpp``. A record starts with
+a header of 8 int64 values (kind, stamp in nanoseconds, number of joints,
+number of contacts, feedback gain rows, feedback gain cols, feedforward size,
+stamp of the initial state in nanoseconds for Control records), followed by
+float64 values:
+
+* Sensor: the :class:`lfc_py_types.PackedSensor` buffer (base pose, base twist,
+  joint positions, velocities and efforts, wrench and pose of each contact)
+  and the activity of each contact as 0.0 or 1.0. Empty joint state arrays,
+  e.g. the efforts of most JointState messages, are encoded as NaN.
+* Control: the feedback gain in row-major order, the feedforward and the Sensor
+  payload of the initial state.
+
+Names of the joints and contacts are not part of the records, they are
+expected to be known by both processes.
+
+Records are exchanged through a single producer single consumer ring buffer
+stored in a memory mapped file, e.g. in ``/dev/shm``. The file starts with
+4 uint64 values (magic, version, number of slots, size of the slots), the
+write index at offset 64 and the read index at offset 128, each index being
+written by a single side only. Slots start at offset 192, each holding the
+uint64 size of the record followed by the record. Python has no atomics nor
+memory fences, the Python side relies on aligned 64-bit loads and stores being
+atomic and on the in-order visibility of loads and stores of x86-64 to publish
+the indices after the records. :class:`ShmRingBuffer` refuses to open on other
+architectures, e.g. ARM, where records could be read before being written.
+"""
+
+import mmap
+import os
+import platform
+from typing import List, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+
+RECORD_SENSOR = 1
+RECORD_CONTROL = 2
+RECORD_HEADER_SIZE = 64
+
+RING_MAGIC = 0x4C46435F53484D31  # "LFC_SHM1"
+RING_VERSION = 1
+RING_WRITE_INDEX_OFFSET = 64
+RING_READ_INDEX_OFFSET = 128
+RING_SLOTS_OFFSET = 192
+# Machines ordering loads and stores as the ring buffer expects, see above.
+RING_SUPPORTED_MACHINES = ("x86_64", "AMD64")
+
+
+def sensor_payload_size(n_joints: int, n_contacts: int) -> int:
+    """Computes number of float64 values of the Sensor payload.
+
+    Args:
+        n_joints (int): Number of joints.
+        n_contacts (int): Number of contacts.
+
+    Returns:
+        int: Number of float64 values.
+    """
+    return lfc_py_types.packed_sensor_size(n_joints, n_contacts) + n_contacts
+
+
+def sensor_record_size(sensor: lfc_py_types.Sensor) -> int:
+    """Computes size in bytes of the encoded Sensor.
+
+    Args:
+        sensor (lfc_py_types.Sensor): Sensor to encode.
+
+    Returns:
+        int: Size of the record in bytes.
+    """
+    return RECORD_HEADER_SIZE + 8 * sensor_payload_size(
+        len(sensor.joint_state.name), len(sensor.contacts)
+    )
+
+
+def control_record_size(control: lfc_py_types.Control) -> int:
+    """Computes size in bytes of the encoded Control.
+
+    Args:
+        control (lfc_py_types.Control): Control to encode.
+
+    Returns:
+        int: Size of the record in bytes.
+    """
+    return (
+        sensor_record_size(control.initial_state)
+        + 8 * control.feedback_gain.size
+        + 8 * control.feedforward.size
+    )
+
+
+def _encode_sensor_payload(
+    sensor: lfc_py_types.Sensor, out: npt.NDArray[np.float64]
+) -> None:
+    n_contacts = len(sensor.contacts)
+    if isinstance(sensor, lfc_py_types.PackedSensor):
+        out[: sensor.buffer.size] = sensor.buffer
+    else:
+        n_joints = len(sensor.joint_state.name)
+        out[0:7] = sensor.base_pose
+        out[7:13] = sensor.base_twist
+        joints = out[13 : 13 + 3 * n_joints].reshape(3, n_joints)
+        # Empty joint state arrays are filled with NaN, as in PackedSensor.
+        for row, values in zip(
+            joints,
+            (
+                sensor.joint_state.position,
+                sensor.joint_state.velocity,
+                sensor.joint_state.effort,
+            ),
+        ):
+            row[:] = values if len(values) else np.nan
+        contacts = out[13 + 3 * n_joints : out.size - n_contacts].reshape(
+            n_contacts, 13
+        )
+        for contact, block in zip(sensor.contacts, contacts):
+            block[:6] = contact.wrench
+            block[6:] = contact.pose
+    out[out.size - n_contacts :] = [contact.active for contact in sensor.contacts]
+
+
+def encode_sensor_into(sensor: lfc_py_types.Sensor, out: npt.NDArray[np.uint8]) -> int:
+    """Encodes Sensor into a preallocated buffer.
+
+    Args:
+        sensor (lfc_py_types.Sensor): Sensor to encode.
+        out (npt.NDArray[np.uint8]): Output buffer aligned on 8 bytes.
+
+    Returns:
+        int: Size of the record in bytes.
+    """
+    n_joints = len(sensor.joint_state.name)
+    n_contacts = len(sensor.contacts)
+    size = sensor_record_size(sensor)
+    assert out.size >= size, (
+        f"Output buffer has size of '{out.size}', record needs '{size}' bytes!"
+    )
+    out[:RECORD_HEADER_SIZE].view(np.int64)[:] = (
+        RECORD_SENSOR,
+        lfc_py_types.stamp_nanoseconds(sensor.stamp),
+        n_joints,
+        n_contacts,
+        0,
+        0,
+        0,
+        0,
+    )
+    _encode_sensor_payload(sensor, out[RECORD_HEADER_SIZE:size].view(np.float64))
+    return size
+
+
+def encode_control_into(
+    control: lfc_py_types.Control, out: npt.NDArray[np.uint8]
+) -> int:
+    """Encodes Control into a preallocated buffer.
+
+    Args:
+        control (lfc_py_types.Control): Control to encode.
+        out (npt.NDArray[np.uint8]): Output buffer aligned on 8 bytes.
+
+    Returns:
+        int: Size of the record in bytes.
+    """
+    sensor = control.initial_state
+    size = control_record_size(control)
+    assert out.size >= size, (
+        f"Output buffer has size of '{out.size}', record needs '{size}' bytes!"
+    )
+    rows, cols = (
+        control.feedback_gain.shape
+        if control.feedback_gain.ndim == 2
+        else (control.feedback_gain.shape[0], 1)
+    )
+    out[:RECORD_HEADER_SIZE].view(np.int64)[:] = (
+        RECORD_CONTROL,
+        lfc_py_types.stamp_nanoseconds(control.stamp),
+        len(sensor.joint_state.name),
+        len(sensor.contacts),
+        rows,
+        cols,
+        control.feedforward.size,
+        lfc_py_types.stamp_nanoseconds(sensor.stamp),
+    )
+    payload = out[RECORD_HEADER_SIZE:size].view(np.float64)
+    gain_end = control.feedback_gain.size
+    feedforward_end = gain_end + control.feedforward.size
+    payload[:gain_end] = control.feedback_gain.reshape(-1)
+    payload[gain_end:feedforward_end] = control.feedforward.reshape(-1)
+    _encode_sensor_payload(sensor, payload[feedforward_end:])
+    return size
+
+
+def _decode_stamp(nanoseconds: int, as_nanoseconds: bool) -> lfc_py_types.Stamp:
+    if as_nanoseconds:
+        return nanoseconds
+    # Imported here so that rclpy is only needed to decode rclpy Time stamps.
+    from rclpy.clock import ClockType
+    from rclpy.time import Time
+
+    return Time(nanoseconds=nanoseconds, clock_type=ClockType.ROS_TIME)
+
+
+def _decode_sensor_payload(
+    payload: npt.NDArray[np.float64],
+    joint_names: List[str],
+    contact_names: List[str],
+    stamp: lfc_py_types.Stamp,
+) -> lfc_py_types.PackedSensor:
+    n_contacts = len(contact_names)
+    return lfc_py_types.PackedSensor(
+        payload[: payload.size - n_contacts].copy(),
+        joint_names,
+        contact_names,
+        (payload[payload.size - n_contacts :] != 0.0).tolist(),
+        stamp,
+    )
+
+
+def decode_record(
+    record: npt.NDArray[np.uint8],
+    joint_names: List[str],
+    contact_names: List[str],
+    stamp_as_nanoseconds: bool = False,
+) -> Union[lfc_py_types.PackedSensor, lfc_py_types.Control]:
+    """Decodes a Sensor or Control record. Sensors are decoded as PackedSensor
+    with a single copy of the payload.
+
+    Args:
+        record (npt.NDArray[np.uint8]): Encoded record aligned on 8 bytes.
+        joint_names (List[str]): Names of the joints.
+        contact_names (List[str]): Names of the contacts.
+        stamp_as_nanoseconds (bool, optional): If ``True`` the stamps are returned
+        as integer nanoseconds instead of rclpy Time. Defaults to False.
+
+    Returns:
+        Union[lfc_py_types.PackedSensor, lfc_py_types.Control]: Decoded record.
+    """
+    kind, stamp_ns, n_joints, n_contacts, rows, cols, feedforward_size, state_ns = (
+        record[:RECORD_HEADER_SIZE].view(np.int64).tolist()
+    )
+    assert n_joints == len(joint_names), (
+        f"Record has '{n_joints}' joints, got '{len(joint_names)}' joint names!"
+    )
+    assert n_contacts == len(contact_names), (
+        f"Record has '{n_contacts}' contacts, got '{len(contact_names)}' names!"
+    )
+    stamp = _decode_stamp(stamp_ns, stamp_as_nanoseconds)
+    sensor_size = sensor_payload_size(n_joints, n_contacts)
+    payload_size = rows * cols + feedforward_size + sensor_size
+    payload = record[RECORD_HEADER_SIZE : RECORD_HEADER_SIZE + 8 * payload_size].view(
+        np.float64
+    )
+
+    if kind == RECORD_SENSOR:
+        return _decode_sensor_payload(payload, joint_names, contact_names, stamp)
+    assert kind == RECORD_CONTROL, f"Unknown record kind '{kind}'!"
+    gain_end = rows * cols
+    feedforward_end = gain_end + feedforward_size
+    return lfc_py_types.Control(
+        feedback_gain=payload[:gain_end].reshape(rows, cols).copy(),
+        feedforward=payload[gain_end:feedforward_end].copy(),
+        initial_state=_decode_sensor_payload(
+            payload[feedforward_end:],
+            joint_names,
+            contact_names,
+            _decode_stamp(state_ns, stamp_as_nanoseconds),
+        ),
+        stamp=stamp,
+    )
+
+
+class ShmRingBuffer:
+    """Single producer single consumer ring buffer of records in a memory mapped
+    file, compatible with ``linear_feedback_controller_msgs::shm::RingBuffer``.
+    One process pushes records, the other one pops them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        slot_count: Optional[int] = None,
+        record_capacity: Optional[int] = None,
+    ) -> None:
+        """Opens the ring buffer. If ``slot_count`` and ``record_capacity`` are
+        given the file is created, or reset if it exists.
+
+        Args:
+            path (str): Path of the file, e.g. ``/dev/shm/lfc_sensor``.
+            slot_count (Optional[int]): Number of records the buffer can hold.
+            record_capacity (Optional[int]): Maximal size of a record in bytes.
+
+        Raises:
+            RuntimeError: If the machine is not x86-64.
+        """
+        if platform.machine() not in RING_SUPPORTED_MACHINES:
+            raise RuntimeError(
+                f"Ring buffer needs the memory ordering of x86-64, "
+                f"'{platform.machine()}' is not supported!"
+            )
+        create = slot_count is not None and record_capacity is not None
+        fd = os.open(path, os.O_RDWR | (os.O_CREAT if create else 0), 0o600)
+        try:
+            if create:
+                # Slots hold the size of the record and are aligned on 8 bytes.
+                slot_size = 8 + (record_capacity + 7) // 8 * 8
+                os.ftruncate(fd, RING_SLOTS_OFFSET + slot_count * slot_size)
+            self._mmap = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+
+        self._control = np.ndarray((4,), dtype=np.uint64, buffer=self._mmap)
+        if create:
+            self._control[1:] = (RING_VERSION, slot_count, slot_size)
+            np.ndarray(
+                (RING_SLOTS_OFFSET // 8 - 4,),
+                dtype=np.uint64,
+                buffer=self._mmap,
+                offset=32,
+            )[:] = 0
+            # The magic is written last to mark the buffer as initialized.
+            self._control[0] = RING_MAGIC
+        assert int(self._control[0]) == RING_MAGIC, f"'{path}' is not a ring buffer!"
+        assert int(self._control[1]) == RING_VERSION, (
+            f"Ring buffer version '{int(self._control[1])}' is not supported!"
+        )
+        self._slot_count = int(self._control[2])
+        self._slot_size = int(self._control[3])
+        self._write_index = np.ndarray(
+            (1,), dtype=np.uint64, buffer=self._mmap, offset=RING_WRITE_INDEX_OFFSET
+        )
+        self._read_index = np.ndarray(
+            (1,), dtype=np.uint64, buffer=self._mmap, offset=RING_READ_INDEX_OFFSET
+        )
+        self._slots = np.ndarray(
+            (self._slot_count, self._slot_size),
+            dtype=np.uint8,
+            buffer=self._mmap,
+            offset=RING_SLOTS_OFFSET,
+        )
+
+    @property
+    def record_capacity(self) -> int:
+        """Maximal size of a record in bytes."""
+        return self._slot_size - 8
+
+    def _reserve(self) -> Optional[npt.NDArray[np.uint8]]:
+        write_index = int(self._write_index[0])
+        if write_index - int(self._read_index[0]) >= self._slot_count:
+            return None
+        return self._slots[write_index % self._slot_count]
+
+    def _commit(self, slot: npt.NDArray[np.uint8], size: int) -> None:
+        slot[:8].view(np.uint64)[0] = size
+        self._write_index[0] = int(self._write_index[0]) + 1
+
+    def push(self, record: npt.NDArray[np.uint8]) -> bool:
+        """Copies an encoded record into the buffer.
+
+        Args:
+            record (npt.NDArray[np.uint8]): Encoded record.
+
+        Returns:
+            bool: ``False`` if the buffer is full.
+        """
+        assert record.size <= self.record_capacity, (
+            f"Record of '{record.size}' bytes exceeds '{self.record_capacity}' bytes!"
+        )
+        slot = self._reserve()
+        if slot is None:
+            return False
+        slot[8 : 8 + record.size] = record
+        self._commit(slot, record.size)
+        return True
+
+    def push_sensor(self, sensor: lfc_py_types.Sensor) -> bool:
+        """Encodes Sensor directly into the buffer.
+
+        Args:
+            sensor (lfc_py_types.Sensor): Sensor to push.
+
+        Returns:
+            bool: ``False`` if the buffer is full.
+        """
+        slot = self._reserve()
+        if slot is None:
+            return False
+        self._commit(slot, encode_sensor_into(sensor, slot[8:]))
+        return True
+
+    def push_control(self, control: lfc_py_types.Control) -> bool:
+        """Encodes Control directly into the buffer.
+
+        Args:
+            control (lfc_py_types.Control): Control to push.
+
+        Returns:
+            bool: ``False`` if the buffer is full.
+        """
+        slot = self._reserve()
+        if slot is None:
+            return False
+        self._commit(slot, encode_control_into(control, slot[8:]))
+        return True
+
+    def pop(self) -> Optional[npt.NDArray[np.uint8]]:
+        """Copies the oldest record out of the buffer.
+
+        Returns:
+            Optional[npt.NDArray[np.uint8]]: Encoded record, ``None`` if the buffer
+            is empty.
+        """
+        read_index = int(self._read_index[0])
+        if read_index == int(self._write_index[0]):
+            return None
+        slot = self._slots[read_index % self._slot_count]
+        size = int(slot[:8].view(np.uint64)[0])
+        record = slot[8 : 8 + size].copy()
+        self._read_index[0] = read_index + 1
+        return record
+
+    def pop_decoded(
+        self,
+        joint_names: List[str],
+        contact_names: List[str],
+        stamp_as_nanoseconds: bool = False,
+    ) -> Optional[Union[lfc_py_types.PackedSensor, lfc_py_types.Control]]:
+        """Decodes the oldest record of the buffer.
+
+        Args:
+            joint_names (List[str]): Names of the joints.
+            contact_names (List[str]): Names of the contacts.
+            stamp_as_nanoseconds (bool, optional): If ``True`` the stamps are
+                returned as integer nanoseconds instead of rclpy Time. Defaults
+                to False.
+
+        Returns:
+            Optional[Union[lfc_py_types.PackedSensor, lfc_py_types.Control]]:
+            Decoded record, ``None`` if the buffer is empty.
+        """
+        read_index = int(self._read_index[0])
+        if read_index == int(self._write_index[0]):
+            return None
+        slot = self._slots[read_index % self._slot_count]
+        size = int(slot[:8].view(np.uint64)[0])
+        decoded = decode_record(
+            slot[8 : 8 + size], joint_names, contact_names, stamp_as_nanoseconds
+        )
+        self._read_index[0] = read_index + 1
+        return decoded
+
+    def close(self) -> None:
+        """Unmaps the file, the buffer cannot be used afterwards."""
+        del self._control, self._write_index, self._read_index, self._slots
+        self._mmap.close()
+
+    def __enter__(self) -> "ShmRingBuffer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,147 @@
+"""Streaming conversion of serialized Sensor and Control messages into batches.
+
+The generators consume an iterator of serialized messages, e.g. read from a
+rosbag, and yield fixed-size batches. At most ``chunk_size`` messages per chunk
+being decoded are held in memory, so the peak memory does not depend on the
+length of the recording. Chunks can be decoded in parallel by a pool of worker
+processes, the batches are still yielded in the order of the messages.
+"""
+
+import collections
+import itertools
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, TypeVar
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+
+Batch = TypeVar("Batch", lfc_py_types.SensorBatch, lfc_py_types.ControlBatch)
+
+
+def decode_sensor_chunk(chunk: List[bytes]) -> lfc_py_types.SensorBatch:
+    """Deserializes and converts a chunk of Sensor messages.
+
+    Args:
+        chunk (List[bytes]): Serialized linear_feedback_controller_msgs.msg.Sensor.
+
+    Returns:
+        lfc_py_types.SensorBatch: Converted batch.
+    """
+    # Imported here so that worker processes only import ROS when decoding.
+    from rclpy.serialization import deserialize_message
+    from linear_feedback_controller_msgs.msg import Sensor
+
+    return npc.sensors_msgs_to_numpy_batch(
+        [deserialize_message(data, Sensor) for data in chunk]
+    )
+
+
+def decode_control_chunk(chunk: List[bytes]) -> lfc_py_types.ControlBatch:
+    """Deserializes and converts a chunk of Control messages.
+
+    Args:
+        chunk (List[bytes]): Serialized linear_feedback_controller_msgs.msg.Control.
+
+    Returns:
+        lfc_py_types.ControlBatch: Converted batch.
+    """
+    from rclpy.serialization import deserialize_message
+    from linear_feedback_controller_msgs.msg import Control
+
+    return npc.controls_msgs_to_numpy_batch(
+        [deserialize_message(data, Control) for data in chunk]
+    )
+
+
+def _chunks(serialized: Iterable[bytes], chunk_size: int) -> Iterator[List[bytes]]:
+    iterator = iter(serialized)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _stream_batches(
+    decode_chunk: Callable[[List[bytes]], Batch],
+    serialized: Iterable[bytes],
+    chunk_size: int,
+    workers: int,
+    max_pending: Optional[int],
+    executor: Optional[Executor],
+) -> Iterator[Batch]:
+    assert chunk_size > 0, f"Chunk size must be positive, got '{chunk_size}'!"
+    if executor is None and workers == 0:
+        for chunk in _chunks(serialized, chunk_size):
+            yield decode_chunk(chunk)
+        return
+
+    pool = executor if executor is not None else ProcessPoolExecutor(workers)
+    max_pending = max_pending if max_pending is not None else 2 * max(workers, 1)
+    pending: Deque[Future] = collections.deque()
+    try:
+        for chunk in _chunks(serialized, chunk_size):
+            # Reading stops while max_pending chunks are being decoded.
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(pool.submit(decode_chunk, chunk))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown()
+
+
+def stream_sensor_batches(
+    serialized: Iterable[bytes],
+    chunk_size: int = 1024,
+    workers: int = 0,
+    max_pending: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[lfc_py_types.SensorBatch]:
+    """Converts a stream of serialized Sensor messages into SensorBatch chunks.
+
+    Args:
+        serialized (Iterable[bytes]): Serialized Sensor messages.
+        chunk_size (int, optional): Number of messages per batch, the last batch
+            may be shorter. Defaults to 1024.
+        workers (int, optional): Number of worker processes decoding the chunks,
+            decoded in the calling thread if 0. Defaults to 0.
+        max_pending (Optional[int], optional): Maximum number of chunks being
+            decoded at once. Defaults to twice the number of workers.
+        executor (Optional[Executor], optional): Executor decoding the chunks
+            instead of a pool of ``workers`` processes. Defaults to None.
+
+    Yields:
+        lfc_py_types.SensorBatch: Batches in the order of the messages.
+    """
+    yield from _stream_batches(
+        decode_sensor_chunk, serialized, chunk_size, workers, max_pending, executor
+    )
+
+
+def stream_control_batches(
+    serialized: Iterable[bytes],
+    chunk_size: int = 1024,
+    workers: int = 0,
+    max_pending: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[lfc_py_types.ControlBatch]:
+    """Converts a stream of serialized Control messages into ControlBatch chunks.
+
+    Args:
+        serialized (Iterable[bytes]): Serialized Control messages.
+        chunk_size (int, optional): Number of messages per batch, the last batch
+            may be shorter. Defaults to 1024.
+        workers (int, optional): Number of worker processes decoding the chunks,
+            decoded in the calling thread if 0. Defaults to 0.
+        max_pending (Optional[int], optional): Maximum number of chunks being
+            decoded at once. Defaults to twice the number of workers.
+        executor (Optional[Executor], optional): Executor decoding the chunks
+            instead of a pool of ``workers`` processes. Defaults to None.
+
+    Yields:
+        lfc_py_types.ControlBatch: Batches in the order of the messages.
+    """
+    yield from _stream_batches(
+        decode_control_chunk, serialized, chunk_size, workers, max_pending, executor
+    )
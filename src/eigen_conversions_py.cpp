@@ -0,0 +1,219 @@
+// Python bindings of eigen_conversions.hpp converting serialized Sensor and
+// Control messages. Deserialization, conversion and serialization run without
+// holding the GIL, so that the callbacks of a MultiThreadedExecutor convert
+// messages in parallel, only Python objects are created while holding it.
+
+#include <pybind11/eigen.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <rclcpp/serialization.hpp>
+#include <rclcpp/serialized_message.hpp>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <vector>
+
+#include "linear_feedback_controller_msgs/eigen_conversions.hpp"
+
+namespace py = pybind11;
+namespace lfc_msgs = linear_feedback_controller_msgs;
+
+namespace {
+
+using ConstRowMajorMap =
+    ::Eigen::Map<const lfc_msgs::internal::RowMajorMatrixXd>;
+using Array = py::array_t<double, py::array::c_style | py::array::forcecast>;
+// (active, name, wrench, pose) of a contact.
+using ContactTuple =
+    std::tuple<bool, std::string, ::Eigen::Matrix<double, 6, 1>,
+               ::Eigen::Matrix<double, 7, 1>>;
+
+template <class Message>
+void deserialize(const py::buffer& data, Message& m) {
+  const py::buffer_info info = data.request();
+  const std::size_t size = info.size * info.itemsize;
+  py::gil_scoped_release release;
+  rclcpp::SerializedMessage serialized(size);
+  auto& rcl_msg = serialized.get_rcl_serialized_message();
+  std::memcpy(rcl_msg.buffer, info.ptr, size);
+  rcl_msg.buffer_length = size;
+  rclcpp::Serialization<Message>().deserialize_message(&serialized, &m);
+}
+
+template <class Message>
+py::bytes serialize(const Message& m) {
+  rclcpp::SerializedMessage serialized;
+  {
+    py::gil_scoped_release release;
+    rclcpp::Serialization<Message>().serialize_message(&m, &serialized);
+  }
+  const auto& rcl_msg = serialized.get_rcl_serialized_message();
+  return py::bytes(reinterpret_cast<const char*>(rcl_msg.buffer),
+                   rcl_msg.buffer_length);
+}
+
+template <class Derived>
+py::array_t<double> toNumpy(const ::Eigen::PlainObjectBase<Derived>& e) {
+  return py::array_t<double>(e.size(), e.data());
+}
+
+// Flat data and sizes of the dimensions of a matrix, reshaped in Python by the
+// same code as matrix_msg_to_numpy so that both accept the same messages.
+py::tuple matrixToPython(const std_msgs::msg::Float64MultiArray& m) {
+  py::array_t<double> data(m.data.size());
+  double* out = data.mutable_data();
+  {
+    py::gil_scoped_release release;
+    std::copy(m.data.begin(), m.data.end(), out);
+  }
+  py::list sizes;
+  for (const auto& dim : m.layout.dim) {
+    sizes.append(dim.size);
+  }
+  return py::make_tuple(data, sizes);
+}
+
+// Tuple of the fields of lfc_py_types.Sensor, the stamp as (sec, nanosec).
+py::tuple sensorToPython(const lfc_msgs::msg::Sensor& m,
+                         const lfc_msgs::Eigen::Sensor& e) {
+  py::list contacts;
+  for (const auto& contact : e.contacts) {
+    contacts.append(py::make_tuple(contact.active, contact.name,
+                                   toNumpy(contact.wrench),
+                                   toNumpy(contact.pose)));
+  }
+  return py::make_tuple(toNumpy(e.base_pose), toNumpy(e.base_twist),
+                        e.joint_state.name, toNumpy(e.joint_state.position),
+                        toNumpy(e.joint_state.velocity),
+                        toNumpy(e.joint_state.effort), contacts,
+                        m.header.stamp.sec, m.header.stamp.nanosec);
+}
+
+py::tuple sensorSerializedToNumpy(const py::buffer& data) {
+  lfc_msgs::msg::Sensor m;
+  lfc_msgs::Eigen::Sensor e;
+  deserialize(data, m);
+  {
+    py::gil_scoped_release release;
+    lfc_msgs::sensorMsgToEigen(m, e);
+  }
+  return sensorToPython(m, e);
+}
+
+// (feedback_gain, feedforward, initial_state, sec, nanosec), matrices as
+// (data, sizes).
+py::tuple controlSerializedToNumpy(const py::buffer& data) {
+  lfc_msgs::msg::Control m;
+  lfc_msgs::Eigen::Sensor initial_state;
+  deserialize(data, m);
+  {
+    py::gil_scoped_release release;
+    lfc_msgs::sensorMsgToEigen(m.initial_state, initial_state);
+  }
+  return py::make_tuple(matrixToPython(m.feedback_gain),
+                        matrixToPython(m.feedforward),
+                        sensorToPython(m.initial_state, initial_state),
+                        m.header.stamp.sec, m.header.stamp.nanosec);
+}
+
+// Stamps are passed as the (sec, nanosec) of stamp_to_msg and written in the
+// messages, rclcpp::Time does not accept negative stamps.
+lfc_msgs::Eigen::Sensor sensorFromPython(
+    const ::Eigen::Matrix<double, 7, 1>& base_pose,
+    const ::Eigen::Matrix<double, 6, 1>& base_twist,
+    const std::vector<std::string>& name, const ::Eigen::VectorXd& position,
+    const ::Eigen::VectorXd& velocity, const ::Eigen::VectorXd& effort,
+    const std::vector<ContactTuple>& contacts) {
+  lfc_msgs::Eigen::Sensor e;
+  e.base_pose = base_pose;
+  e.base_twist = base_twist;
+  e.joint_state.name = name;
+  e.joint_state.position = position;
+  e.joint_state.velocity = velocity;
+  e.joint_state.effort = effort;
+  e.contacts.reserve(contacts.size());
+  for (const auto& [active, contact_name, wrench, pose] : contacts) {
+    e.contacts.push_back({active, contact_name, wrench, pose});
+  }
+  return e;
+}
+
+ConstRowMajorMap matrixFromPython(const Array& a, const char* field) {
+  if (a.ndim() != 2) {
+    throw std::invalid_argument(std::string(field) + " must be a 2D matrix.");
+  }
+  return ConstRowMajorMap(a.data(), a.shape(0), a.shape(1));
+}
+
+py::bytes sensorNumpyToSerialized(
+    const ::Eigen::Matrix<double, 7, 1>& base_pose,
+    const ::Eigen::Matrix<double, 6, 1>& base_twist,
+    const std::vector<std::string>& name, const ::Eigen::VectorXd& position,
+    const ::Eigen::VectorXd& velocity, const ::Eigen::VectorXd& effort,
+    const std::vector<ContactTuple>& contacts, std::int32_t sec,
+    std::uint32_t nanosec) {
+  const lfc_msgs::Eigen::Sensor e = sensorFromPython(
+      base_pose, base_twist, name, position, velocity, effort, contacts);
+  lfc_msgs::msg::Sensor m;
+  {
+    py::gil_scoped_release release;
+    lfc_msgs::sensorEigenToMsg(e, m);
+    m.header.stamp.sec = sec;
+    m.header.stamp.nanosec = nanosec;
+  }
+  return serialize(m);
+}
+
+py::bytes controlNumpyToSerialized(
+    const Array& feedback_gain, const Array& feedforward,
+    const ::Eigen::Matrix<double, 7, 1>& base_pose,
+    const ::Eigen::Matrix<double, 6, 1>& base_twist,
+    const std::vector<std::string>& name, const ::Eigen::VectorXd& position,
+    const ::Eigen::VectorXd& velocity, const ::Eigen::VectorXd& effort,
+    const std::vector<ContactTuple>& contacts, std::int32_t sensor_sec,
+    std::uint32_t sensor_nanosec, std::int32_t sec, std::uint32_t nanosec) {
+  const ConstRowMajorMap gain =
+      matrixFromPython(feedback_gain, "Feedback gain");
+  const ConstRowMajorMap ff = matrixFromPython(feedforward, "Feedforward");
+  const lfc_msgs::Eigen::Sensor initial_state = sensorFromPython(
+      base_pose, base_twist, name, position, velocity, effort, contacts);
+  lfc_msgs::msg::Control m;
+  {
+    py::gil_scoped_release release;
+    lfc_msgs::matrixEigenToMsg(gain, m.feedback_gain);
+    lfc_msgs::matrixEigenToMsg(ff, m.feedforward);
+    lfc_msgs::sensorEigenToMsg(initial_state, m.initial_state);
+    m.initial_state.header.stamp.sec = sensor_sec;
+    m.initial_state.header.stamp.nanosec = sensor_nanosec;
+    m.header.stamp.sec = sec;
+    m.header.stamp.nanosec = nanosec;
+  }
+  return serialize(m);
+}
+
+}  // namespace
+
+PYBIND11_MODULE(_eigen_conversions, module) {
+  module.doc() =
+      "Conversions of serialized Sensor and Control messages releasing the "
+      "GIL, see numpy_conversions.";
+  module.def("sensor_serialized_to_numpy", &sensorSerializedToNumpy,
+             py::arg("data"));
+  module.def("control_serialized_to_numpy", &controlSerializedToNumpy,
+             py::arg("data"));
+  module.def("sensor_numpy_to_serialized", &sensorNumpyToSerialized,
+             py::arg("base_pose"), py::arg("base_twist"), py::arg("name"),
+             py::arg("position"), py::arg("velocity"), py::arg("effort"),
+             py::arg("contacts"), py::arg("sec"), py::arg("nanosec"));
+  module.def("control_numpy_to_serialized", &controlNumpyToSerialized,
+             py::arg("feedback_gain"), py::arg("feedforward"),
+             py::arg("base_pose"), py::arg("base_twist"), py::arg("name"),
+             py::arg("position"), py::arg("velocity"), py::arg("effort"),
+             py::arg("contacts"), py::arg("sensor_sec"),
+             py::arg("sensor_nanosec"), py::arg("sec"), py::arg("nanosec"));
+}
@@ -0,0 +1,285 @@
+#include <gtest/gtest.h>
+
+#include <atomic>
+#include <cerrno>
+#include <chrono>
+#include <cstddef>
+#include <cstdlib>
+#include <iomanip>
+#include <iostream>
+#include <string>
+
+#include "linear_feedback_controller_msgs/eigen_conversions.hpp"
+#include "linear_feedback_controller_msgs/msg/control.hpp"
+#include "linear_feedback_controller_msgs/msg/sensor.hpp"
+
+namespace lfc_msgs = linear_feedback_controller_msgs;
+
+/**
+ * Malloc hook counting the heap allocations done by the measured code.
+ */
+
+namespace {
+
+std::atomic<bool> count_allocations{false};
+std::atomic<std::size_t> allocations{0};
+
+void countAllocation() {
+  if (count_allocations.load(std::memory_order_relaxed)) {
+    allocations.fetch_add(1, std::memory_order_relaxed);
+  }
+}
+
+}  // namespace
+
+#ifdef __GLIBC__
+#define LFC_MSGS_HAS_MALLOC_HOOK 1
+
+extern "C" {
+void* __libc_malloc(std::size_t size);
+void* __libc_calloc(std::size_t count, std::size_t size);
+void* __libc_realloc(void* ptr, std::size_t size);
+void* __libc_memalign(std::size_t alignment, std::size_t size);
+
+void* malloc(std::size_t size) noexcept {
+  countAllocation();
+  return __libc_malloc(size);
+}
+
+void* calloc(std::size_t count, std::size_t size) noexcept {
+  countAllocation();
+  return __libc_calloc(count, size);
+}
+
+void* realloc(void* ptr, std::size_t size) noexcept {
+  countAllocation();
+  return __libc_realloc(ptr, size);
+}
+
+void* aligned_alloc(std::size_t alignment, std::size_t size) noexcept {
+  countAllocation();
+  return __libc_memalign(alignment, size);
+}
+
+int posix_memalign(void** ptr, std::size_t alignment,
+                   std::size_t size) noexcept {
+  countAllocation();
+  *ptr = __libc_memalign(alignment, size);
+  return *ptr == nullptr ? ENOMEM : 0;
+}
+}
+#endif
+
+namespace {
+
+struct Measure {
+  double ns_per_call;
+  double allocations_per_call;
+};
+
+// Calls the function once to warm up the outputs, then measures the average
+// latency and number of heap allocations per call.
+template <class Function>
+Measure measure(Function&& function, std::size_t iterations = 1000) {
+  function();
+  allocations = 0;
+  count_allocations = true;
+  const auto start = std::chrono::steady_clock::now();
+  for (std::size_t i = 0; i < iterations; ++i) {
+    function();
+    // Prevents the compiler from hoisting the conversion out of the loop.
+    std::atomic_signal_fence(std::memory_order_seq_cst);
+  }
+  const auto stop = std::chrono::steady_clock::now();
+  count_allocations = false;
+  return {
+      std::chrono::duration<double, std::nano>(stop - start).count() /
+          iterations,
+      static_cast<double>(allocations) / iterations,
+  };
+}
+
+void report(const std::string& name, int n_joints, const Measure& m) {
+  std::cout << std::left << std::setw(24) << name << " joints: " << std::setw(3)
+            << n_joints << " ns/call: " << std::setw(10) << std::fixed
+            << std::setprecision(1) << m.ns_per_call
+            << " allocations/call: " << m.allocations_per_call << std::endl;
+  ::testing::Test::RecordProperty(name + "_ns_per_call",
+                                  std::to_string(m.ns_per_call));
+  ::testing::Test::RecordProperty(name + "_allocations_per_call",
+                                  std::to_string(m.allocations_per_call));
+}
+
+lfc_msgs::Eigen::Sensor makeSensor(int n_joints, int n_contacts) {
+  lfc_msgs::Eigen::Sensor e;
+  e.base_pose = Eigen::Matrix<double, 7, 1>::Random();
+  e.base_twist = Eigen::Matrix<double, 6, 1>::Random();
+  for (int i = 0; i < n_joints; ++i) {
+    e.joint_state.name.push_back("joint_" + std::to_string(i));
+  }
+  e.joint_state.position = Eigen::VectorXd::Random(n_joints);
+  e.joint_state.velocity = Eigen::VectorXd::Random(n_joints);
+  e.joint_state.effort = Eigen::VectorXd::Random(n_joints);
+  e.contacts.resize(n_contacts);
+  for (int i = 0; i < n_contacts; ++i) {
+    e.contacts[i] = {
+        .active = true,
+        .name = "contact_" + std::to_string(i),
+        .wrench = Eigen::Matrix<double, 6, 1>::Random(),
+        .pose = Eigen::Matrix<double, 7, 1>::Random(),
+    };
+  }
+  return e;
+}
+
+lfc_msgs::Eigen::Control makeControl(int n_joints, int n_contacts) {
+  lfc_msgs::Eigen::Control e;
+  e.feedback_gain = Eigen::MatrixXd::Random(n_joints, 2 * (6 + n_joints));
+  e.feedforward = Eigen::VectorXd::Random(n_joints);
+  e.initial_state = makeSensor(n_joints, n_contacts);
+  return e;
+}
+
+}  // namespace
+
+class EigenConversionsBenchmark : public ::testing::TestWithParam<int> {
+ protected:
+  void SetUp() override {
+#ifndef LFC_MSGS_HAS_MALLOC_HOOK
+    GTEST_SKIP() << "Allocations can only be counted with glibc.";
+#endif
+  }
+
+  static constexpr int n_contacts = 4;
+};
+
+TEST_P(EigenConversionsBenchmark, wrenchConversions) {
+  const Eigen::Matrix<double, 6, 1> e = Eigen::Matrix<double, 6, 1>::Random();
+  Eigen::Matrix<double, 6, 1> etest;
+  geometry_msgs::msg::Wrench m;
+
+  const auto to_msg = measure([&] { lfc_msgs::wrenchEigenToMsg(e, m); });
+  const auto to_eigen = measure([&] { lfc_msgs::wrenchMsgToEigen(m, etest); });
+
+  report("wrenchEigenToMsg", GetParam(), to_msg);
+  report("wrenchMsgToEigen", GetParam(), to_eigen);
+  EXPECT_EQ(to_msg.allocations_per_call, 0.0);
+  EXPECT_EQ(to_eigen.allocations_per_call, 0.0);
+}
+
+TEST_P(EigenConversionsBenchmark, matrixConversions) {
+  const auto e = makeControl(GetParam(), n_contacts);
+  Eigen::MatrixXd etest =
+      Eigen::MatrixXd::Zero(e.feedback_gain.rows(), e.feedback_gain.cols());
+  std_msgs::msg::Float64MultiArray m;
+
+  const auto to_msg =
+      measure([&] { lfc_msgs::matrixEigenToMsg(e.feedback_gain, m); });
+  const auto to_eigen = measure([&] { lfc_msgs::matrixMsgToEigen(m, etest); });
+
+  report("matrixEigenToMsg", GetParam(), to_msg);
+  report("matrixMsgToEigen", GetParam(), to_eigen);
+  EXPECT_EQ(to_msg.allocations_per_call, 0.0);
+  EXPECT_EQ(to_eigen.allocations_per_call, 0.0);
+}
+
+TEST_P(EigenConversionsBenchmark, matrixCompactConversions) {
+  const auto e = makeControl(GetParam(), n_contacts);
+  Eigen::MatrixXd etest =
+      Eigen::MatrixXd::Zero(e.feedback_gain.rows(), e.feedback_gain.cols());
+  std_msgs::msg::Float64MultiArray m;
+
+  for (const auto& [name, encoding] :
+       {std::pair{"Float32", lfc_msgs::MatrixEncoding::kFloat32},
+        std::pair{"Int16", lfc_msgs::MatrixEncoding::kInt16}}) {
+    const auto to_msg = measure([&] {
+      lfc_msgs::matrixEigenToCompactMsg(e.feedback_gain, m, encoding);
+    });
+    const auto to_eigen =
+        measure([&] { lfc_msgs::matrixCompactMsgToEigen(m, etest); });
+
+    report(std::string("matrixEigenTo") + name + "Msg", GetParam(), to_msg);
+    report(std::string("matrix") + name + "MsgToEigen", GetParam(), to_eigen);
+    EXPECT_EQ(to_msg.allocations_per_call, 0.0);
+    EXPECT_EQ(to_eigen.allocations_per_call, 0.0);
+  }
+}
+
+TEST_P(EigenConversionsBenchmark, jointStateConversions) {
+  const auto e = makeSensor(GetParam(), n_contacts);
+  lfc_msgs::Eigen::JointState etest;
+  sensor_msgs::msg::JointState m;
+
+  const auto to_msg =
+      measure([&] { lfc_msgs::jointStateEigenToMsg(e.joint_state, m); });
+  const auto to_eigen =
+      measure([&] { lfc_msgs::jointStateMsgToEigen(m, etest); });
+
+  report("jointStateEigenToMsg", GetParam(), to_msg);
+  report("jointStateMsgToEigen", GetParam(), to_eigen);
+  EXPECT_EQ(to_msg.allocations_per_call, 0.0);
+  EXPECT_EQ(to_eigen.allocations_per_call, 0.0);
+}
+
+TEST_P(EigenConversionsBenchmark, contactConversions) {
+  const auto e = makeSensor(GetParam(), n_contacts);
+  lfc_msgs::Eigen::Contact etest;
+  lfc_msgs::msg::Contact m;
+
+  const auto to_msg =
+      measure([&] { lfc_msgs::contactEigenToMsg(e.contacts[0], m); });
+  const auto to_eigen = measure([&] { lfc_msgs::contactMsgToEigen(m, etest); });
+
+  report("contactEigenToMsg", GetParam(), to_msg);
+  report("contactMsgToEigen", GetParam(), to_eigen);
+  EXPECT_EQ(to_msg.allocations_per_call, 0.0);
+  EXPECT_EQ(to_eigen.allocations_per_call, 0.0);
+}
+
+TEST_P(EigenConversionsBenchmark, sensorConversions) {
+  const auto e = makeSensor(GetParam(), n_contacts);
+  lfc_msgs::Eigen::Sensor etest;
+  lfc_msgs::msg::Sensor m;
+
+  const auto to_msg = measure([&] { lfc_msgs::sensorEigenToMsg(e, m); });
+  const auto to_eigen = measure([&] { lfc_msgs::sensorMsgToEigen(m, etest); });
+
+  report("sensorEigenToMsg", GetParam(), to_msg);
+  report("sensorMsgToEigen", GetParam(), to_eigen);
+  EXPECT_EQ(to_msg.allocations_per_call, 0.0);
+  EXPECT_EQ(to_eigen.allocations_per_call, 0.0);
+}
+
+TEST_P(EigenConversionsBenchmark, controlConversions) {
+  const auto e = makeControl(GetParam(), n_contacts);
+  auto etest = makeControl(GetParam(), n_contacts);
+  lfc_msgs::msg::Control m;
+
+  const auto to_msg = measure([&] { lfc_msgs::controlEigenToMsg(e, m); });
+  const auto to_eigen = measure([&] { lfc_msgs::controlMsgToEigen(m, etest); });
+
+  report("controlEigenToMsg", GetParam(), to_msg);
+  report("controlMsgToEigen", GetParam(), to_eigen);
+  EXPECT_EQ(to_msg.allocations_per_call, 0.0);
+  EXPECT_EQ(to_eigen.allocations_per_call, 0.0);
+}
+
+TEST_P(EigenConversionsBenchmark, controlView) {
+  const auto e = makeControl(GetParam(), n_contacts);
+  lfc_msgs::msg::Control m;
+  lfc_msgs::controlEigenToMsg(e, m);
+  Eigen::VectorXd u(e.feedforward.size());
+  const Eigen::VectorXd x = Eigen::VectorXd::Random(e.feedback_gain.cols());
+
+  // Reads the view as a control law would do.
+  const auto to_view = measure([&] {
+    const auto view = lfc_msgs::controlMsgToEigenView(m);
+    u.noalias() = view.feedforward + view.feedback_gain * x;
+  });
+
+  report("controlMsgToEigenView", GetParam(), to_view);
+  EXPECT_EQ(to_view.allocations_per_call, 0.0);
+}
+
+INSTANTIATE_TEST_SUITE_P(RobotSizes, EigenConversionsBenchmark,
+                         ::testing::Values(12, 30, 60));
@@ -0,0 +1,100 @@
+"""Random LFC data shared by the tests, imported with ``from conftest import ...``."""
+
+from typing import Optional, Sequence
+
+import numpy as np
+from rclpy.time import Time
+from builtin_interfaces.msg import Time as TimeMsg
+
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+
+
+def random_pose() -> np.ndarray:
+    """Creates a random pose with a unit quaternion.
+
+    Returns:
+        np.ndarray: Pose (x, y, z, qx, qy, qz, qw).
+    """
+    quat = np.random.randn(4)
+    return np.concatenate((np.random.randn(3), quat / np.linalg.norm(quat)))
+
+
+def make_sensor(
+    n_joints: int = 6,
+    n_contacts: int = 2,
+    t: int = 0,
+    stamp: Optional[lfc_py_types.Stamp] = None,
+    joint_names: Optional[Sequence[str]] = None,
+) -> lfc_py_types.Sensor:
+    """Creates a random Sensor.
+
+    Args:
+        n_joints (int, optional): Number of joints, ignored if ``joint_names`` is
+            given. Defaults to 6.
+        n_contacts (int, optional): Number of contacts, named ``contact_{i}`` and
+            active for odd ``t + i``. Defaults to 2.
+        t (int, optional): Index of the sample, e.g. in a sequence. Defaults to 0.
+        stamp (Optional[lfc_py_types.Stamp], optional): Stamp of the Sensor.
+            Defaults to ``t`` seconds.
+        joint_names (Optional[Sequence[str]], optional): Names of the joints.
+            Defaults to ``joint_{i}``.
+
+    Returns:
+        lfc_py_types.Sensor: Sensor filled with random values.
+    """
+    if joint_names is None:
+        joint_names = [f"joint_{i}" for i in range(n_joints)]
+    n_joints = len(joint_names)
+    return lfc_py_types.Sensor(
+        base_pose=random_pose(),
+        base_twist=np.random.rand(6),
+        joint_state=lfc_py_types.JointState(
+            name=list(joint_names),
+            position=np.random.rand(n_joints),
+            velocity=np.random.rand(n_joints),
+            effort=np.random.rand(n_joints),
+        ),
+        contacts=[
+            lfc_py_types.Contact(
+                active=bool((t + i) % 2),
+                name=f"contact_{i}",
+                wrench=np.random.rand(6),
+                pose=random_pose(),
+            )
+            for i in range(n_contacts)
+        ],
+        stamp=Time.from_msg(TimeMsg(sec=t)) if stamp is None else stamp,
+    )
+
+
+def make_control(
+    n_joints: int = 6,
+    n_contacts: int = 2,
+    t: int = 0,
+    stamp: Optional[lfc_py_types.Stamp] = None,
+    joint_names: Optional[Sequence[str]] = None,
+) -> lfc_py_types.Control:
+    """Creates a random Control of a floating base robot, with feedback gain
+    mapping the state of size 2 * (6 + n_joints) to the joint torques.
+
+    Args:
+        n_joints (int, optional): Number of joints. Defaults to 6.
+        n_contacts (int, optional): Number of contacts. Defaults to 2.
+        t (int, optional): Index of the sample. Defaults to 0.
+        stamp (Optional[lfc_py_types.Stamp], optional): Stamp of the Control and
+            of its initial state. Defaults to ``t`` seconds.
+        joint_names (Optional[Sequence[str]], optional): Names of the joints.
+            Defaults to ``joint_{i}``.
+
+    Returns:
+        lfc_py_types.Control: Control filled with random values, see
+        :func:`make_sensor` for the initial state.
+    """
+    initial_state = make_sensor(n_joints, n_contacts, t, stamp, joint_names)
+    n_joints = len(initial_state.joint_state.name)
+    return lfc_py_types.Control(
+        feedback_gain=np.random.rand(n_joints, 2 * (6 + n_joints)),
+        feedforward=np.random.rand(n_joints),
+        initial_state=initial_state,
+        stamp=initial_state.stamp,
+    )
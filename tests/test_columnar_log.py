@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from linear_feedback_controller_msgs_py import columnar_log
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+
+from conftest import make_control
+
+
+def test_check_columnar_log(tmp_path) -> None:
+    n_joints, n_contacts = 6, 2
+    controls = [make_control(n_joints, n_contacts, t) for t in range(20)]
+    sensors = [control.initial_state for control in controls]
+    joint_names = sensors[0].joint_state.name
+    contact_names = [contact.name for contact in sensors[0].contacts]
+
+    with columnar_log.ColumnarLogWriter(
+        str(tmp_path), joint_names, contact_names
+    ) as writer:
+        for sensor in sensors[:10]:
+            writer.append_sensor_msg(npc.sensor_numpy_to_msg(sensor))
+        writer.append_sensor_batch(
+            npc.sensors_msgs_to_numpy_batch(
+                [npc.sensor_numpy_to_msg(sensor) for sensor in sensors[10:]]
+            )
+        )
+        for control in controls:
+            writer.append_control(control)
+
+    log = columnar_log.ColumnarLog(str(tmp_path))
+    assert log.joint_names == joint_names
+    assert log.contact_names == contact_names
+
+    sensor_batch = log.sensor()
+    assert len(sensor_batch) == len(sensors)
+    assert isinstance(sensor_batch.joint_state.position, np.memmap), (
+        "Columnar log fields are not memory mapped!"
+    )
+    np.testing.assert_array_equal(
+        sensor_batch.joint_state.position,
+        np.stack([sensor.joint_state.position for sensor in sensors]),
+        err_msg="Joint positions of the log are not equal initial values!",
+    )
+    np.testing.assert_array_equal(
+        sensor_batch.contact_active,
+        [[contact.active for contact in sensor.contacts] for sensor in sensors],
+        err_msg="Contact activities of the log are not equal initial values!",
+    )
+    np.testing.assert_array_equal(
+        sensor_batch.stamp, [sensor.stamp.nanoseconds for sensor in sensors]
+    )
+
+    control_batch = log.control(start=5 * 10**9, stop=8 * 10**9)
+    assert len(control_batch) == 3, "Time window of the log has a wrong size!"
+    np.testing.assert_array_equal(
+        control_batch.feedback_gain,
+        np.stack([control.feedback_gain for control in controls[5:8]]),
+        err_msg="Feedback gains of the log window are not equal initial values!",
+    )
+    np.testing.assert_array_equal(
+        control_batch.initial_state.contact_pose[2, 1],
+        controls[7].initial_state.contacts[1].pose,
+        err_msg="Contact pose of the log window is not equal initial value!",
+    )
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from linear_feedback_controller_msgs_py import control_law
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+
+from conftest import make_control, make_sensor, random_pose
+
+
+def skew(w: np.ndarray) -> np.ndarray:
+    return np.array([[0.0, -w[2], w[1]], [w[2], 0.0, -w[0]], [-w[1], w[0], 0.0]])
+
+
+def exp6(twist: np.ndarray) -> tuple:
+    """Rotation and translation of exp6 of a twist (linear, angular)."""
+    v, w = twist[:3], twist[3:]
+    theta = np.linalg.norm(w)
+    k = skew(w)
+    rotation = (
+        np.eye(3) + np.sin(theta) / theta * k + (1 - np.cos(theta)) / theta**2 * k @ k
+    )
+    left_jacobian = (
+        np.eye(3)
+        + (1 - np.cos(theta)) / theta**2 * k
+        + (theta - np.sin(theta)) / theta**3 * k @ k
+    )
+    return rotation, left_jacobian @ v
+
+
+def test_check_pose_log6() -> None:
+    reference = random_pose()
+    poses = np.stack([random_pose() for _ in range(20)] + [reference])
+    twists = control_law.pose_log6(poses, reference)
+
+    np.testing.assert_allclose(twists[-1], np.zeros(6), atol=1e-12)
+    rotation0 = control_law._quaternion_to_rotation(reference[3:])
+    for pose, twist in zip(poses[:-1], twists[:-1]):
+        assert np.linalg.norm(twist[3:]) <= np.pi + 1e-12
+        rotation, translation = exp6(twist)
+        np.testing.assert_allclose(
+            rotation0 @ rotation,
+            control_law._quaternion_to_rotation(pose[3:]),
+            atol=1e-9,
+            err_msg="exp6 of log6 does not give back the rotation!",
+        )
+        np.testing.assert_allclose(
+            reference[:3] + rotation0 @ translation,
+            pose[:3],
+            atol=1e-9,
+            err_msg="exp6 of log6 does not give back the translation!",
+        )
+
+    # Small rotations use the series expansion.
+    pose = reference.copy()
+    pose[:3] += 1e-3
+    np.testing.assert_allclose(
+        control_law.pose_log6(pose[np.newaxis], reference)[0, :3],
+        rotation0.T @ np.full(3, 1e-3),
+        atol=1e-12,
+    )
+
+
+def test_check_linear_feedback_law() -> None:
+    joint_names = [f"joint_{i}" for i in range(6)]
+    control = make_control(n_contacts=0, joint_names=joint_names)
+    sensors = [make_sensor(n_contacts=0, joint_names=joint_names) for _ in range(10)]
+    law = control_law.LinearFeedbackLaw(control)
+    assert law.free_flyer
+
+    np.testing.assert_allclose(
+        law(control.initial_state),
+        control.feedforward,
+        atol=1e-12,
+        err_msg="Torque at the initial state is not the feedforward!",
+    )
+
+    torques = law(sensors)
+    assert torques.shape == (10, 6)
+    for sensor, torque in zip(sensors, torques):
+        x0 = control.initial_state
+        dx = np.concatenate(
+            (
+                control_law.pose_log6(sensor.base_pose[np.newaxis], x0.base_pose)[0],
+                sensor.joint_state.position - x0.joint_state.position,
+                sensor.base_twist - x0.base_twist,
+                sensor.joint_state.velocity - x0.joint_state.velocity,
+            )
+        )
+        np.testing.assert_allclose(
+            torque,
+            control.feedforward + control.feedback_gain @ dx,
+            err_msg="Batched torques are not equal the feedback law per sample!",
+        )
+        np.testing.assert_allclose(law(sensor), torque)
+
+    batch = lfc_py_types.SensorBatch(
+        base_pose=np.stack([sensor.base_pose for sensor in sensors]),
+        base_twist=np.stack([sensor.base_twist for sensor in sensors]),
+        joint_state=lfc_py_types.JointState(
+            name=joint_names[::-1],
+            position=np.stack([s.joint_state.position[::-1] for s in sensors]),
+            velocity=np.stack([s.joint_state.velocity[::-1] for s in sensors]),
+            effort=np.stack([s.joint_state.effort[::-1] for s in sensors]),
+        ),
+        contact_names=[],
+        contact_active=np.zeros((10, 0), dtype=np.bool_),
+        contact_wrench=np.zeros((10, 0, 6)),
+        contact_pose=np.zeros((10, 0, 7)),
+        stamp=np.zeros(10, dtype=np.int64),
+    )
+    np.testing.assert_allclose(
+        law(batch),
+        torques,
+        err_msg="Torques of reordered joints are not equal initial torques!",
+    )
+
+    fixed_base = control_law.LinearFeedbackLaw(
+        lfc_py_types.Control(
+            feedback_gain=control.feedback_gain[:, :12],
+            feedforward=control.feedforward,
+            initial_state=control.initial_state,
+        )
+    )
+    assert not fixed_base.free_flyer
+    sensor = sensors[0]
+    np.testing.assert_allclose(
+        fixed_base(sensor),
+        control.feedforward
+        + control.feedback_gain[:, :12]
+        @ np.concatenate(
+            (
+                sensor.joint_state.position
+                - control.initial_state.joint_state.position,
+                sensor.joint_state.velocity
+                - control.initial_state.joint_state.velocity,
+            )
+        ),
+    )
@@ -36,6 +36,24 @@ TEST_F(LinearFeedbackControllerMsgsTest, checkRosEigenMatrixConversion) {
   ASSERT_EQ(eigen_mat, eigen_mat_test);
 }
 
+TEST_F(LinearFeedbackControllerMsgsTest, checkRosEigenMatrixShapeChange) {
+  std_msgs::msg::Float64MultiArray ros_mat;
+  for (const auto& [rows, cols] : {std::pair{5, 6}, {5, 6}, {3, 2}, {8, 1}}) {
+    Eigen::MatrixXd eigen_mat = Eigen::MatrixXd::Random(rows, cols);
+    Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>
+        eigen_mat_test = Eigen::MatrixXd::Zero(rows, cols);
+
+    lfc_msgs::matrixEigenToMsg(eigen_mat, ros_mat);
+    ASSERT_EQ(ros_mat.layout.dim[0].size, rows);
+    ASSERT_EQ(ros_mat.layout.dim[1].size, cols);
+    ASSERT_EQ(ros_mat.data.size(), eigen_mat.size());
+    ASSERT_EQ(ros_mat.data[1], cols > 1 ? eigen_mat(0, 1) : eigen_mat(1, 0));
+
+    lfc_msgs::matrixMsgToEigen(ros_mat, eigen_mat_test);
+    ASSERT_EQ(eigen_mat, eigen_mat_test);
+  }
+}
+
 TEST_F(LinearFeedbackControllerMsgsTest, checkRosEigenJointStateConversion) {
   lfc_msgs::Eigen::JointState eigen_joint_state;
   sensor_msgs::msg::JointState ros_joint_state;
@@ -154,3 +172,155 @@ TEST_F(LinearFeedbackControllerMsgsTest, checkRosEigenControlConversion) {
   ASSERT_EQ(e.feedback_gain, etest.feedback_gain);
   ASSERT_EQ(e.feedforward, etest.feedforward);
 }
+
+TEST_F(LinearFeedbackControllerMsgsTest, checkRosEigenControlView) {
+  lfc_msgs::Eigen::Control e;
+  lfc_msgs::msg::Control m;
+
+  e.feedback_gain = Eigen::MatrixXd::Random(8, 4);
+  e.feedforward = Eigen::VectorXd::Random(8);
+  e.stamp = rclcpp::Time(123456789);
+  lfc_msgs::controlEigenToMsg(e, m);
+
+  const auto view = lfc_msgs::controlMsgToEigenView(m);
+
+  ASSERT_EQ(e.feedback_gain, view.feedback_gain);
+  ASSERT_EQ(e.feedforward, view.feedforward);
+  ASSERT_EQ(e.stamp, view.stamp);
+  ASSERT_EQ(view.feedback_gain.data(), m.feedback_gain.data.data());
+  ASSERT_EQ(view.feedforward.data(), m.feedforward.data.data());
+}
+
+TEST_F(LinearFeedbackControllerMsgsTest, checkRosEigenMatrixDeltaConversion) {
+  std_msgs::msg::Float64MultiArray ros_mat;
+  Eigen::MatrixXd eigen_mat = Eigen::MatrixXd::Random(5, 6);
+  Eigen::MatrixXd eigen_mat_test;
+
+  lfc_msgs::matrixEigenToMsg(eigen_mat, ros_mat);
+  ASSERT_TRUE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, eigen_mat_test));
+  ASSERT_EQ(eigen_mat, eigen_mat_test);
+
+  // Reuse flag.
+  ros_mat.layout.dim[0].label = lfc_msgs::kMatrixReuseLabel;
+  ros_mat.layout.dim[0].stride = 0;
+  ros_mat.data.clear();
+  ASSERT_TRUE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, eigen_mat_test));
+  ASSERT_EQ(eigen_mat, eigen_mat_test);
+
+  // Rank one update a * b.
+  const Eigen::VectorXd a = Eigen::VectorXd::Random(5);
+  const Eigen::RowVectorXd b = Eigen::RowVectorXd::Random(6);
+  ros_mat.layout.dim[0].label = lfc_msgs::kMatrixLowRankLabel;
+  ros_mat.layout.dim.resize(3);
+  ros_mat.layout.dim[2].label = "rank";
+  ros_mat.layout.dim[2].size = 1;
+  ros_mat.layout.dim[2].stride = 1;
+  ros_mat.data.assign(a.data(), a.data() + a.size());
+  ros_mat.data.insert(ros_mat.data.end(), b.data(), b.data() + b.size());
+  ASSERT_TRUE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, eigen_mat_test));
+  ASSERT_TRUE(eigen_mat_test.isApprox(eigen_mat + a * b));
+
+  // Updates of another shape are rejected.
+  Eigen::MatrixXd other_mat = Eigen::MatrixXd::Zero(3, 2);
+  ASSERT_FALSE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, other_mat));
+  ASSERT_EQ(other_mat, Eigen::MatrixXd::Zero(3, 2));
+
+  // Malformed low-rank updates are rejected, e is left unchanged.
+  const Eigen::MatrixXd updated_mat = eigen_mat_test;
+  ros_mat.layout.dim[2].size = 2;
+  ASSERT_FALSE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, eigen_mat_test));
+  ros_mat.layout.dim[2].size = 1;
+  ros_mat.data.pop_back();
+  ASSERT_FALSE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, eigen_mat_test));
+  ros_mat.layout.dim.resize(2);
+  ASSERT_FALSE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, eigen_mat_test));
+  ASSERT_EQ(eigen_mat_test, updated_mat);
+
+  // Full matrices rewrite the layout of a message holding an update.
+  lfc_msgs::matrixEigenToMsg(eigen_mat, ros_mat);
+  ASSERT_EQ(ros_mat.layout.dim.size(), 2);
+  ASSERT_EQ(ros_mat.layout.dim[0].label, "rows");
+  ASSERT_TRUE(lfc_msgs::matrixDeltaMsgToEigen(ros_mat, eigen_mat_test));
+  ASSERT_EQ(eigen_mat, eigen_mat_test);
+}
+
+TEST_F(LinearFeedbackControllerMsgsTest, checkRosEigenMatrixCompactConversion) {
+  std_msgs::msg::Float64MultiArray ros_mat;
+  Eigen::MatrixXd eigen_mat = Eigen::MatrixXd::Random(12, 37) * 100.0;
+  eigen_mat.row(3).setZero();
+  Eigen::MatrixXd eigen_mat_test;
+
+  lfc_msgs::matrixEigenToCompactMsg(eigen_mat, ros_mat,
+                                    lfc_msgs::MatrixEncoding::kFloat32);
+  ASSERT_EQ(ros_mat.layout.dim[0].label, lfc_msgs::kMatrixFloat32Label);
+  ASSERT_EQ(ros_mat.data.size(), (eigen_mat.size() + 1) / 2);
+  lfc_msgs::matrixCompactMsgToEigen(ros_mat, eigen_mat_test);
+  ASSERT_EQ(eigen_mat.cast<float>().cast<double>(), eigen_mat_test);
+
+  lfc_msgs::matrixEigenToCompactMsg(eigen_mat, ros_mat,
+                                    lfc_msgs::MatrixEncoding::kInt16);
+  ASSERT_EQ(ros_mat.layout.dim[0].label, lfc_msgs::kMatrixInt16Label);
+  ASSERT_EQ(ros_mat.data.size(), 12 + (eigen_mat.size() + 3) / 4);
+  lfc_msgs::matrixCompactMsgToEigen(ros_mat, eigen_mat_test);
+  for (Eigen::Index i = 0; i < eigen_mat.rows(); ++i) {
+    const double scale = eigen_mat.row(i).cwiseAbs().maxCoeff() / 32767.0;
+    ASSERT_LE((eigen_mat_test.row(i) - eigen_mat.row(i)).cwiseAbs().maxCoeff(),
+              scale / 2 * (1 + 1e-9));
+  }
+  ASSERT_TRUE(eigen_mat_test.row(3).isZero(0.0));
+
+  // Full precision matrices rewrite the layout of a compact message.
+  lfc_msgs::matrixEigenToCompactMsg(eigen_mat, ros_mat,
+                                    lfc_msgs::MatrixEncoding::kFloat64);
+  ASSERT_EQ(ros_mat.layout.dim[0].label, "rows");
+  lfc_msgs::matrixCompactMsgToEigen(ros_mat, eigen_mat_test);
+  ASSERT_EQ(eigen_mat, eigen_mat_test);
+}
+
+TEST_F(LinearFeedbackControllerMsgsTest, checkStateVectorConversion) {
+  lfc_msgs::Eigen::Sensor e;
+  lfc_msgs::msg::Sensor m;
+  lfc_msgs::Eigen::Sensor etest;
+
+  e.base_pose = Eigen::Matrix<double, 7, 1>::Random();
+  e.base_twist = Eigen::Matrix<double, 6, 1>::Random();
+  e.joint_state.name = {"1", "2", "3", "4", "5", "6"};
+  e.joint_state.position = Eigen::VectorXd::Random(6);
+  e.joint_state.velocity = Eigen::VectorXd::Random(6);
+  e.joint_state.effort = Eigen::VectorXd::Random(6);
+  e.contacts.resize(1);
+  e.contacts[0].name = "left_foot";
+
+  const lfc_msgs::Eigen::StateLayout layout =
+      lfc_msgs::stateLayoutFromSensor(e);
+  ASSERT_EQ(layout.nq(), 7 + 6);
+  ASSERT_EQ(layout.nv(), 6 + 6);
+  ASSERT_EQ(layout.contact_names, std::vector<std::string>{"left_foot"});
+
+  Eigen::VectorXd x(layout.size());
+  lfc_msgs::sensorToStateVector(layout, e, x);
+  ASSERT_EQ(x.head<7>(), e.base_pose);
+  ASSERT_EQ(x.segment(7, 6), e.joint_state.position);
+  ASSERT_EQ(x.segment(13, 6), e.base_twist);
+  ASSERT_EQ(x.tail(6), e.joint_state.velocity);
+
+  lfc_msgs::sensorEigenToMsg(e, m);
+  Eigen::VectorXd xtest(layout.size());
+  lfc_msgs::sensorMsgToStateVector(layout, m, xtest);
+  ASSERT_EQ(x, xtest);
+
+  lfc_msgs::stateVectorToSensor(layout, x, etest);
+  ASSERT_EQ(e.base_pose, etest.base_pose);
+  ASSERT_EQ(e.base_twist, etest.base_twist);
+  ASSERT_EQ(e.joint_state.name, etest.joint_state.name);
+  ASSERT_EQ(e.joint_state.position, etest.joint_state.position);
+  ASSERT_EQ(e.joint_state.velocity, etest.joint_state.velocity);
+
+  const lfc_msgs::Eigen::StateLayout fixed_base =
+      lfc_msgs::stateLayoutFromSensor(e, false);
+  Eigen::VectorXd x_fixed(fixed_base.size());
+  lfc_msgs::sensorToStateVector(fixed_base, e, x_fixed);
+  ASSERT_EQ(x_fixed.size(), 12);
+  ASSERT_EQ(x_fixed.head(6), e.joint_state.position);
+  ASSERT_EQ(x_fixed.tail(6), e.joint_state.velocity);
+}
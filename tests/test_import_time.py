@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+import os
+import subprocess
+import sys
+
+# Modules that must only be imported once a converter is called.
+ROS_PACKAGES = (
+    "rclpy",
+    "builtin_interfaces",
+    "std_msgs",
+    "geometry_msgs",
+    "sensor_msgs",
+    "linear_feedback_controller_msgs",
+)
+# Sum of the self import times of the modules of this package, numpy excluded.
+IMPORT_BUDGET_US = 50_000
+
+
+def run_python(code: str, tmp_path, *options: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    # Bytecode is cached out of the source tree so that imports are not compiled.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPYCACHEPREFIX"] = str(tmp_path)
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_times(module: str, tmp_path) -> dict:
+    code = f"import {module}"
+    run_python(code, tmp_path)
+    stderr = run_python(code, tmp_path, "-X", "importtime").stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def test_check_numpy_conversions_import_time(tmp_path) -> None:
+    times = import_times(
+        "linear_feedback_controller_msgs_py.numpy_conversions", tmp_path
+    )
+    assert "linear_feedback_controller_msgs_py.numpy_conversions" in times
+
+    imported_ros = [
+        name
+        for name in times
+        if any(name == pkg or name.startswith(pkg + ".") for pkg in ROS_PACKAGES)
+    ]
+    assert imported_ros == [], f"ROS modules '{imported_ros}' are imported eagerly!"
+
+    package_us = sum(
+        us
+        for name, us in times.items()
+        if name.startswith("linear_feedback_controller_msgs_py")
+    )
+    assert package_us <= IMPORT_BUDGET_US, (
+        f"Import takes '{package_us}' us, budget is '{IMPORT_BUDGET_US}' us!"
+    )
+
+
+def test_check_lfc_py_types_without_rclpy(tmp_path) -> None:
+    code = """
+import pickle
+import sys
+
+import numpy as np
+
+# Any import of rclpy fails.
+sys.modules["rclpy"] = None
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+
+sensor = lfc_py_types.Sensor(
+    base_pose=np.random.rand(7),
+    base_twist=np.random.rand(6),
+    joint_state=lfc_py_types.JointState(
+        name=["1", "2"],
+        position=np.random.rand(2),
+        velocity=np.random.rand(2),
+        effort=np.random.rand(2),
+    ),
+    contacts=[],
+    stamp=42,
+)
+copy = pickle.loads(pickle.dumps(sensor))
+np.testing.assert_array_equal(copy.base_pose, sensor.base_pose)
+assert copy.stamp == 42
+packed = pickle.loads(pickle.dumps(lfc_py_types.PackedSensor.from_sensor(sensor)))
+np.testing.assert_array_equal(packed.buffer[:7], sensor.base_pose)
+assert packed.stamp == 42
+
+import linear_feedback_controller_msgs_py.shm_transport as shm_transport
+
+out = np.zeros(4096, dtype=np.uint8)
+size = shm_transport.encode_sensor_into(sensor, out)
+decoded = shm_transport.decode_record(
+    out[:size], sensor.joint_state.name, [], stamp_as_nanoseconds=True
+)
+assert decoded.stamp == 42
+"""
+    run_python(code, tmp_path)
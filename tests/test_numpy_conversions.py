@@ -1,13 +1,21 @@
 #!/usr/bin/env python
 
+import os
+import pickle
+
 import numpy as np
+import pytest
 from copy import deepcopy
+from typing import List
+from rclpy.serialization import serialize_message
 from rclpy.time import Time
 from builtin_interfaces.msg import Time as TimeMsg
 
 from linear_feedback_controller_msgs_py import numpy_conversions as npc
 import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
 
+from conftest import make_control, make_sensor
+
 
 def test_check_numpy_constructors() -> None:
     joint_state = lfc_py_types.JointState(
@@ -83,6 +91,30 @@ def test_check_ros_numpy_matrix_conversion() -> None:
         )
 
 
+def test_check_ros_numpy_matrix_conversion_without_copy() -> None:
+    numpy_random_matrix = np.random.rand(5, 6)
+
+    ros_matrix = npc.matrix_numpy_to_msg(np.asfortranarray(numpy_random_matrix))
+
+    np.testing.assert_array_equal(
+        np.array(ros_matrix.data),
+        numpy_random_matrix.reshape(-1),
+        err_msg="Message data is not stored in a row-major order!",
+    )
+
+    numpy_view = npc.matrix_msg_to_numpy(ros_matrix, copy=False)
+
+    np.testing.assert_array_equal(
+        numpy_view,
+        numpy_random_matrix,
+        err_msg="Matrix view over the message is not equal the initial matrix!",
+    )
+    assert not numpy_view.flags.writeable, "Matrix view over the message is writable!"
+    assert np.shares_memory(numpy_view, np.frombuffer(ros_matrix.data)), (
+        "Matrix view does not share memory with the message!"
+    )
+
+
 def test_check_ros_numpy_joint_state_conversion() -> None:
     numpy_joint_state = lfc_py_types.JointState(
         name=["1", "2", "3", "4", "5", "6"],
@@ -318,3 +350,812 @@ def test_check_ros_numpy_sensor_conversions() -> None:
             c2.pose,
             err_msg=f"Pose parameter before and after conversion differs at index '{i}'",
         )
+
+
+def test_check_ros_numpy_sensor_batch_conversion() -> None:
+    numpy_sensors = [
+        make_sensor(
+            6,
+            2,
+            t,
+            stamp=Time.from_msg(TimeMsg(sec=t, nanosec=np.random.randint(0, 10**9))),
+        )
+        for t in range(5)
+    ]
+    joint_names = numpy_sensors[0].joint_state.name
+    contact_names = [contact.name for contact in numpy_sensors[0].contacts]
+    ros_sensors = [npc.sensor_numpy_to_msg(sensor) for sensor in numpy_sensors]
+
+    batch = npc.sensors_msgs_to_numpy_batch(ros_sensors)
+
+    assert len(batch) == len(numpy_sensors), (
+        "Batch length is not equal number of messages!"
+    )
+    assert batch.joint_state.name == joint_names, "Batch joint names are wrong!"
+    assert batch.contact_names == contact_names, "Batch contact names are wrong!"
+    np.testing.assert_array_equal(
+        batch.base_pose,
+        np.stack([sensor.base_pose for sensor in numpy_sensors]),
+        err_msg="Batch base pose is not equal stacked values!",
+    )
+    np.testing.assert_array_equal(
+        batch.base_twist,
+        np.stack([sensor.base_twist for sensor in numpy_sensors]),
+        err_msg="Batch base twist is not equal stacked values!",
+    )
+    for field in ("position", "velocity", "effort"):
+        np.testing.assert_array_equal(
+            getattr(batch.joint_state, field),
+            np.stack([getattr(sensor.joint_state, field) for sensor in numpy_sensors]),
+            err_msg=f"Batch joint {field} is not equal stacked values!",
+        )
+    np.testing.assert_array_equal(
+        batch.contact_active,
+        [[contact.active for contact in sensor.contacts] for sensor in numpy_sensors],
+        err_msg="Batch contact active flags are not equal stacked values!",
+    )
+    np.testing.assert_array_equal(
+        batch.contact_wrench,
+        [[contact.wrench for contact in sensor.contacts] for sensor in numpy_sensors],
+        err_msg="Batch contact wrench is not equal stacked values!",
+    )
+    np.testing.assert_array_equal(
+        batch.contact_pose,
+        [[contact.pose for contact in sensor.contacts] for sensor in numpy_sensors],
+        err_msg="Batch contact pose is not equal stacked values!",
+    )
+    np.testing.assert_array_equal(
+        batch.stamp,
+        [sensor.stamp.nanoseconds for sensor in numpy_sensors],
+        err_msg="Batch stamps are not equal stacked values!",
+    )
+
+    assert npc.sensors_numpy_batch_to_msgs(batch) == ros_sensors, (
+        "Messages after conversion back to ROS are not equal initial messages!"
+    )
+
+
+def test_check_ros_numpy_sensor_batch_round_trip() -> None:
+    n_samples, n_joints, n_contacts = 4, 3, 2
+    effort = np.random.rand(n_samples, n_joints)
+    effort[1] = np.nan
+    batch = lfc_py_types.SensorBatch(
+        base_pose=np.random.rand(n_samples, 7),
+        base_twist=np.random.rand(n_samples, 6),
+        joint_state=lfc_py_types.JointState(
+            name=["a", "b", "c"],
+            position=np.random.rand(n_samples, n_joints),
+            velocity=np.random.rand(n_samples, n_joints),
+            effort=effort,
+        ),
+        contact_names=["left_foot", "right_foot"],
+        contact_active=np.random.rand(n_samples, n_contacts) > 0.5,
+        contact_wrench=np.random.rand(n_samples, n_contacts, 6),
+        contact_pose=np.random.rand(n_samples, n_contacts, 7),
+        stamp=np.array([0, 42, 10**9 + 1, 5 * 10**9], dtype=np.int64),
+    )
+
+    msgs = npc.sensors_numpy_batch_to_msgs(batch)
+
+    assert len(msgs) == n_samples, "Number of messages is not equal batch length!"
+    assert len(msgs[1].joint_state.effort) == 0, (
+        "All-NaN efforts are not converted to empty efforts!"
+    )
+    assert len(msgs[0].joint_state.effort) == n_joints
+    assert (msgs[2].header.stamp.sec, msgs[2].header.stamp.nanosec) == (1, 1)
+
+    round_trip = npc.sensors_msgs_to_numpy_batch(msgs)
+
+    assert round_trip.joint_state.name == batch.joint_state.name
+    assert round_trip.contact_names == batch.contact_names
+    for field in (
+        "base_pose",
+        "base_twist",
+        "contact_active",
+        "contact_wrench",
+        "contact_pose",
+        "stamp",
+    ):
+        np.testing.assert_array_equal(
+            getattr(round_trip, field),
+            getattr(batch, field),
+            err_msg=f"Batch {field} differs after round trip!",
+        )
+    for field in ("position", "velocity", "effort"):
+        np.testing.assert_array_equal(
+            getattr(round_trip.joint_state, field),
+            getattr(batch.joint_state, field),
+            err_msg=f"Batch joint {field} differs after round trip!",
+        )
+
+    assert npc.sensors_numpy_batch_to_msgs(round_trip) == msgs, (
+        "Messages with empty efforts differ after round trip!"
+    )
+
+
+def test_check_ros_numpy_conversion_into() -> None:
+    numpy_control = make_control(6, 1, t=np.random.randint(0, 100))
+    ros_control_msg = npc.control_numpy_to_msg(numpy_control)
+
+    out = npc.control_msg_to_numpy(ros_control_msg)
+    out.feedback_gain[:] = 0.0
+    out.initial_state.contacts.clear()
+    buffers = (
+        out.feedback_gain,
+        out.feedforward,
+        out.initial_state.base_pose,
+        out.initial_state.base_twist,
+        out.initial_state.joint_state.position,
+    )
+
+    assert npc.control_msg_to_numpy_into(ros_control_msg, out) is out, (
+        "Conversion into existing Control did not return the output object!"
+    )
+    for before, after in zip(
+        buffers,
+        (
+            out.feedback_gain,
+            out.feedforward,
+            out.initial_state.base_pose,
+            out.initial_state.base_twist,
+            out.initial_state.joint_state.position,
+        ),
+    ):
+        assert before is after, "Conversion into existing Control reallocated arrays!"
+
+    np.testing.assert_array_equal(
+        numpy_control.feedback_gain,
+        out.feedback_gain,
+        err_msg="Feedback gains after conversion into existing Control are wrong!",
+    )
+    np.testing.assert_array_equal(
+        numpy_control.feedforward,
+        out.feedforward,
+        err_msg="Feed forward after conversion into existing Control is wrong!",
+    )
+    np.testing.assert_array_equal(
+        numpy_control.initial_state.base_pose,
+        out.initial_state.base_pose,
+        err_msg="Base pose after conversion into existing Control is wrong!",
+    )
+    np.testing.assert_array_equal(
+        numpy_control.initial_state.joint_state.position,
+        out.initial_state.joint_state.position,
+        err_msg="Joint positions after conversion into existing Control are wrong!",
+    )
+    assert len(out.initial_state.contacts) == 1, "Contacts were not resized!"
+    np.testing.assert_array_equal(
+        numpy_control.initial_state.contacts[0].wrench,
+        out.initial_state.contacts[0].wrench,
+        err_msg="Contact wrench after conversion into existing Control is wrong!",
+    )
+    assert out.stamp == numpy_control.stamp, "Control stamp conversion failed."
+
+
+def test_check_packed_sensor() -> None:
+    numpy_sensor = make_sensor(6, 2, t=np.random.randint(0, 100))
+
+    packed_sensor = lfc_py_types.PackedSensor.from_sensor(numpy_sensor)
+
+    assert packed_sensor.buffer.shape == (lfc_py_types.packed_sensor_size(6, 2),), (
+        "Packed sensor buffer has a wrong size!"
+    )
+    for view in (
+        packed_sensor.base_pose,
+        packed_sensor.base_twist,
+        packed_sensor.joint_state.position,
+        packed_sensor.joint_state.velocity,
+        packed_sensor.joint_state.effort,
+        packed_sensor.contacts[1].wrench,
+        packed_sensor.contacts[1].pose,
+    ):
+        assert np.shares_memory(view, packed_sensor.buffer), (
+            "Packed sensor field is not a view into the buffer!"
+        )
+
+    for copied_sensor in (
+        packed_sensor.to_sensor(),
+        packed_sensor.copy(),
+        pickle.loads(pickle.dumps(packed_sensor, protocol=5)),
+    ):
+        np.testing.assert_array_equal(
+            numpy_sensor.base_pose,
+            copied_sensor.base_pose,
+            err_msg="Base pose of packed sensor is not equal initial values!",
+        )
+        np.testing.assert_array_equal(
+            numpy_sensor.joint_state.velocity,
+            copied_sensor.joint_state.velocity,
+            err_msg="Joint velocities of packed sensor are not equal initial values!",
+        )
+        assert numpy_sensor.joint_state.name == copied_sensor.joint_state.name, (
+            "Joint names of packed sensor are not equal initial values!"
+        )
+        for c1, c2 in zip(numpy_sensor.contacts, copied_sensor.contacts, strict=True):
+            assert c1.active == c2.active and c1.name == c2.name, (
+                "Contact of packed sensor is not equal initial values!"
+            )
+            np.testing.assert_array_equal(
+                c1.pose,
+                c2.pose,
+                err_msg="Contact pose of packed sensor is not equal initial values!",
+            )
+        assert numpy_sensor.stamp == copied_sensor.stamp, (
+            "Packed sensor stamp conversion failed."
+        )
+
+    packed_sensor.base_twist = np.zeros(6)
+    np.testing.assert_array_equal(
+        packed_sensor.buffer[7:13],
+        np.zeros(6),
+        err_msg="Assigning base twist did not write into the buffer!",
+    )
+
+
+def test_check_numpy_input_validation() -> None:
+    pose = np.random.rand(7)
+
+    with pytest.raises(AssertionError):
+        npc.pose_numpy_to_msg(pose[:6])
+    with pytest.raises(AssertionError):
+        npc.twist_numpy_to_msg(np.random.rand(2, 3))
+
+    validated_msg = npc.pose_numpy_to_msg(pose)
+    npc.set_input_validation(False)
+    try:
+        unchecked_msg = npc.pose_numpy_to_msg(pose)
+    finally:
+        npc.set_input_validation(True)
+
+    assert validated_msg == unchecked_msg, (
+        "Unchecked conversion differs from the validated one!"
+    )
+
+
+def test_check_ros_numpy_joint_state_reordered_conversion() -> None:
+    numpy_joint_state = lfc_py_types.JointState(
+        name=["a", "b", "c", "d"],
+        position=np.random.rand(4),
+        velocity=np.random.rand(4),
+        effort=np.random.rand(4),
+    )
+    ros_joint_state = npc.joint_state_numpy_to_msg(numpy_joint_state)
+    permutation = npc.JointPermutation(["d", "b", "a"])
+
+    reordered = npc.joint_state_msg_to_numpy_reordered(ros_joint_state, permutation)
+
+    assert reordered.name == ["d", "b", "a"]
+    for field in ("position", "velocity", "effort"):
+        np.testing.assert_array_equal(
+            getattr(reordered, field),
+            getattr(numpy_joint_state, field)[[3, 1, 0]],
+            err_msg=f"Reordered joint {field} is not equal initial values!",
+        )
+
+    indices = permutation.indices(ros_joint_state.name)
+    assert permutation.indices(list(ros_joint_state.name)) is indices, (
+        "Permutation was recomputed for unchanged joint names!"
+    )
+    np.testing.assert_array_equal(
+        permutation.indices(["b", "a", "d"]),
+        [2, 0, 1],
+        err_msg="Permutation was not updated for new joint names!",
+    )
+    names = ["a", "b", "c", "d"]
+    np.testing.assert_array_equal(permutation.indices(names), [3, 1, 0])
+    names[:] = ["d", "c", "b", "a"]
+    np.testing.assert_array_equal(
+        permutation.indices(names),
+        [0, 2, 3],
+        err_msg="Permutation was not updated for joint names modified in place!",
+    )
+    with pytest.raises(AssertionError):
+        permutation.indices(["a", "b"])
+
+
+def test_check_ros_numpy_contact_table_conversion() -> None:
+    contacts = [
+        lfc_py_types.Contact(
+            active=active,
+            name=name,
+            wrench=np.random.rand(6),
+            pose=np.random.rand(7),
+        )
+        for name, active in (("left_foot", True), ("right_foot", False), ("hand", True))
+    ]
+    ros_contacts = [npc.contact_numpy_to_msg(contact) for contact in contacts]
+
+    table = npc.contact_table_msg_to_numpy(ros_contacts)
+
+    assert table.names == ["left_foot", "right_foot", "hand"]
+    assert table.slots["hand"] == 2
+    np.testing.assert_array_equal(table.active, [True, False, True])
+    np.testing.assert_array_equal(
+        table.wrench,
+        np.stack([contact.wrench for contact in contacts]),
+        err_msg="Contact table wrenches are not equal initial values!",
+    )
+    np.testing.assert_array_equal(
+        table.pose,
+        np.stack([contact.pose for contact in contacts]),
+        err_msg="Contact table poses are not equal initial values!",
+    )
+
+    # Contacts are written in the slots of their names, missing ones are inactive.
+    npc.contact_table_msg_to_numpy(ros_contacts[2:0:-1], table)
+    np.testing.assert_array_equal(table.active, [False, False, True])
+    np.testing.assert_array_equal(table.wrench[1], contacts[1].wrench)
+
+    for back_converted in (
+        npc.contact_table_numpy_to_msg(table),
+        [npc.contact_numpy_to_msg(c) for c in table.to_contacts()],
+    ):
+        assert [c.name for c in back_converted] == table.names
+        assert [c.active for c in back_converted] == [False, False, True]
+        assert back_converted[2] == ros_contacts[2], (
+            "Contact after conversion back to ROS is not equal initial values!"
+        )
+
+    table = lfc_py_types.ContactTable.from_contacts(contacts)
+    np.testing.assert_array_equal(table.pose[1], contacts[1].pose)
+
+
+def test_check_ros_numpy_matrix_delta_conversion() -> None:
+    encoder = npc.MatrixDeltaEncoder(atol=1e-9, max_rank=2, keyframe_interval=3)
+    gain = np.random.rand(12, 36)
+    decoded = np.zeros((1, 1))
+
+    def encode_decode(matrix: np.ndarray):
+        nonlocal decoded
+        msg = encoder.encode(matrix)
+        decoded = npc.matrix_delta_msg_to_numpy_into(msg, decoded)
+        np.testing.assert_allclose(
+            decoded,
+            matrix,
+            atol=1e-9,
+            err_msg="Matrix decoded from the update is not equal the encoded one!",
+        )
+        return msg.layout.dim[0].label, len(msg.data)
+
+    assert encode_decode(gain) == ("rows", gain.size), "First matrix is not full!"
+    assert encode_decode(gain.copy()) == (npc.MATRIX_REUSE_LABEL, 0)
+
+    gain = gain + np.outer(np.random.rand(12), np.random.rand(36))
+    assert encode_decode(gain) == (npc.MATRIX_LOW_RANK_LABEL, 12 + 36), (
+        "Rank one update is not encoded as a low-rank update!"
+    )
+    # Keyframe after 3 updates.
+    assert encode_decode(gain)[0] == npc.MATRIX_REUSE_LABEL
+    assert encode_decode(gain)[0] == "rows", "Keyframe is not a full matrix!"
+
+    gain = np.random.rand(12, 36)
+    assert encode_decode(gain)[0] == "rows", "Full rank update is not sent in full!"
+    gain = np.random.rand(6, 24)
+    assert encode_decode(gain)[0] == "rows", "Shape change is not sent in full!"
+
+    control = lfc_py_types.Control(
+        feedback_gain=gain + np.outer(np.random.rand(6), np.random.rand(24)),
+        feedforward=np.random.rand(6),
+        initial_state=npc.sensor_msg_to_numpy(
+            npc.sensor_numpy_to_msg(make_sensor(6, 0))
+        ),
+        stamp=Time.from_msg(TimeMsg(sec=3)),
+    )
+    out = npc.control_msg_to_numpy(npc.control_numpy_to_msg(control))
+    out.feedback_gain = decoded.copy()
+    msg = npc.control_numpy_to_msg_incremental(control, encoder)
+    assert msg.feedback_gain.layout.dim[0].label == npc.MATRIX_LOW_RANK_LABEL
+    npc.control_delta_msg_to_numpy_into(msg, out)
+    np.testing.assert_allclose(out.feedback_gain, control.feedback_gain, atol=1e-9)
+    np.testing.assert_array_equal(out.feedforward, control.feedforward)
+    assert out.stamp.nanoseconds == control.stamp.nanoseconds
+
+
+def test_check_ros_numpy_matrix_compact_conversion() -> None:
+    gain = np.random.randn(12, 37) * np.logspace(-3, 3, 12)[:, np.newaxis]
+    gain[3] = 0.0
+    full = npc.matrix_numpy_to_msg(gain)
+
+    msg = npc.matrix_numpy_to_msg_compact(gain, "float32")
+    assert len(msg.data) == (gain.size + 1) // 2, "Float32 payload is not halved!"
+    np.testing.assert_allclose(
+        npc.matrix_compact_msg_to_numpy(msg),
+        gain,
+        rtol=2.0**-24,
+        err_msg="Float32 matrix is not equal the initial matrix up to rounding!",
+    )
+
+    msg = npc.matrix_numpy_to_msg_compact(gain, "int16")
+    assert len(msg.data) == gain.shape[0] + (gain.size + 3) // 4
+    assert len(msg.data) < len(full.data) / 3, "Int16 payload is not quartered!"
+    scale = np.max(np.abs(gain), axis=1) / 32767.0
+    error = np.abs(npc.matrix_compact_msg_to_numpy(msg) - gain)
+    assert np.all(error <= scale[:, np.newaxis] / 2 * (1 + 1e-9)), (
+        "Int16 matrix error exceeds half of the scale of its row!"
+    )
+    assert np.all(npc.matrix_compact_msg_to_numpy(msg)[3] == 0.0)
+
+    np.testing.assert_array_equal(
+        npc.matrix_compact_msg_to_numpy(
+            npc.matrix_numpy_to_msg_compact(gain, "float64")
+        ),
+        gain,
+    )
+    np.testing.assert_array_equal(npc.matrix_compact_msg_to_numpy(full), gain)
+    with pytest.raises(ValueError):
+        npc.matrix_numpy_to_msg_compact(gain, "float16")
+
+    control = lfc_py_types.Control(
+        feedback_gain=gain,
+        feedforward=np.random.rand(12),
+        initial_state=npc.sensor_msg_to_numpy(
+            npc.sensor_numpy_to_msg(make_sensor(12, 0))
+        ),
+        stamp=Time.from_msg(TimeMsg(sec=3)),
+    )
+    out = npc.control_compact_msg_to_numpy(npc.control_numpy_to_msg_compact(control))
+    np.testing.assert_allclose(out.feedback_gain, gain, rtol=2.0**-24)
+    np.testing.assert_array_equal(out.feedforward, control.feedforward)
+    assert out.stamp.nanoseconds == control.stamp.nanoseconds
+
+
+def test_check_ros_numpy_lazy_control_conversion(monkeypatch) -> None:
+    control = make_control(6, 1, t=3)
+    control.initial_state.stamp = Time.from_msg(TimeMsg(sec=2))
+    msg = npc.control_numpy_to_msg(control)
+
+    converted = []
+    matrix_msg_to_numpy = npc.matrix_msg_to_numpy
+    pose_msg_to_numpy = npc.pose_msg_to_numpy
+    monkeypatch.setattr(
+        npc,
+        "matrix_msg_to_numpy",
+        lambda *args: converted.append("matrix") or matrix_msg_to_numpy(*args),
+    )
+    monkeypatch.setattr(
+        npc,
+        "pose_msg_to_numpy",
+        lambda *args: converted.append("pose") or pose_msg_to_numpy(*args),
+    )
+
+    lazy = npc.LazyControl(msg)
+    assert converted == [], "Fields are converted before being accessed!"
+    np.testing.assert_array_equal(lazy.feedforward, control.feedforward)
+    np.testing.assert_array_equal(
+        lazy.initial_state.base_pose, control.initial_state.base_pose
+    )
+    assert lazy.feedforward is lazy.feedforward, "Converted field is not cached!"
+    assert converted == ["matrix", "pose"], (
+        "Fields other than the accessed ones are converted!"
+    )
+
+    lazy.feedforward = np.zeros(6)
+    out = lazy.to_control()
+    np.testing.assert_array_equal(out.feedforward, np.zeros(6))
+    np.testing.assert_array_equal(out.feedback_gain, control.feedback_gain)
+    np.testing.assert_array_equal(
+        out.initial_state.contacts[0].wrench, control.initial_state.contacts[0].wrench
+    )
+    np.testing.assert_array_equal(
+        out.initial_state.joint_state.velocity,
+        control.initial_state.joint_state.velocity,
+    )
+    assert out.stamp.nanoseconds == control.stamp.nanoseconds
+    assert (
+        out.initial_state.stamp.nanoseconds == control.initial_state.stamp.nanoseconds
+    )
+
+
+def test_check_ros_numpy_stamp_as_nanoseconds_conversion() -> None:
+    sensor = lfc_py_types.Sensor(
+        base_pose=np.random.rand(7),
+        base_twist=np.random.rand(6),
+        joint_state=lfc_py_types.JointState(
+            name=["1", "2"],
+            position=np.random.rand(2),
+            velocity=np.random.rand(2),
+            effort=np.random.rand(2),
+        ),
+        contacts=[],
+    )
+    assert isinstance(sensor.stamp, Time) and sensor.stamp.nanoseconds == 0, (
+        "Default stamp is not a zero rclpy Time!"
+    )
+    assert npc.sensor_numpy_to_msg(sensor).header.stamp == TimeMsg()
+
+    sensor.stamp = 3 * 10**9 + 25
+    control = lfc_py_types.Control(
+        feedback_gain=np.random.rand(2, 4),
+        feedforward=np.random.rand(2),
+        initial_state=sensor,
+        stamp=np.int64(4 * 10**9 + 50),
+    )
+    msg = npc.control_numpy_to_msg(control)
+    assert msg.header.stamp == TimeMsg(sec=4, nanosec=50)
+    assert msg.initial_state.header.stamp == TimeMsg(sec=3, nanosec=25)
+
+    out = npc.control_msg_to_numpy(msg, stamp_as_nanoseconds=True)
+    assert out.stamp == 4 * 10**9 + 50 and isinstance(out.stamp, int)
+    assert out.initial_state.stamp == 3 * 10**9 + 25
+    out = npc.control_msg_to_numpy(msg)
+    assert isinstance(out.stamp, Time), "Stamp is not rclpy Time by default!"
+
+    out = npc.control_msg_to_numpy(msg, stamp_as_nanoseconds=True)
+    msg.header.stamp = TimeMsg(sec=5, nanosec=75)
+    npc.control_msg_to_numpy_into(msg, out)
+    assert out.stamp == 5 * 10**9 + 75, "Type of the output stamp is not kept!"
+
+    stamps = np.array([0, 1, 10**9 - 1, 10**9, 123 * 10**9 + 456], dtype=np.int64)
+    stamp_msgs = npc.stamps_numpy_to_msgs(stamps)
+    assert stamp_msgs[3] == TimeMsg(sec=1, nanosec=0)
+    assert [npc.stamp_msg_to_nanoseconds(stamp) for stamp in stamp_msgs] == list(stamps)
+    np.testing.assert_array_equal(npc.stamps_msgs_to_numpy(stamp_msgs), stamps)
+
+    packed = pickle.loads(pickle.dumps(lfc_py_types.PackedSensor.from_sensor(sensor)))
+    assert packed.stamp == sensor.stamp, "Integer stamp is not kept by pickling!"
+
+
+def test_check_out_of_band_pickling() -> None:
+    control = make_control(30, 1, stamp=Time.from_msg(TimeMsg(sec=2, nanosec=5)))
+    control.stamp = 7 * 10**9
+    sensor = control.initial_state
+
+    buffers = []
+    data = pickle.dumps(control, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 9, "Numpy fields are not pickled out-of-band!"
+    assert len(data) < control.feedback_gain.nbytes / 10, (
+        "Feedback gain is copied into the pickle!"
+    )
+    out = pickle.loads(data, buffers=buffers)
+    assert np.shares_memory(out.feedback_gain, np.asarray(buffers[0])), (
+        "Out-of-band buffer is copied when unpickling!"
+    )
+    np.testing.assert_array_equal(out.feedback_gain, control.feedback_gain)
+    np.testing.assert_array_equal(
+        out.initial_state.contacts[0].pose, sensor.contacts[0].pose
+    )
+    assert out.stamp == control.stamp
+    assert out.initial_state.stamp.nanoseconds == sensor.stamp.nanoseconds
+    assert out.initial_state.stamp.clock_type == sensor.stamp.clock_type
+
+    serialized = lfc_py_types.to_bytes(control)
+    assert len(serialized) < sum(b.raw().nbytes for b in buffers) + len(data) + 1024
+    out = lfc_py_types.from_bytes(serialized)
+    assert np.shares_memory(out.feedback_gain, np.frombuffer(serialized, np.uint8))
+    assert out.feedback_gain.flags.writeable, "Arrays over a bytearray are read-only!"
+    np.testing.assert_array_equal(out.feedback_gain, control.feedback_gain)
+    np.testing.assert_array_equal(
+        out.initial_state.joint_state.effort, sensor.joint_state.effort
+    )
+    assert out.initial_state.joint_state.name == sensor.joint_state.name
+    assert out.stamp == control.stamp
+    assert out.initial_state.stamp.nanoseconds == sensor.stamp.nanoseconds
+    assert not lfc_py_types.from_bytes(bytes(serialized)).feedforward.flags.writeable
+
+
+def test_check_state_layout() -> None:
+    sensors = [make_sensor(6, 1) for _ in range(5)]
+    sensor = sensors[0]
+    layout = lfc_py_types.StateLayout.from_sensor(sensor)
+    assert (layout.nq, layout.nv, layout.size) == (13, 12, 25)
+    assert layout.contact_names == ["contact_0"]
+
+    state = np.empty(layout.size)
+    assert layout.pack(sensor, out=state) is state, "State is not packed in place!"
+    np.testing.assert_array_equal(
+        state,
+        np.concatenate(
+            (
+                sensor.base_pose,
+                sensor.joint_state.position,
+                sensor.base_twist,
+                sensor.joint_state.velocity,
+            )
+        ),
+        err_msg="Packed state is not (q, v)!",
+    )
+
+    out = layout.new_sensor()
+    position = out.joint_state.position
+    assert layout.unpack(state, out=out) is out
+    assert out.joint_state.position is position, "Sensor is not unpacked in place!"
+    np.testing.assert_array_equal(out.base_pose, sensor.base_pose)
+    np.testing.assert_array_equal(out.base_twist, sensor.base_twist)
+    np.testing.assert_array_equal(out.joint_state.velocity, sensor.joint_state.velocity)
+    np.testing.assert_array_equal(layout.pack(layout.unpack(state)), state)
+
+    batch = layout.new_sensor_batch(len(sensors))
+    for i, s in enumerate(sensors):
+        batch.base_pose[i] = s.base_pose
+        batch.base_twist[i] = s.base_twist
+        batch.joint_state.position[i] = s.joint_state.position
+        batch.joint_state.velocity[i] = s.joint_state.velocity
+    states = layout.pack_batch(batch)
+    assert states.shape == (5, 25)
+    for s, packed in zip(sensors, states):
+        np.testing.assert_array_equal(
+            packed,
+            layout.pack(s),
+            err_msg="Batch packed states are not equal packed sensors!",
+        )
+    unpacked = layout.unpack_batch(states)
+    np.testing.assert_array_equal(unpacked.base_pose, batch.base_pose)
+    np.testing.assert_array_equal(
+        unpacked.joint_state.velocity, batch.joint_state.velocity
+    )
+
+    fixed_base = lfc_py_types.StateLayout.from_sensor(batch, free_flyer=False)
+    assert fixed_base != layout
+    np.testing.assert_array_equal(
+        fixed_base.pack(sensor),
+        np.concatenate((sensor.joint_state.position, sensor.joint_state.velocity)),
+    )
+    np.testing.assert_array_equal(
+        fixed_base.pack_batch(batch),
+        np.concatenate((states[:, 7:13], states[:, 19:]), 1),
+    )
+
+
+def serialized_backends() -> List[bool]:
+    # Set by CMake when the compiled backend is built.
+    if os.environ.get("LFC_MSGS_COMPILED_BACKEND") == "1":
+        assert npc.has_compiled_backend(), "Compiled backend cannot be imported!"
+    return [False, True] if npc.has_compiled_backend() else [False]
+
+
+def assert_controls_equal(control: lfc_py_types.Control, expected) -> None:
+    np.testing.assert_array_equal(control.feedback_gain, expected.feedback_gain)
+    np.testing.assert_array_equal(control.feedforward, expected.feedforward)
+    assert control.stamp == expected.stamp, "Control stamps differ!"
+    sensor, expected_sensor = control.initial_state, expected.initial_state
+    for field in ("base_pose", "base_twist"):
+        np.testing.assert_array_equal(
+            getattr(sensor, field), getattr(expected_sensor, field)
+        )
+    assert sensor.joint_state.name == expected_sensor.joint_state.name
+    for field in ("position", "velocity", "effort"):
+        np.testing.assert_array_equal(
+            getattr(sensor.joint_state, field),
+            getattr(expected_sensor.joint_state, field),
+        )
+    for c1, c2 in zip(sensor.contacts, expected_sensor.contacts, strict=True):
+        assert (c1.active, c1.name) == (c2.active, c2.name)
+        np.testing.assert_array_equal(c1.wrench, c2.wrench)
+        np.testing.assert_array_equal(c1.pose, c2.pose)
+    assert sensor.stamp == expected_sensor.stamp, "Sensor stamps differ!"
+
+
+def test_check_ros_numpy_serialized_conversion() -> None:
+    control = make_control(3, 1, stamp=Time.from_msg(TimeMsg(sec=3, nanosec=4)))
+    control.stamp = Time.from_msg(TimeMsg(sec=5, nanosec=6))
+    sensor = control.initial_state
+    expected = npc.control_msg_to_numpy(npc.control_numpy_to_msg(control))
+    expected_nanoseconds = npc.control_msg_to_numpy(
+        npc.control_numpy_to_msg(control), False, stamp_as_nanoseconds=True
+    )
+
+    backends = serialized_backends()
+    serialized = {}
+    try:
+        for compiled in backends:
+            npc.set_compiled_backend(compiled)
+            serialized[compiled] = npc.control_numpy_to_serialized(control)
+            sensor_data = npc.sensor_numpy_to_serialized(sensor)
+            assert_controls_equal(
+                npc.control_serialized_to_numpy(serialized[compiled]), expected
+            )
+            out = npc.sensor_serialized_to_numpy(sensor_data, True)
+            np.testing.assert_array_equal(out.base_twist, sensor.base_twist)
+            assert out.stamp == sensor.stamp.nanoseconds
+        # Messages serialized by one backend are converted by the other one.
+        for compiled in backends:
+            npc.set_compiled_backend(compiled)
+            for data in serialized.values():
+                assert_controls_equal(
+                    npc.control_serialized_to_numpy(data, False, True),
+                    expected_nanoseconds,
+                )
+    finally:
+        npc.set_compiled_backend(True)
+
+
+def check_serialized_backends(controls: List[lfc_py_types.Control]) -> None:
+    backends = serialized_backends()
+    try:
+        for control in controls:
+            serialized = []
+            for compiled in backends:
+                npc.set_compiled_backend(compiled)
+                serialized.append(npc.control_numpy_to_serialized(control))
+            assert all(data == serialized[0] for data in serialized), (
+                "Backends serialize different messages!"
+            )
+            msg = npc.control_numpy_to_msg(control)
+            for feedforward_as_vector in (True, False):
+                expected = npc.control_msg_to_numpy(msg, feedforward_as_vector, True)
+                for compiled in backends:
+                    npc.set_compiled_backend(compiled)
+                    out = npc.control_serialized_to_numpy(
+                        serialized[0], feedforward_as_vector, True
+                    )
+                    assert out.feedback_gain.shape == expected.feedback_gain.shape
+                    assert out.feedforward.shape == expected.feedforward.shape
+                    assert_controls_equal(out, expected)
+    finally:
+        npc.set_compiled_backend(True)
+
+
+def test_check_serialized_conversion_backends_parity() -> None:
+    sensor = lfc_py_types.Sensor(
+        base_pose=np.random.rand(7),
+        base_twist=np.random.rand(6),
+        joint_state=lfc_py_types.JointState(
+            name=["1", "2", "3"],
+            position=np.random.rand(3),
+            velocity=np.random.rand(3),
+            effort=np.array([]),
+        ),
+        contacts=[],
+        stamp=-1,
+    )
+    controls = [
+        lfc_py_types.Control(
+            feedback_gain=np.random.rand(3, 6),
+            feedforward=np.random.rand(*shape),
+            initial_state=sensor,
+            stamp=stamp,
+        )
+        for shape, stamp in (
+            ((3,), 5 * 10**9 + 6),
+            ((3, 1), 0),
+            ((3, 2), -3 * 10**9 // 2),
+        )
+    ]
+    controls.append(
+        lfc_py_types.Control(
+            feedback_gain=np.random.rand(3),
+            feedforward=np.random.rand(3),
+            initial_state=sensor,
+            stamp=7,
+        )
+    )
+    check_serialized_backends(controls)
+
+
+def test_check_serialized_conversion_backends_accept_same_messages() -> None:
+    sensor = lfc_py_types.Sensor(
+        base_pose=np.random.rand(7),
+        base_twist=np.random.rand(6),
+        joint_state=lfc_py_types.JointState(
+            name=["1", "2"],
+            position=np.random.rand(2),
+            velocity=np.random.rand(2),
+            effort=np.random.rand(2),
+        ),
+        contacts=[],
+        stamp=42,
+    )
+    msg = npc.control_numpy_to_msg(
+        lfc_py_types.Control(
+            feedback_gain=np.random.rand(2, 4),
+            feedforward=np.random.rand(3),
+            initial_state=sensor,
+            stamp=43,
+        )
+    )
+    # Matrices only checked by matrix_msg_to_numpy for their number of dimensions.
+    msg.feedback_gain.layout.dim[0].label = "custom"
+    msg.feedforward.layout.dim[0].size = 2
+    data = serialize_message(msg)
+    expected = npc.control_msg_to_numpy(msg, stamp_as_nanoseconds=True)
+
+    backends = serialized_backends()
+    try:
+        for compiled in backends:
+            npc.set_compiled_backend(compiled)
+            assert_controls_equal(
+                npc.control_serialized_to_numpy(data, stamp_as_nanoseconds=True),
+                expected,
+            )
+    finally:
+        npc.set_compiled_backend(True)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pytest
+from rclpy.serialization import serialize_message
+
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from linear_feedback_controller_msgs_py import parallel
+
+from conftest import make_control
+
+
+def test_check_controls_msgs_to_numpy_batch_parallel() -> None:
+    msgs = [npc.control_numpy_to_msg(make_control(6, 2, t)) for t in range(37)]
+
+    expected = npc.controls_msgs_to_numpy_batch(msgs)
+    batch = parallel.controls_msgs_to_numpy_batch_parallel(
+        msgs, workers=2, chunk_size=5
+    )
+
+    assert len(batch) == len(msgs)
+    assert (
+        batch.initial_state.joint_state.name == expected.initial_state.joint_state.name
+    )
+    assert batch.initial_state.contact_names == expected.initial_state.contact_names
+    for name in ("feedback_gain", "feedforward", "stamp"):
+        np.testing.assert_array_equal(
+            getattr(batch, name),
+            getattr(expected, name),
+            err_msg=f"Parallel conversion of '{name}' is not equal serial conversion!",
+        )
+    for name in (
+        "base_pose",
+        "base_twist",
+        "contact_active",
+        "contact_wrench",
+        "contact_pose",
+        "stamp",
+    ):
+        np.testing.assert_array_equal(
+            getattr(batch.initial_state, name),
+            getattr(expected.initial_state, name),
+            err_msg=f"Parallel conversion of '{name}' is not equal serial conversion!",
+        )
+    np.testing.assert_array_equal(
+        batch.initial_state.joint_state.velocity,
+        expected.initial_state.joint_state.velocity,
+        err_msg="Parallel conversion of joint velocities is not equal serial conversion!",
+    )
+
+    scaling = parallel.measure_throughput_scaling(msgs, worker_counts=(1, 2))
+    assert sorted(scaling) == [1, 2] and all(value > 0 for value in scaling.values())
+
+
+class ExportedSharedMemory(parallel.shared_memory.SharedMemory):
+    def close(self) -> None:
+        # As when views on the buffer are still alive, for the first close only.
+        if not getattr(self, "exported", False):
+            self.exported = True
+            raise BufferError("cannot close exported pointers exist")
+        super().close()
+
+
+def test_check_parallel_conversion_error(monkeypatch) -> None:
+    msgs = [npc.control_numpy_to_msg(make_control(6, 2, t)) for t in range(4)]
+    layout, size = parallel._control_batch_layout(4, (6, 24), 6, 6, 2)
+    # Message with another number of joints than the batch.
+    data = [serialize_message(msg) for msg in msgs[:3]]
+    data.append(serialize_message(npc.control_numpy_to_msg(make_control(5, 2, 3))))
+
+    shm = parallel.shared_memory.SharedMemory(create=True, size=size)
+    try:
+        assert parallel._convert_chunk(shm.name, layout, 0, data[:3]) == 3
+        # The conversion error is not hidden by the BufferError of the close.
+        monkeypatch.setattr(
+            parallel.shared_memory, "SharedMemory", ExportedSharedMemory
+        )
+        with pytest.raises(AssertionError, match="joints"):
+            parallel._convert_chunk(shm.name, layout, 0, data)
+    finally:
+        shm.close()
+        shm.unlink()
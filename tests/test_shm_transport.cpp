@@ -0,0 +1,163 @@
+#include <gtest/gtest.h>
+#include <unistd.h>
+
+#include <string>
+#include <vector>
+
+#include "linear_feedback_controller_msgs/shm_transport.hpp"
+
+namespace lfc_msgs = linear_feedback_controller_msgs;
+
+namespace {
+
+lfc_msgs::Eigen::Sensor makeSensor(int n_joints, int n_contacts) {
+  lfc_msgs::Eigen::Sensor e;
+  e.base_pose = Eigen::Matrix<double, 7, 1>::Random();
+  e.base_twist = Eigen::Matrix<double, 6, 1>::Random();
+  for (int i = 0; i < n_joints; ++i) {
+    e.joint_state.name.push_back("joint_" + std::to_string(i));
+  }
+  e.joint_state.position = Eigen::VectorXd::Random(n_joints);
+  e.joint_state.velocity = Eigen::VectorXd::Random(n_joints);
+  e.joint_state.effort = Eigen::VectorXd::Random(n_joints);
+  e.contacts.resize(n_contacts);
+  for (int i = 0; i < n_contacts; ++i) {
+    e.contacts[i] = {
+        .active = i % 2 == 1,
+        .name = "contact_" + std::to_string(i),
+        .wrench = Eigen::Matrix<double, 6, 1>::Random(),
+        .pose = Eigen::Matrix<double, 7, 1>::Random(),
+    };
+  }
+  e.stamp = rclcpp::Time(1234567890123, RCL_ROS_TIME);
+  return e;
+}
+
+void expectSensorEq(const lfc_msgs::Eigen::Sensor& e,
+                    const lfc_msgs::Eigen::Sensor& etest) {
+  EXPECT_EQ(e.base_pose, etest.base_pose);
+  EXPECT_EQ(e.base_twist, etest.base_twist);
+  EXPECT_EQ(e.joint_state.position, etest.joint_state.position);
+  EXPECT_EQ(e.joint_state.velocity, etest.joint_state.velocity);
+  EXPECT_EQ(e.joint_state.effort, etest.joint_state.effort);
+  ASSERT_EQ(e.contacts.size(), etest.contacts.size());
+  for (std::size_t i = 0; i < e.contacts.size(); ++i) {
+    EXPECT_EQ(e.contacts[i].active, etest.contacts[i].active);
+    EXPECT_EQ(e.contacts[i].wrench, etest.contacts[i].wrench);
+    EXPECT_EQ(e.contacts[i].pose, etest.contacts[i].pose);
+  }
+  EXPECT_EQ(e.stamp.nanoseconds(), etest.stamp.nanoseconds());
+}
+
+}  // namespace
+
+TEST(ShmTransportTest, checkBinaryEncoding) {
+  const auto e = makeSensor(6, 3);
+  std::vector<double> buffer(1024);
+
+  const std::size_t size =
+      lfc_msgs::shm::encodeSensor(e, buffer.data(), buffer.size() * 8);
+  ASSERT_EQ(size, 64 + 8 * (13 + 3 * 6 + 14 * 3));
+  ASSERT_EQ(lfc_msgs::shm::encodeSensor(e, buffer.data(), size - 1), 0);
+
+  lfc_msgs::Eigen::Sensor etest;
+  lfc_msgs::Eigen::Control ctest;
+  ASSERT_FALSE(lfc_msgs::shm::decodeControl(buffer.data(), ctest));
+  ASSERT_TRUE(lfc_msgs::shm::decodeSensor(buffer.data(), etest));
+  expectSensorEq(e, etest);
+
+  lfc_msgs::Eigen::Control c;
+  c.feedback_gain = Eigen::MatrixXd::Random(6, 24);
+  c.feedforward = Eigen::VectorXd::Random(6);
+  c.initial_state = e;
+  c.stamp = rclcpp::Time(e.stamp.nanoseconds() + 1000, RCL_ROS_TIME);
+  ASSERT_EQ(lfc_msgs::shm::encodeControl(c, buffer.data(), buffer.size() * 8),
+            lfc_msgs::shm::controlRecordSize(c));
+  // The feedback gain is stored in row-major order after the header.
+  ASSERT_EQ(buffer[8 + 1], c.feedback_gain(0, 1));
+  ASSERT_TRUE(lfc_msgs::shm::decodeControl(buffer.data(), ctest));
+  EXPECT_EQ(c.feedback_gain, ctest.feedback_gain);
+  EXPECT_EQ(c.feedforward, ctest.feedforward);
+  EXPECT_EQ(c.stamp.nanoseconds(), ctest.stamp.nanoseconds());
+  expectSensorEq(e, ctest.initial_state);
+
+  // Empty efforts, as in most JointState messages, are encoded as NaN.
+  auto without_effort = e;
+  without_effort.joint_state.effort.resize(0);
+  ASSERT_EQ(lfc_msgs::shm::encodeSensor(without_effort, buffer.data(), size),
+            size);
+  ASSERT_TRUE(lfc_msgs::shm::decodeSensor(buffer.data(), etest));
+  EXPECT_TRUE(etest.joint_state.effort.array().isNaN().all());
+  EXPECT_EQ(e.joint_state.velocity, etest.joint_state.velocity);
+}
+
+TEST(ShmTransportTest, checkRingBuffer) {
+  const std::string path =
+      ::testing::TempDir() + "lfc_ring_" + std::to_string(::getpid());
+  const std::vector<lfc_msgs::Eigen::Sensor> sensors = {
+      makeSensor(12, 2), makeSensor(12, 2), makeSensor(12, 2)};
+
+  {
+    lfc_msgs::shm::RingBuffer producer(path, 2, 4096);
+    lfc_msgs::shm::RingBuffer consumer(path);
+    lfc_msgs::Eigen::Sensor etest;
+    ASSERT_EQ(consumer.recordCapacity(), 4096);
+    ASSERT_FALSE(consumer.popSensor(etest));
+
+    ASSERT_TRUE(producer.pushSensor(sensors[0]));
+    ASSERT_TRUE(producer.pushSensor(sensors[1]));
+    ASSERT_FALSE(producer.pushSensor(sensors[2]));
+
+    ASSERT_TRUE(consumer.popSensor(etest));
+    expectSensorEq(sensors[0], etest);
+    ASSERT_TRUE(producer.pushSensor(sensors[2]));
+    for (std::size_t i = 1; i < sensors.size(); ++i) {
+      ASSERT_TRUE(consumer.popSensor(etest));
+      expectSensorEq(sensors[i], etest);
+    }
+    ASSERT_FALSE(consumer.popSensor(etest));
+  }
+  ::unlink(path.c_str());
+}
+
+TEST(ShmTransportTest, checkRingBufferInvalidRecords) {
+  const std::string path =
+      ::testing::TempDir() + "lfc_ring_invalid_" + std::to_string(::getpid());
+
+  {
+    lfc_msgs::shm::RingBuffer producer(path, 4, 1024);
+    lfc_msgs::shm::RingBuffer consumer(path);
+    lfc_msgs::Eigen::Sensor etest;
+
+    // Records larger than the slot are refused without being published.
+    const auto large = makeSensor(64, 2);
+    ASSERT_GT(lfc_msgs::shm::sensorRecordSize(large),
+              producer.recordCapacity());
+    ASSERT_FALSE(producer.pushSensor(large));
+    const std::vector<double> raw(producer.recordCapacity() / 8 + 1);
+    ASSERT_FALSE(producer.push(raw.data(), raw.size() * 8));
+
+    // So are joint state vectors not matching the joint names.
+    auto mismatched = makeSensor(4, 1);
+    mismatched.joint_state.velocity.resize(3);
+    std::vector<double> out(producer.recordCapacity() / 8);
+    ASSERT_EQ(lfc_msgs::shm::encodeSensor(mismatched, out.data(),
+                                          producer.recordCapacity()),
+              0);
+    ASSERT_FALSE(producer.pushSensor(mismatched));
+    ASSERT_FALSE(consumer.popSensor(etest));
+
+    // Records smaller than described by their header are not decoded.
+    const auto sensor = makeSensor(4, 1);
+    std::vector<double> record(producer.recordCapacity() / 8);
+    const std::size_t size = lfc_msgs::shm::encodeSensor(
+        sensor, record.data(), producer.recordCapacity());
+    ASSERT_TRUE(producer.push(record.data(), size - 8));
+    ASSERT_TRUE(producer.push(record.data(), size));
+    ASSERT_FALSE(consumer.popSensor(etest));
+    ASSERT_TRUE(consumer.popSensor(etest));
+    expectSensorEq(sensor, etest);
+    ASSERT_FALSE(consumer.popSensor(etest));
+  }
+  ::unlink(path.c_str());
+}
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pytest
+from rclpy.time import Time
+
+from linear_feedback_controller_msgs_py import shm_transport
+import linear_feedback_controller_msgs_py.lfc_py_types as lfc_py_types
+
+from conftest import make_sensor
+
+
+def assert_sensor_equal(
+    sensor: lfc_py_types.Sensor, decoded: lfc_py_types.Sensor
+) -> None:
+    np.testing.assert_array_equal(
+        sensor.base_pose, decoded.base_pose, err_msg="Base pose is not equal!"
+    )
+    np.testing.assert_array_equal(
+        sensor.base_twist, decoded.base_twist, err_msg="Base twist is not equal!"
+    )
+    for field in ("position", "velocity", "effort"):
+        np.testing.assert_array_equal(
+            getattr(sensor.joint_state, field),
+            getattr(decoded.joint_state, field),
+            err_msg=f"Joint {field} is not equal!",
+        )
+    assert sensor.joint_state.name == decoded.joint_state.name
+    for c1, c2 in zip(sensor.contacts, decoded.contacts, strict=True):
+        assert c1.active == c2.active and c1.name == c2.name
+        np.testing.assert_array_equal(c1.wrench, c2.wrench)
+        np.testing.assert_array_equal(c1.pose, c2.pose)
+    assert sensor.stamp.nanoseconds == decoded.stamp.nanoseconds
+
+
+def test_check_binary_encoding() -> None:
+    sensor = make_sensor(6, 3, stamp=Time(seconds=3, nanoseconds=42))
+    contact_names = [c.name for c in sensor.contacts]
+    out = np.zeros(4096, dtype=np.uint8)
+
+    for encoded in (sensor, lfc_py_types.PackedSensor.from_sensor(sensor)):
+        size = shm_transport.encode_sensor_into(encoded, out)
+        assert (
+            size
+            == shm_transport.sensor_record_size(sensor)
+            == 64 + 8 * (13 + 3 * 6 + 14 * 3)
+        ), "Sensor record has a wrong size!"
+        header = out[:64].view(np.int64)
+        assert header.tolist() == [
+            shm_transport.RECORD_SENSOR,
+            sensor.stamp.nanoseconds,
+            6,
+            3,
+            0,
+            0,
+            0,
+            0,
+        ], "Sensor record header is wrong!"
+        decoded = shm_transport.decode_record(
+            out[:size], sensor.joint_state.name, contact_names
+        )
+        assert isinstance(decoded, lfc_py_types.PackedSensor)
+        assert_sensor_equal(sensor, decoded)
+
+    control = lfc_py_types.Control(
+        feedback_gain=np.random.rand(6, 24),
+        feedforward=np.random.rand(6),
+        initial_state=sensor,
+        stamp=Time(nanoseconds=sensor.stamp.nanoseconds + 1000),
+    )
+    size = shm_transport.encode_control_into(control, out)
+    assert out[56:64].view(np.int64)[0] == sensor.stamp.nanoseconds, (
+        "Initial state stamp is not encoded!"
+    )
+    np.testing.assert_array_equal(
+        out[64 : 64 + 8 * 24].view(np.float64),
+        control.feedback_gain[0],
+        err_msg="Feedback gain is not encoded in row-major order!",
+    )
+    decoded = shm_transport.decode_record(
+        out[:size], sensor.joint_state.name, contact_names
+    )
+    np.testing.assert_array_equal(control.feedback_gain, decoded.feedback_gain)
+    np.testing.assert_array_equal(control.feedforward, decoded.feedforward)
+    assert_sensor_equal(sensor, decoded.initial_state)
+    assert control.stamp.nanoseconds == decoded.stamp.nanoseconds
+
+
+def test_check_binary_encoding_nanoseconds_stamps() -> None:
+    sensor = make_sensor(2, 1)
+    sensor.stamp = 42
+    control = lfc_py_types.Control(
+        feedback_gain=np.random.rand(2, 4),
+        feedforward=np.random.rand(2),
+        initial_state=sensor,
+        stamp=43,
+    )
+    out = np.zeros(4096, dtype=np.uint8)
+    contact_names = [c.name for c in sensor.contacts]
+
+    size = shm_transport.encode_control_into(control, out)
+    decoded = shm_transport.decode_record(
+        out[:size], sensor.joint_state.name, contact_names, stamp_as_nanoseconds=True
+    )
+    assert decoded.stamp == 43
+    assert decoded.initial_state.stamp == 42
+    decoded = shm_transport.decode_record(
+        out[:size], sensor.joint_state.name, contact_names
+    )
+    assert decoded.stamp.nanoseconds == 43
+    assert decoded.initial_state.stamp.nanoseconds == 42
+
+
+def test_check_binary_encoding_without_effort() -> None:
+    sensor = make_sensor(2, 1)
+    sensor.joint_state.effort = np.array([])
+    out = np.zeros(4096, dtype=np.uint8)
+
+    size = shm_transport.encode_sensor_into(sensor, out)
+    assert size == shm_transport.sensor_record_size(sensor)
+    decoded = shm_transport.decode_record(
+        out[:size], sensor.joint_state.name, [c.name for c in sensor.contacts]
+    )
+    assert np.isnan(decoded.joint_state.effort).all(), (
+        "Empty efforts are not encoded as NaN!"
+    )
+    np.testing.assert_array_equal(
+        sensor.joint_state.position, decoded.joint_state.position
+    )
+    np.testing.assert_array_equal(sensor.contacts[0].pose, decoded.contacts[0].pose)
+
+
+def test_check_shm_ring_buffer(tmp_path) -> None:
+    path = str(tmp_path / "lfc_ring")
+    sensors = [make_sensor(12, 2) for _ in range(3)]
+    joint_names = sensors[0].joint_state.name
+    contact_names = [c.name for c in sensors[0].contacts]
+
+    with (
+        shm_transport.ShmRingBuffer(path, 2, 4096) as producer,
+        shm_transport.ShmRingBuffer(path) as consumer,
+    ):
+        assert consumer.record_capacity == 4096
+        assert consumer.pop() is None, "Empty ring buffer returned a record!"
+
+        assert producer.push_sensor(sensors[0])
+        assert producer.push_sensor(sensors[1])
+        assert not producer.push_sensor(sensors[2]), (
+            "Full ring buffer accepted a record!"
+        )
+
+        assert_sensor_equal(
+            sensors[0], consumer.pop_decoded(joint_names, contact_names)
+        )
+        assert producer.push_sensor(sensors[2])
+        for sensor in sensors[1:]:
+            record = consumer.pop()
+            assert record.size == shm_transport.sensor_record_size(sensor)
+            assert_sensor_equal(
+                sensor, shm_transport.decode_record(record, joint_names, contact_names)
+            )
+        assert consumer.pop_decoded(joint_names, contact_names) is None
+
+
+def test_check_shm_ring_buffer_architecture(tmp_path, monkeypatch) -> None:
+    # Without memory fences records could be read before being written on ARM.
+    monkeypatch.setattr(shm_transport.platform, "machine", lambda: "aarch64")
+    with pytest.raises(RuntimeError):
+        shm_transport.ShmRingBuffer(str(tmp_path / "lfc_ring"), 2, 4096)
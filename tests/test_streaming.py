@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from rclpy.serialization import serialize_message
+
+from linear_feedback_controller_msgs_py import numpy_conversions as npc
+from linear_feedback_controller_msgs_py import streaming
+
+from conftest import make_control, make_sensor
+
+
+def test_check_stream_control_batches() -> None:
+    controls = [make_control(6, t=t) for t in range(23)]
+    serialized = [
+        serialize_message(npc.control_numpy_to_msg(control)) for control in controls
+    ]
+
+    for kwargs in ({}, {"executor": ThreadPoolExecutor(2), "max_pending": 2}):
+        consumed = 0
+
+        def reader():
+            nonlocal consumed
+            for data in serialized:
+                consumed += 1
+                yield data
+
+        batches = []
+        for batch in streaming.stream_control_batches(reader(), chunk_size=5, **kwargs):
+            # The stream is read ahead by at most max_pending chunks.
+            assert consumed <= 5 * (len(batches) + 1 + kwargs.get("max_pending", 0))
+            batches.append(batch)
+
+        assert [len(batch) for batch in batches] == [5, 5, 5, 5, 3], (
+            "Streamed batches have wrong sizes!"
+        )
+        feedback_gain = np.concatenate([batch.feedback_gain for batch in batches])
+        np.testing.assert_array_equal(
+            feedback_gain,
+            np.stack([control.feedback_gain for control in controls]),
+            err_msg="Streamed feedback gains are not equal initial values!",
+        )
+        np.testing.assert_array_equal(
+            np.concatenate(
+                [batch.initial_state.joint_state.effort for batch in batches]
+            ),
+            np.stack(
+                [control.initial_state.joint_state.effort for control in controls]
+            ),
+            err_msg="Streamed joint efforts are not equal initial values!",
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([batch.stamp for batch in batches]),
+            [control.stamp.nanoseconds for control in controls],
+            err_msg="Streamed stamps are not equal initial values!",
+        )
+
+
+def test_check_stream_sensor_batches() -> None:
+    sensors = [make_sensor(4, t=t) for t in range(7)]
+    serialized = [serialize_message(npc.sensor_numpy_to_msg(s)) for s in sensors]
+
+    batches = list(streaming.stream_sensor_batches(serialized, chunk_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 3]
+    np.testing.assert_array_equal(
+        np.concatenate([batch.contact_wrench for batch in batches])[:, 0],
+        np.stack([sensor.contacts[0].wrench for sensor in sensors]),
+        err_msg="Streamed contact wrenches are not equal initial values!",
+    )